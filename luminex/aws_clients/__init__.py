@@ -0,0 +1,3 @@
+from .client_registry import get_session
+from .client_registry import get_client
+from .client_registry import clear_clients
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+This module keeps a process-wide registry of boto3 sessions and clients.
+Clients are created once per service, region and credential set, with a tuned
+connection pool, and then shared by every luminex module.
+"""
+import threading
+
+import boto3
+from botocore.config import Config
+
+# Connection pool size for every client; large enough for the concurrent S3 readers
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+
+DEFAULT_RETRIES = {'max_attempts': 5, 'mode': 'standard'}
+
+_lock = threading.Lock()
+_sessions = {}
+_clients = {}
+
+
+def get_session(region_name=None, aws_access_key_id=None, aws_secret_access_key=None, aws_session_token=None):
+    """
+    Returns the shared boto3 session for a region and credential set.
+
+    Parameters:
+        region_name (str): AWS region; boto3 default resolution applies when None.
+        aws_access_key_id (str): AWS Credentials: Access Key ID; default credential chain when None.
+        aws_secret_access_key (str): AWS Credentials: Secret Access Key
+        aws_session_token (str): AWS Credentials: Session Token
+
+    Returns:
+        session (boto3.session.Session): Session bound to the given region and credentials.
+    """
+    key = (region_name, aws_access_key_id, aws_secret_access_key, aws_session_token)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = boto3.session.Session(aws_access_key_id=aws_access_key_id,
+                                            aws_secret_access_key=aws_secret_access_key,
+                                            aws_session_token=aws_session_token,
+                                            region_name=region_name)
+            _sessions[key] = session
+        return session
+
+
+def _client_config(max_pool_connections):
+    return Config(max_pool_connections=max_pool_connections, retries=DEFAULT_RETRIES)
+
+
+def get_client(service_name, region_name=None, aws_access_key_id=None, aws_secret_access_key=None,
+               aws_session_token=None, verify=None, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS):
+    """
+    Returns the shared boto3 client for a service, region and credential set,
+    creating it on first use. boto3 clients are thread-safe, so one instance serves all callers.
+
+    Parameters:
+        service_name (str): AWS service name, e.g. 's3', 'emr', 'cloudformation'.
+        region_name (str): AWS region; boto3 default resolution applies when None.
+        aws_access_key_id (str): AWS Credentials: Access Key ID; default credential chain when None.
+        aws_secret_access_key (str): AWS Credentials: Secret Access Key
+        aws_session_token (str): AWS Credentials: Session Token
+        verify (bool): Whether to verify SSL certificates; boto3 default when None.
+        max_pool_connections (int): Size of the client's HTTP connection pool.
+
+    Returns:
+        client (botocore.client.BaseClient): The shared client.
+    """
+    key = (service_name, region_name, aws_access_key_id, aws_secret_access_key, aws_session_token, verify,
+           max_pool_connections)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    session = get_session(region_name, aws_access_key_id, aws_secret_access_key, aws_session_token)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = session.client(service_name, verify=verify, config=_client_config(max_pool_connections))
+            _clients[key] = client
+        return client
+
+
+def clear_clients():
+    """
+    Drops every cached session and client, e.g. after credentials are rotated.
+    """
+    with _lock:
+        _sessions.clear()
+        _clients.clear()
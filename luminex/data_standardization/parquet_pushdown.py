@@ -0,0 +1,134 @@
+"""
+This module implements row-group pruning for Parquet reads. Filters use the
+pyarrow DNF convention: a list of (column, op, value) tuples that are ANDed,
+or a list of such lists that are ORed.
+"""
+import pyarrow.parquet as pq
+
+
+def normalize_filters(filters):
+    """
+    Normalizes filters to disjunctive normal form (a list of AND-ed predicate lists).
+
+    Parameters:
+    - filters (list): Predicates as a flat list of tuples or a list of tuple lists.
+
+    Returns:
+    - filters (list): List of conjunctions, each a list of (column, op, value) tuples.
+    """
+    if not filters:
+        return []
+    if isinstance(filters[0], tuple):
+        return [list(filters)]
+    return [list(conjunction) for conjunction in filters]
+
+
+def filter_columns(filters):
+    """
+    Lists the columns referenced by the filters, in first-use order.
+
+    Parameters:
+    - filters (list): Predicates in pyarrow DNF form.
+
+    Returns:
+    - columns (list): Referenced column names.
+    """
+    columns = []
+    for conjunction in normalize_filters(filters):
+        for column, _, _ in conjunction:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def _predicate_may_match(statistics, op, value):
+    """
+    Checks whether a predicate can be true for any row, given a column chunk's
+    min/max statistics. Unknown operators and incomparable values keep the row group.
+    """
+    if statistics is None or not statistics.has_min_max:
+        return True
+    minimum, maximum = statistics.min, statistics.max
+    try:
+        if op in ('=', '=='):
+            return minimum <= value <= maximum
+        if op == '!=':
+            return not minimum == maximum == value
+        if op == '<':
+            return minimum < value
+        if op == '<=':
+            return minimum <= value
+        if op == '>':
+            return maximum > value
+        if op == '>=':
+            return maximum >= value
+        if op == 'in':
+            return any(minimum <= item <= maximum for item in value)
+        if op == 'not in':
+            return not (minimum == maximum and minimum in value)
+    except TypeError:
+        return True
+    return True
+
+
+def select_row_groups(metadata, filters):
+    """
+    Selects the row groups whose statistics do not rule out the filters.
+
+    Parameters:
+    - metadata (pyarrow.parquet.FileMetaData): Parquet footer metadata.
+    - filters (list): Predicates in pyarrow DNF form.
+
+    Returns:
+    - row_groups (list): Indices of the row groups that may contain matching rows.
+    """
+    conjunctions = normalize_filters(filters)
+    if not conjunctions:
+        return list(range(metadata.num_row_groups))
+
+    row_groups = []
+    for index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(index)
+        statistics = {}
+        for column_index in range(row_group.num_columns):
+            column = row_group.column(column_index)
+            statistics[column.path_in_schema] = column.statistics if column.is_stats_set else None
+
+        if any(all(_predicate_may_match(statistics.get(column), op, value) for column, op, value in conjunction)
+               for conjunction in conjunctions):
+            row_groups.append(index)
+    return row_groups
+
+
+def read_parquet_pushdown(source, columns=None, filters=None):
+    """
+    Reads a Parquet file, fetching only the requested columns and the row groups
+    that can satisfy the filters, then applies the filters row by row.
+
+    Parameters:
+    - source (file-like): Seekable Parquet source; only the footer and selected column chunks are read.
+    - columns (list): Columns to return; all columns when None.
+    - filters (list): Predicates in pyarrow DNF form.
+
+    Returns:
+    - table (pyarrow.Table): The projected and filtered data.
+    """
+    parquet_file = pq.ParquetFile(source, pre_buffer=True)
+    row_groups = select_row_groups(parquet_file.metadata, filters)
+
+    read_columns = None
+    if columns is not None:
+        read_columns = list(columns) + [column for column in filter_columns(filters) if column not in columns]
+
+    if row_groups:
+        table = parquet_file.read_row_groups(row_groups, columns=read_columns)
+    else:
+        table = parquet_file.schema_arrow.empty_table()
+        if read_columns is not None:
+            table = table.select(read_columns)
+
+    if filters:
+        table = table.filter(pq.filters_to_expression(filters))
+    if columns is not None:
+        table = table.select(list(columns))
+    return table
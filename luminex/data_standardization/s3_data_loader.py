@@ -6,21 +6,42 @@ and displays information about the resulting Pandas DataFrame.
 import sys
 import os
 import json
-from io import BytesIO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-import boto3
 from botocore.exceptions import EndpointConnectionError
 import pandas as pd
 import urllib3
 import pyarrow
 import pyarrow.parquet as pq
 
-# Add the parent directory to the Python path
+# Add the repo root and the package directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# pylint: disable=wrong-import-position
+from aws_clients import get_client
+from luminex.data_standardization.parquet_pushdown import read_parquet_pushdown
+from luminex.data_standardization.s3_ranged_download import (
+    DEFAULT_CHANGE_RETRIES,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PART_SIZE,
+    ObjectChangedError,
+    S3RangedDownloader,
+    S3RangedFile,
+)
 
 # Suppress only the InsecureRequestWarning from urllib3 needed in this case
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Number of rows parsed per DataFrame when streaming CSV objects
+DEFAULT_CSV_CHUNKSIZE = 100_000
+
+# Number of objects fetched and parsed concurrently when reading a prefix
+DEFAULT_PREFIX_WORKERS = 8
+
+SUPPORTED_FILE_TYPES = ("csv", "json", "parquet")
+
 
 class S3DataLoader:
     """
@@ -29,28 +50,56 @@ class S3DataLoader:
 
     Attributes:
         s3_client (boto3.client): S3 client with configured credentials.
+        downloader (S3RangedDownloader): Ranged, concurrent download engine used by the readers.
 
     Methods:
         - __init__: Initialize S3DataLoader with configured S3 client.
         - create_s3_client: Create S3 client with configured credentials.
         - read_csv_from_s3: Read CSV file from S3 and return Pandas DataFrame.
+        - iter_csv_from_s3: Stream CSV file from S3 as bounded Pandas DataFrame chunks.
         - read_json_from_s3: Read JSON file from S3 and return Pandas DataFrame.
         - read_parquet_from_s3: Read Parquet file from S3 and return Pandas DataFrame.
         - read_data_from_s3: Read data from S3 by file type and return Pandas DataFrame.
+        - list_prefix_keys: List the data object keys under a prefix.
+        - iter_prefix: Read every object under a prefix concurrently, yielding DataFrames.
+        - read_prefix: Read every object under a prefix into a single Pandas DataFrame.
+        - download_object: Download an object with concurrent ranged GETs.
         - display_dataframe_info: Display success message and DataFrame details.
         - main: Interact with user, read S3 data, and display DataFrame info.
     """
 
-    def __init__(self, bucket_name=None):
+    def __init__(self, bucket_name=None, part_size=DEFAULT_PART_SIZE, max_concurrency=DEFAULT_MAX_CONCURRENCY):
         """
         Initialize S3DataLoader with an S3 client using configured credentials.
 
         Parameters:
-        - None
+        - bucket_name (str): The name of the S3 bucket.
+        - part_size (int): Size in bytes of each ranged GET used to download objects.
+        - max_concurrency (int): Maximum number of ranged GETs in flight per object.
         """
         self.bucket_name = bucket_name
-        self.client = boto3.client('s3')
-        self.resource = boto3.resource('s3')
+        self.client = get_client('s3')
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+
+    @property
+    def downloader(self):
+        """
+        Ranged download engine bound to the current S3 client.
+        """
+        return S3RangedDownloader(self.client, self.part_size, self.max_concurrency)
+
+    def download_object(self, key):
+        """
+        Downloads an object from the S3 bucket with concurrent ranged GETs.
+
+        Parameters:
+        - key (str): The object key in the S3 bucket.
+
+        Returns:
+        - buffer (pyarrow.Buffer): Zero-copy view over the downloaded object.
+        """
+        return pyarrow.py_buffer(self.downloader.download(self.bucket_name, key))
 
     def read_csv_from_s3(self, key):
         """
@@ -64,10 +113,7 @@ class S3DataLoader:
         - dataframe: Pandas dataframe containing the CSV data.
         """
         try:
-            response = self.client.get_object(Bucket=self.bucket_name, Key=key)
-            csv_data = response['Body'].read()
-            dataframe = pd.read_csv(BytesIO(csv_data))
-            return dataframe
+            return self._load_object(key, "csv")
         except EndpointConnectionError as e:
             print(f"Endpoint Connection Error: {e}")
             return None
@@ -75,6 +121,43 @@ class S3DataLoader:
             print(f"Error reading CSV data from S3: {e}")
             return None
 
+    def iter_csv_from_s3(self, key, chunksize=DEFAULT_CSV_CHUNKSIZE, **read_csv_kwargs):
+        """
+        Streams a CSV file from an S3 bucket and yields Pandas DataFrames of at most
+        `chunksize` rows each.
+
+        The object body is parsed straight off the S3 stream in bounded reads, so peak
+        memory depends on `chunksize` and not on the size of the object.
+
+        Parameters:
+        - key (str): The object key for the CSV file in the S3 bucket.
+        - chunksize (int): Maximum number of rows per yielded DataFrame.
+        - read_csv_kwargs: Extra keyword arguments passed through to pd.read_csv.
+
+        Yields:
+        - dataframe: Pandas dataframe containing the next chunk of CSV data.
+
+        Raises:
+        - IOError: If the object cannot be downloaded or a row cannot be parsed, including after
+          earlier chunks were yielded, so a truncated stream is never mistaken for a complete one.
+        """
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=key)
+        except EndpointConnectionError as e:
+            raise IOError(f"Failed to read CSV object '{key}': {e}") from e
+
+        body = response['Body']
+        chunks_read = 0
+        try:
+            with pd.read_csv(body, chunksize=chunksize, **read_csv_kwargs) as reader:
+                for chunk in reader:
+                    yield chunk
+                    chunks_read += 1
+        except (EndpointConnectionError, pd.errors.EmptyDataError, pd.errors.ParserError) as e:
+            raise IOError(f"Failed to read CSV object '{key}' after {chunks_read} chunks: {e}") from e
+        finally:
+            body.close()
+
     def read_json_from_s3(self, key):
         """
         Reads a JSON file from an S3 bucket and returns a Pandas DataFrame.
@@ -87,10 +170,7 @@ class S3DataLoader:
         - dataframe: Pandas dataframe containing the JSON data.
         """
         try:
-            response = self.client.get_object(Bucket=self.bucket_name, Key=key)
-            json_data = response['Body'].read()
-            dataframe = pd.read_json(BytesIO(json_data), encoding='utf-8')
-            return dataframe
+            return self._load_object(key, "json")
         except EndpointConnectionError as e:
             print(f"Endpoint Connection Error: {e}")
             return None
@@ -98,23 +178,33 @@ class S3DataLoader:
             print(f"Error reading JSON data from S3: {e}")
             return None
 
-    def read_parquet_from_s3(self, key):
+    def read_parquet_from_s3(self, key, columns=None, filters=None):
         """
         Reads a Parquet file from an S3 bucket and returns a Pandas DataFrame.
 
+        When columns or filters are given, the Parquet footer is read first and only the
+        needed column chunks of the row groups whose statistics can match the filters are
+        fetched with ranged GETs.
+
         Parameters:
         - bucket (str): The name of the S3 bucket.
         - key (str): The object key for the Parquet file in the S3 bucket.
+        - columns (list): Columns to read; all columns when None.
+        - filters (list): Row filters in pyarrow DNF form, e.g. [('year', '>=', 2023)].
 
         Returns:
         - dataframe: Pandas dataframe containing the Parquet data.
         """
         try:
-            response = self.client.get_object(Bucket=self.bucket_name, Key=key)
-            parquet_data = response['Body'].read()
-            table = pq.read_table(BytesIO(parquet_data))
-            dataframe = table.to_pandas()
-            return dataframe
+            if columns is None and not filters:
+                return self._load_object(key, "parquet")
+            # The footer and column chunks must come from one version, so an overwrite restarts the read
+            for _ in range(DEFAULT_CHANGE_RETRIES):
+                try:
+                    return self._read_parquet_pushdown(key, columns, filters)
+                except ObjectChangedError:
+                    continue
+            return self._read_parquet_pushdown(key, columns, filters)
         except EndpointConnectionError as e:
             print(f"Endpoint Connection Error: {e}")
             return None
@@ -122,6 +212,22 @@ class S3DataLoader:
             print(f"Error reading Parquet data from S3: {e}")
             return None
 
+    def _read_parquet_pushdown(self, key, columns, filters):
+        with S3RangedFile(self.downloader, self.bucket_name, key) as parquet_file:
+            table = read_parquet_pushdown(parquet_file, columns=columns, filters=filters)
+        return table.to_pandas()
+
+    def _load_object(self, key, file_type):
+        """
+        Downloads and parses one object; unlike the read_* methods, errors are raised.
+        """
+        data = self.download_object(key)
+        if file_type == "csv":
+            return pd.read_csv(pyarrow.BufferReader(data))
+        if file_type == "json":
+            return pd.read_json(pyarrow.BufferReader(data), encoding='utf-8')
+        return pq.read_table(data).to_pandas()
+
     def read_data_from_s3(self, key, file_type):
         """
         Reads data from an S3 bucket by file type, returns a Pandas DataFrame.
@@ -144,6 +250,111 @@ class S3DataLoader:
         print("Unsupported file type. Choose 'csv', 'json', or 'parquet'.")
         return None
 
+    def list_prefix_keys(self, prefix):
+        """
+        Lists the data object keys under a prefix, paging through list_objects_v2.
+
+        Folder markers, empty objects and Hadoop/Spark metadata files whose name starts
+        with '_' or '.' (e.g. _SUCCESS) are skipped.
+
+        Parameters:
+        - prefix (str): The key prefix in the S3 bucket.
+
+        Returns:
+        - keys (list): Object keys in listing order.
+        """
+        keys = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for item in page.get('Contents', []):
+                file_name = item['Key'].rsplit('/', 1)[-1]
+                if not file_name or file_name.startswith(('_', '.')) or item.get('Size', 0) == 0:
+                    continue
+                keys.append(item['Key'])
+        return keys
+
+    def iter_prefix(self, prefix, file_type, max_workers=DEFAULT_PREFIX_WORKERS):
+        """
+        Reads every object under a prefix and yields one Pandas DataFrame per object,
+        in key order.
+
+        Objects are fetched and parsed on a pool of `max_workers` threads, and at most
+        `max_workers` parsed objects are held ahead of the consumer. Objects that cannot be
+        read do not stop the others; once every object has been tried, an IOError naming
+        all failed keys is raised, so a partial prefix is never mistaken for a complete one.
+
+        Parameters:
+        - prefix (str): The key prefix in the S3 bucket.
+        - file_type (str): The type of the files ("csv", "json", or "parquet").
+        - max_workers (int): Maximum number of objects fetched and parsed concurrently.
+
+        Yields:
+        - dataframe: Pandas dataframe containing the data of the next object.
+
+        Raises:
+        - IOError: If any object under the prefix could not be downloaded or parsed.
+        """
+        if file_type.lower() not in SUPPORTED_FILE_TYPES:
+            print("Unsupported file type. Choose 'csv', 'json', or 'parquet'.")
+            return
+
+        keys = self.list_prefix_keys(prefix)
+        failures = {}
+        pending = deque()
+
+        def next_result():
+            done_key, future = pending.popleft()
+            try:
+                return future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                failures[done_key] = e
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for key in keys:
+                pending.append((key, executor.submit(self._load_object, key, file_type.lower())))
+                if len(pending) >= max_workers:
+                    dataframe = next_result()
+                    if dataframe is not None:
+                        yield dataframe
+            while pending:
+                dataframe = next_result()
+                if dataframe is not None:
+                    yield dataframe
+
+        if failures:
+            details = '; '.join(f"{key}: {error}" for key, error in failures.items())
+            raise IOError(f"Failed to read {len(failures)} of {len(keys)} objects under prefix '{prefix}': "
+                          f"{details}") from next(iter(failures.values()))
+
+    def read_prefix(self, prefix, file_type, max_workers=DEFAULT_PREFIX_WORKERS, iterator=False):
+        """
+        Reads every object under a prefix, e.g. the part files of a Spark output,
+        and concatenates them once into a single Pandas DataFrame.
+
+        Parameters:
+        - prefix (str): The key prefix in the S3 bucket.
+        - file_type (str): The type of the files ("csv", "json", or "parquet").
+        - max_workers (int): Maximum number of objects fetched and parsed concurrently.
+        - iterator (bool): Return the per-object DataFrame iterator instead of concatenating.
+
+        Returns:
+        - dataframe: Pandas dataframe containing the data of all objects, or an iterator
+          of per-object DataFrames when `iterator` is True.
+
+        Raises:
+        - IOError: If any object under the prefix could not be downloaded or parsed.
+        """
+        dataframes = self.iter_prefix(prefix, file_type, max_workers=max_workers)
+        if iterator:
+            return dataframes
+
+        dataframes = list(dataframes)
+        if not dataframes:
+            print(f"No data could be read under prefix '{prefix}'.")
+            return None
+        return pd.concat(dataframes, ignore_index=True)
+
     def display_dataframe_info(self, df):
         """
         Displays success message, number of rows, number of columns.
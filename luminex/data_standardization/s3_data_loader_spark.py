@@ -4,74 +4,130 @@ reads various file types (CSV, JSON, Parquet) resulting PySpark DataFrame.
 """
 import os
 import sys
-import subprocess
-from pyspark.sql import SparkSession
 
-# # Add the parent directory to the Python path
-# sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-# from config import aws_config
+# Add the repo root and the package directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# get repo root level
-root_path = subprocess.run(
-    ["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True, check=False
-).stdout.rstrip("\n")
-# add repo path to use all libraries
-sys.path.append(root_path)
+# pylint: disable=wrong-import-position
+from aws_clients import get_client
+from configs import load_cfg
+from luminex.data_standardization.schema_registry import SchemaRegistry
+from luminex.data_standardization.spark_session import get_default_provider
 
-from configs import Config
+cfg = load_cfg()
+
+# Bytes read from the start of a CSV file to take its header line
+HEADER_RANGE_BYTES = 65536
+
+
+def source_fingerprint(s3_client, source_path, file_type):
+    """
+    Fingerprints an S3 source by its first data file, so a registered schema can be checked
+    against it without running a Spark job.
+
+    Parameters:
+        s3_client (boto3.client): S3 client used to list and read the source.
+        source_path (str): The s3:// or s3a:// prefix or file path.
+        file_type (str): 'csv' is fingerprinted by its header line, other types by the file's ETag and size.
+
+    Returns:
+        fingerprint (dict): The fingerprint, or None for a non-S3 path or a prefix without data files.
+    """
+    scheme, _, location = source_path.partition('://')
+    if scheme not in ('s3', 's3a', 's3n'):
+        return None
+    bucket, _, prefix = location.partition('/')
+    response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=100)
+    # Spark writes markers such as _SUCCESS and hidden .crc files next to the data
+    sample = next((obj for obj in response.get('Contents', [])
+                   if obj['Size'] > 0 and not os.path.basename(obj['Key']).startswith(('_', '.'))), None)
+    if sample is None:
+        return None
+    if file_type == 'csv':
+        head = s3_client.get_object(Bucket=bucket, Key=sample['Key'], Range=f'bytes=0-{HEADER_RANGE_BYTES - 1}')
+        return {'header': head['Body'].read().split(b'\n', 1)[0].decode('utf-8', errors='replace').rstrip('\r')}
+    return {'key': sample['Key'], 'etag': sample.get('ETag'), 'size': sample['Size']}
 
-cfg = Config('../configs/config.yaml')
 
 class S3DataLoader:
     """
     This class Manages interaction with S3, reads CSV, JSON, or Parquet files,
     and converts data to a PySpark dataframe.
     """
-    def __init__(self):
+    def __init__(self, spark=None, session_provider=None, schema_registry=None, s3_client=None):
         """
-        Create a Spark session
+        Use the shared Spark session; it is built on first use and reused by every loader.
         Parameters:
-            self
+            spark (SparkSession): Session to read with; the provider's current session, resolved
+                on every read, when None.
+            session_provider (SparkSessionProvider): Provider of the shared session; the process-wide one when None.
+            schema_registry (SchemaRegistry): Registry of inferred CSV/JSON schemas; schemas are
+                inferred on every read when None.
+            s3_client (boto3.client): S3 client used to fingerprint sources for the schema registry;
+                the shared client when None.
         Returns:
             None
         """
-        self.spark = SparkSession.builder\
-                .appName("S3ReadExample")\
-                .config("spark.jars.packages", "org.apache.hadoop:hadoop-aws:3.3.2")\
-                .config("spark.hadoop.fs.s3a.impl", "org.apache.hadoop.fs.s3a.S3AFileSystem")\
-                .config("spark.hadoop.fs.s3a.access.key", cfg.get('aws/access_key_id')) \
-                .config("spark.hadoop.fs.s3a.secret.key", cfg.get('aws/secret_access_key')) \
-                .config("spark.hadoop.fs.s3a.session.token", cfg.get('aws/session_token'))\
-                .getOrCreate()
-
-    def read_csv_to_df(self, bucket_folder_path):
+        self._spark = spark
+        self.session_provider = session_provider
+        self.schema_registry = schema_registry
+        self.s3_client = s3_client
+
+    @property
+    def spark(self):
+        """
+        The session to read with; a provider's session is looked up on each use, so a loader
+        outlives the session being stopped and rebuilt.
+        """
+        return self._spark or (self.session_provider or get_default_provider()).get_session()
+
+    def read_csv_to_df(self, bucket_folder_path, schema=None):
         """
         Reads CSV data from an S3 bucket folder path into a Spark DataFrame.
 
         Parameters:
             bucket_folder_path (str): The S3 bucket folder path containing the CSV files.
+            schema (StructType or str): Schema as a StructType or DDL string; taken from the
+                schema registry, or inferred with an extra pass over the data, when None.
 
         Returns:
             df: A Spark DataFrame representing the CSV data.
         """
-        df = self.spark.read.csv(bucket_folder_path, header=True, inferSchema=True)
-        self.spark.stop()
-
-        return df
+        return self._read_with_schema(self.spark.read.csv, bucket_folder_path, 'csv', schema, header=True)
 
-    def read_json_to_df(self, bucket_folder_path):
+    def read_json_to_df(self, bucket_folder_path, schema=None):
         """
         Reads data from a JSON file into a Spark DataFrame.
 
         Parameters:
             bucket_folder_path (str): The file path of the JSON file.
+            schema (StructType or str): Schema as a StructType or DDL string; taken from the
+                schema registry, or inferred with an extra pass over the data, when None.
 
         Returns:
             df: A Spark DataFrame representing the JSON data.
         """
-        df = self.spark.read.json(bucket_folder_path, multiLine=True)
-        self.spark.stop()
+        return self._read_with_schema(self.spark.read.json, bucket_folder_path, 'json', schema, multiLine=True)
 
+    def _read_with_schema(self, reader, bucket_folder_path, file_type, schema, **options):
+        """
+        Reads with an explicit or registered schema, skipping inference. Without either, or when
+        the source no longer matches the registered fingerprint, the schema is inferred and
+        registered for the following reads of the same prefix.
+        """
+        fingerprint = None
+        if schema is None and self.schema_registry is not None:
+            fingerprint = source_fingerprint(self.s3_client or get_client('s3'), bucket_folder_path, file_type)
+            schema = self.schema_registry.get(bucket_folder_path, file_type, fingerprint)
+        if schema is not None:
+            return reader(bucket_folder_path, schema=schema, **options)
+
+        if file_type == 'csv':
+            options['inferSchema'] = True
+        df = reader(bucket_folder_path, **options)
+        if self.schema_registry is not None:
+            self.schema_registry.put(bucket_folder_path, file_type, df.schema, fingerprint)
         return df
 
     def read_parquet_to_df(self, bucket_folder_path):
@@ -85,8 +141,6 @@ class S3DataLoader:
             df: A Spark DataFrame representing the Parquet data.
         """
         df = self.spark.read.parquet(bucket_folder_path)
-        self.spark.stop()
-
         return df
 
     @staticmethod
@@ -98,24 +152,28 @@ class S3DataLoader:
             bucket_folder_path (str): The S3 bucket folder path containing the data files.
 
         Returns:
-            None
+            df: A Spark DataFrame of the data, or None for an unsupported extension.
         """
-        s3_data_loader = S3DataLoader()
+        s3_data_loader = S3DataLoader(schema_registry=SchemaRegistry(cfg["SPARK"]["SCHEMA_REGISTRY_DIR"]))
 
         # Choose the appropriate method based on the file extension
         if bucket_folder_path.lower().endswith(".json"):
-            s3_data_loader.read_json_to_df(bucket_folder_path)
+            return s3_data_loader.read_json_to_df(bucket_folder_path)
         if bucket_folder_path.lower().endswith(".csv"):
-            s3_data_loader.read_csv_to_df(bucket_folder_path)
+            return s3_data_loader.read_csv_to_df(bucket_folder_path)
         if bucket_folder_path.lower().endswith(".parquet"):
-            s3_data_loader.read_parquet_to_df(bucket_folder_path)
+            return s3_data_loader.read_parquet_to_df(bucket_folder_path)
+        return None
 
 def main():
     """
     Main function to initiate the S3 data processing.
     """
     bucket_folder_path = sys.argv[1]
-    S3DataLoader.process_s3_data(bucket_folder_path)
+    with get_default_provider().session():
+        df = S3DataLoader.process_s3_data(bucket_folder_path)
+        if df is not None:
+            df.printSchema()
 
 if __name__ == '__main__':
     main()
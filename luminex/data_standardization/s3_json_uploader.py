@@ -1,16 +1,137 @@
-from pyspark.sql import SparkSession
+import math
 import sys
 import os
 import urllib3
-import boto3
 import json
 
-# Add the parent directory to the Python path
+# Add the repo root and the package directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from aws_clients import get_client
+from luminex.data_standardization.spark_session import get_default_provider
+
 # Suppress only the InsecureRequestWarning from urllib3 needed in this case
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Size aimed at for each output file, in bytes
+DEFAULT_TARGET_FILE_SIZE = 128 * 1024 * 1024
+
+# Size of a Parquet row group or ORC stripe, in bytes
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024 * 1024
+
+COLUMNAR_FORMATS = ('parquet', 'orc')
+
+
+def estimate_size_in_bytes(df):
+    """
+    Estimates the size of a DataFrame from the statistics of its optimized plan,
+    without running a job.
+
+    Parameters:
+    - df (pyspark.sql.DataFrame): The DataFrame to estimate.
+
+    Returns:
+    - (size_in_bytes, row_count) (tuple): Estimated size, or None if Spark has no estimate, and
+      estimated row count, or None if unknown.
+    """
+    try:
+        stats = df._jdf.queryExecution().optimizedPlan().stats()
+        size_in_bytes = int(stats.sizeInBytes().toString())
+        row_count = stats.rowCount()
+        row_count = int(row_count.get().toString()) if row_count.isDefined() else None
+    except Exception:  # pylint: disable=broad-except
+        return None, None
+    return size_in_bytes, row_count
+
+
+def estimate_row_width(df):
+    """
+    Estimates the size of one row from the default sizes of the schema's types, without running a job.
+
+    Parameters:
+    - df (pyspark.sql.DataFrame): The DataFrame to estimate.
+
+    Returns:
+    - row_width (int): Estimated bytes per row, or None if Spark cannot size the schema.
+    """
+    try:
+        row_width = int(df._jdf.schema().defaultSize())
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return row_width or None
+
+
+def plan_output_files(size_in_bytes, row_count, target_file_size=DEFAULT_TARGET_FILE_SIZE, partition_by=None,
+                      row_width=None):
+    """
+    Derives the output layout that produces files of about target_file_size bytes.
+
+    Parameters:
+    - size_in_bytes (int): Estimated data size, or None if unknown.
+    - row_count (int): Estimated row count, or None if unknown.
+    - target_file_size (int): Size aimed at for each output file, in bytes.
+    - partition_by (list): Columns the output is partitioned by.
+    - row_width (int): Estimated bytes per row, used for the row cap when row_count is unknown.
+
+    Returns:
+    - (num_partitions, max_records_per_file) (tuple): Partition count to write with, and a per-file row cap
+      when partitioning by columns; each is None when it cannot be derived.
+    """
+    # Spark reports Long.MaxValue and similar when it cannot size a plan
+    if not size_in_bytes or size_in_bytes >= 2 ** 62:
+        return None, None
+    num_partitions = max(1, math.ceil(size_in_bytes / target_file_size))
+
+    max_records_per_file = None
+    if partition_by and row_count:
+        # Rows of one partition value share a task, so large values are split by row count instead
+        max_records_per_file = max(1, int(target_file_size * row_count / size_in_bytes))
+    elif partition_by and row_width:
+        # Plain file scans carry no row count statistics; the schema's row width gives the cap instead
+        max_records_per_file = max(1, target_file_size // row_width)
+    return num_partitions, max_records_per_file
+
+
+def columnar_write_options(output_format, row_group_size=DEFAULT_ROW_GROUP_SIZE, dictionary_encoding=True,
+                           bloom_filter_columns=None, bloom_filter_fpp=None):
+    """
+    Builds the writer options of a Parquet or ORC write.
+
+    Parameters:
+    - output_format (str): 'parquet' or 'orc'.
+    - row_group_size (int): Parquet row group or ORC stripe size, in bytes; the format's default when None.
+    - dictionary_encoding (bool): Whether columns are dictionary encoded.
+    - bloom_filter_columns (list): Columns to write bloom filters for.
+    - bloom_filter_fpp (float): False positive probability of the bloom filters; the format's default when None.
+
+    Returns:
+    - options (dict): Writer options, values as strings.
+    """
+    bloom_filter_columns = list(bloom_filter_columns or [])
+    options = {}
+    if output_format == 'parquet':
+        if row_group_size:
+            options['parquet.block.size'] = str(row_group_size)
+        options['parquet.enable.dictionary'] = str(dictionary_encoding).lower()
+        for column in bloom_filter_columns:
+            options[f'parquet.bloom.filter.enabled#{column}'] = 'true'
+            if bloom_filter_fpp is not None:
+                options[f'parquet.bloom.filter.fpp#{column}'] = str(bloom_filter_fpp)
+    elif output_format == 'orc':
+        if row_group_size:
+            options['orc.stripe.size'] = str(row_group_size)
+        # ORC dictionary encodes a column while its distinct/total ratio stays under the threshold
+        options['orc.dictionary.key.threshold'] = '0.8' if dictionary_encoding else '0'
+        if bloom_filter_columns:
+            options['orc.bloom.filter.columns'] = ','.join(bloom_filter_columns)
+            if bloom_filter_fpp is not None:
+                options['orc.bloom.filter.fpp'] = str(bloom_filter_fpp)
+    else:
+        raise ValueError(f"Unsupported columnar format: {output_format}, expected one of {', '.join(COLUMNAR_FORMATS)}")
+    return options
+
+
 class S3DataUploader:
 
     def __init__(self, bucket_name=None):
@@ -21,8 +142,79 @@ class S3DataUploader:
         - None
         """
         self.bucket_name = bucket_name
-        self.client = boto3.client('s3')
-        self.resource = boto3.resource('s3')
+        self.client = get_client('s3')
+
+    def write_df(self, df, output_path, output_format='parquet', partition_by=None,
+                 target_file_size=DEFAULT_TARGET_FILE_SIZE, compression=None, mode='overwrite', options=None,
+                 sort_by=None):
+        """
+        Writes a Spark DataFrame with right-sized output files.
+
+        Parameters:
+        - df (pyspark.sql.DataFrame): The DataFrame to write.
+        - output_path (str): Output location in S3.
+        - output_format (str): Output format, e.g. 'parquet', 'orc', 'json' or 'csv'.
+        - partition_by (list): Columns to partition the output directories by.
+        - target_file_size (int): Size aimed at for each output file, in bytes; the partition
+          count is derived from the estimated size of the DataFrame. Partitioned writes also cap
+          the rows per file, from the schema's row width when Spark has no row count estimate.
+        - compression (str): Compression codec, e.g. 'snappy', 'zstd' or 'gzip'; the format's default when None.
+        - mode (str): Save mode.
+        - options (dict): Extra writer options.
+        - sort_by (list): Columns to sort each output file by, so readers can prune on their statistics.
+        """
+        partition_by = list(partition_by or [])
+        size_in_bytes, row_count = estimate_size_in_bytes(df)
+        row_width = estimate_row_width(df) if partition_by and row_count is None else None
+        num_partitions, max_records_per_file = plan_output_files(size_in_bytes, row_count, target_file_size,
+                                                                 partition_by, row_width)
+
+        if num_partitions is not None:
+            # A shuffle even when reducing the partition count: coalesce would also cut the tasks of
+            # the stages computing df down to num_partitions
+            df = df.repartition(num_partitions, *partition_by)
+        if sort_by:
+            # Partition columns lead so each task writes its partition directories one at a time
+            df = df.sortWithinPartitions(*(partition_by + [column for column in sort_by if column not in partition_by]))
+
+        writer = df.write.format(output_format).mode(mode)
+        if partition_by:
+            writer = writer.partitionBy(*partition_by)
+        if compression:
+            writer = writer.option("compression", compression)
+        if max_records_per_file:
+            writer = writer.option("maxRecordsPerFile", max_records_per_file)
+        for key, value in (options or {}).items():
+            writer = writer.option(key, value)
+        writer.save(output_path)
+
+    def write_columnar(self, df, output_path, output_format='parquet', partition_by=None, sort_by=None,
+                       row_group_size=DEFAULT_ROW_GROUP_SIZE, dictionary_encoding=True, bloom_filter_columns=None,
+                       bloom_filter_fpp=None, target_file_size=DEFAULT_TARGET_FILE_SIZE, compression='snappy',
+                       mode='overwrite'):
+        """
+        Writes a Spark DataFrame as Parquet or ORC, laid out for statistics-based pruning.
+
+        Parameters:
+        - df (pyspark.sql.DataFrame): The DataFrame to write.
+        - output_path (str): Output location in S3.
+        - output_format (str): 'parquet' or 'orc'.
+        - partition_by (list): Columns to partition the output directories by.
+        - sort_by (list): Columns to sort each file by; narrows the min/max range of every row group.
+        - row_group_size (int): Parquet row group or ORC stripe size, in bytes.
+        - dictionary_encoding (bool): Whether columns are dictionary encoded.
+        - bloom_filter_columns (list): Columns to write bloom filters for, e.g. high-cardinality lookup keys.
+        - bloom_filter_fpp (float): False positive probability of the bloom filters.
+        - target_file_size (int): Size aimed at for each output file, in bytes.
+        - compression (str): Compression codec, e.g. 'snappy' or 'zstd'.
+        - mode (str): Save mode.
+        """
+        options = columnar_write_options(output_format, row_group_size=row_group_size,
+                                         dictionary_encoding=dictionary_encoding,
+                                         bloom_filter_columns=bloom_filter_columns, bloom_filter_fpp=bloom_filter_fpp)
+        self.write_df(df, output_path, output_format=output_format, partition_by=partition_by,
+                      target_file_size=target_file_size, compression=compression, mode=mode, options=options,
+                      sort_by=sort_by)
 
     def pyspark_df_json_upload(self,df,output_format,output_path):
 
@@ -31,7 +223,7 @@ class S3DataUploader:
         output_format : format of the transformed-data
         output_path : output data stored location in s3
         """
-        df.repartition.write.format(output_format).mode("overwrite").save(output_path)
+        self.write_df(df, output_path, output_format=output_format)
 
 
     def main(self,df,output_format,output_path):
@@ -48,10 +240,10 @@ class S3DataUploader:
 
 if __name__ == "__main__":
 
-    spark = SparkSession.builder.appName("luminex").getOrCreate()
     input_data= r'xxx'
-    df = spark.read.csv(input_data,header=True,inferSchema=True)
     output_format= 'json'
     output_path = r'xxx'
-    data_uploader = S3DataUploader()
-    data_uploader.main(df)
\ No newline at end of file
+    with get_default_provider().session() as spark:
+        df = spark.read.csv(input_data,header=True,inferSchema=True)
+        data_uploader = S3DataUploader()
+        data_uploader.main(df,output_format,output_path)
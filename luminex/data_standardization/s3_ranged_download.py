@@ -0,0 +1,276 @@
+"""
+This module defines the S3RangedDownloader class, which fetches an S3 object
+as concurrent byte-range GETs and reassembles the parts into one preallocated buffer,
+and the S3RangedFile class, a seekable file object that reads S3 objects on demand.
+Every range after the first is pinned to the object's ETag, so an object overwritten
+mid-read raises ObjectChangedError instead of being stitched from two versions.
+"""
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
+# Size of each ranged GET request, in bytes
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+# Number of ranged GET requests in flight per object
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Size of the reads used to copy a part body into the shared buffer
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Times a download restarts from the first part after the object changed under it
+DEFAULT_CHANGE_RETRIES = 2
+
+CONTENT_RANGE_PATTERN = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+
+
+class ObjectChangedError(IOError):
+    """
+    Raised when an object is overwritten while its ranges are read; reading it again from the start is safe.
+    """
+
+
+class S3RangedDownloader:
+    """
+    S3RangedDownloader: Downloads S3 objects by splitting them into byte ranges,
+    fetching the ranges on a thread pool and writing them into a single buffer.
+
+    Attributes:
+        client (boto3.client): S3 client used for the ranged GET requests.
+        part_size (int): Size in bytes of each ranged GET.
+        max_concurrency (int): Maximum number of ranged GETs in flight per object.
+
+    Methods:
+        - download: Fetch a whole object and return it as a bytearray.
+        - fetch_ranges_into: Fill a buffer view from an object offset with concurrent ranged GETs.
+        - fetch_range: Fetch an inclusive byte range of an object into a buffer view.
+    """
+
+    def __init__(self, client, part_size=DEFAULT_PART_SIZE, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """
+        Initialize S3RangedDownloader.
+
+        Parameters:
+        - client (boto3.client): S3 client used for the ranged GET requests.
+        - part_size (int): Size in bytes of each ranged GET.
+        - max_concurrency (int): Maximum number of ranged GETs in flight per object.
+        """
+        if part_size <= 0:
+            raise ValueError("part_size must be a positive number of bytes.")
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive number.")
+        self.client = client
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+
+    def download(self, bucket, key):
+        """
+        Downloads an S3 object with concurrent ranged GETs.
+
+        The first part is fetched on its own; its Content-Range header carries the
+        object size, so no separate HEAD request is needed. Objects that fit in a
+        single part are returned after that one request. The other parts are pinned
+        to the ETag of the first, and the download starts over if the object changes.
+
+        Parameters:
+        - bucket (str): The name of the S3 bucket.
+        - key (str): The object key in the S3 bucket.
+
+        Returns:
+        - buffer (bytearray): The full object contents.
+
+        Raises:
+        - ObjectChangedError: If the object kept changing for DEFAULT_CHANGE_RETRIES restarts.
+        """
+        for _ in range(DEFAULT_CHANGE_RETRIES):
+            try:
+                return self._download_once(bucket, key)
+            except ObjectChangedError:
+                continue
+        return self._download_once(bucket, key)
+
+    def _download_once(self, bucket, key):
+        try:
+            response = self.client.get_object(Bucket=bucket, Key=key, Range=f'bytes=0-{self.part_size - 1}')
+        except ClientError as e:
+            # Ranged GETs on empty objects are rejected, the object is simply empty
+            if e.response['Error']['Code'] == 'InvalidRange':
+                return bytearray()
+            raise
+
+        total_size = self._object_size(response)
+        buffer = bytearray(total_size)
+        view = memoryview(buffer)
+        first_end = min(self.part_size, total_size)
+        self._copy_body(response['Body'], view[:first_end])
+
+        self.fetch_ranges_into(bucket, key, first_end, view[first_end:], etag=response.get('ETag'))
+
+        return buffer
+
+    def fetch_ranges_into(self, bucket, key, offset, target, etag=None):
+        """
+        Fills a writable buffer view with object bytes starting at `offset`,
+        splitting the span into part_size ranges fetched concurrently.
+
+        Parameters:
+        - bucket (str): The name of the S3 bucket.
+        - key (str): The object key in the S3 bucket.
+        - offset (int): Object offset of the first byte to fetch.
+        - target (memoryview): Writable view to fill; its length sets the span.
+        - etag (str): ETag every range must match; unpinned when None.
+        """
+        ranges = [(start, min(start + self.part_size, len(target)) - 1)
+                  for start in range(0, len(target), self.part_size)]
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.fetch_range(bucket, key, offset + start, offset + end, target, etag)
+        elif ranges:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(ranges))) as executor:
+                futures = [executor.submit(self.fetch_range, bucket, key, offset + start, offset + end,
+                                           target[start:end + 1], etag)
+                           for start, end in ranges]
+                for future in futures:
+                    future.result()
+
+    def fetch_range(self, bucket, key, start, end, target, etag=None):
+        """
+        Fetches an inclusive byte range of an S3 object into a writable buffer view.
+
+        Parameters:
+        - bucket (str): The name of the S3 bucket.
+        - key (str): The object key in the S3 bucket.
+        - start (int): First byte offset of the range.
+        - end (int): Last byte offset of the range (inclusive).
+        - target (memoryview): Writable view of exactly end - start + 1 bytes.
+        - etag (str): ETag the object must still have; unpinned when None.
+
+        Raises:
+        - ObjectChangedError: If the object no longer matches etag.
+        """
+        kwargs = {'IfMatch': etag} if etag else {}
+        try:
+            response = self.client.get_object(Bucket=bucket, Key=key, Range=f'bytes={start}-{end}', **kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('PreconditionFailed', '412'):
+                raise ObjectChangedError(f"s3://{bucket}/{key} changed while it was being read.") from e
+            raise
+        self._copy_body(response['Body'], target)
+
+    @staticmethod
+    def _object_size(response):
+        """
+        Reads the total object size from a ranged GET response.
+        """
+        match = CONTENT_RANGE_PATTERN.match(response.get('ContentRange', ''))
+        if match:
+            return int(match.group(3))
+        # The object was returned whole, e.g. by a backend ignoring the Range header
+        return response['ContentLength']
+
+    @staticmethod
+    def _copy_body(body, target):
+        """
+        Copies a streaming body into a buffer view in bounded reads.
+        """
+        offset = 0
+        try:
+            while offset < len(target):
+                chunk = body.read(min(COPY_BUFFER_SIZE, len(target) - offset))
+                if not chunk:
+                    break
+                target[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+        finally:
+            body.close()
+        if offset != len(target):
+            raise IOError(f"Incomplete ranged read: expected {len(target)} bytes, got {offset}.")
+
+
+class S3RangedFile(io.RawIOBase):
+    """
+    S3RangedFile: Read-only, seekable file object over an S3 object. Every read is
+    served by ranged GETs, so only the bytes actually read are transferred.
+
+    Attributes:
+        downloader (S3RangedDownloader): Engine used to serve reads.
+        bucket (str): The name of the S3 bucket.
+        key (str): The object key in the S3 bucket.
+        size (int): Total object size in bytes.
+        etag (str): ETag every read is pinned to, so all reads see one version of the object.
+        bytes_fetched (int): Number of object bytes transferred so far.
+    """
+
+    def __init__(self, downloader, bucket, key, size=None, etag=None):
+        """
+        Initialize S3RangedFile.
+
+        Parameters:
+        - downloader (S3RangedDownloader): Engine used to serve reads.
+        - bucket (str): The name of the S3 bucket.
+        - key (str): The object key in the S3 bucket.
+        - size (int): Object size in bytes; looked up with a HEAD request when omitted.
+        - etag (str): ETag reads are pinned to; taken from the HEAD request when size is omitted.
+          Reads are unpinned when a size is given without an etag.
+        """
+        super().__init__()
+        self.downloader = downloader
+        self.bucket = bucket
+        self.key = key
+        if size is None:
+            head = downloader.client.head_object(Bucket=bucket, Key=key)
+            size, etag = head['ContentLength'], etag or head.get('ETag')
+        self.size = size
+        self.etag = etag
+        self.position = 0
+        self.bytes_fetched = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """
+        Moves the read position; no request is made until the next read.
+        """
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position.")
+        self.position = position
+        return self.position
+
+    def readinto(self, b):
+        """
+        Reads up to len(b) bytes from the current position into b; raises ObjectChangedError
+        if the object was overwritten since the file was opened.
+        """
+        view = memoryview(b).cast('B')
+        length = min(len(view), self.size - self.position)
+        if length <= 0:
+            return 0
+        self.downloader.fetch_ranges_into(self.bucket, self.key, self.position, view[:length], etag=self.etag)
+        self.position += length
+        self.bytes_fetched += length
+        return length
+
+    def readall(self):
+        """
+        Reads from the current position to the end of the object in one pass.
+        """
+        buffer = bytearray(max(self.size - self.position, 0))
+        self.readinto(buffer)
+        return bytes(buffer)
@@ -0,0 +1,87 @@
+"""
+This module defines the SchemaRegistry class, a local store of Spark schemas keyed by
+source prefix and file type, so a schema is inferred once and reused by later reads.
+Each schema is stored with a fingerprint of its source, so a changed source is inferred again.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from pyspark.sql.types import StructType
+
+
+class SchemaRegistry:
+    """
+    SchemaRegistry: Persists one Spark schema as JSON per source prefix and file type.
+
+    Attributes:
+        registry_dir (str): Directory holding one JSON file per registered schema.
+    """
+
+    def __init__(self, registry_dir):
+        """
+        Initialize SchemaRegistry.
+
+        Parameters:
+            registry_dir (str): Directory holding the schema files; created on first write.
+        """
+        self.registry_dir = os.path.expanduser(registry_dir)
+
+    def path(self, source_path, file_type):
+        """
+        Returns the schema file path of a source prefix and file type.
+        """
+        key = f'{file_type}:{source_path.rstrip("/")}'
+        return os.path.join(self.registry_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, source_path, file_type, fingerprint=None):
+        """
+        Returns the registered schema of a source prefix, or None if none is registered or
+        the source no longer matches the fingerprint it was registered with.
+
+        Parameters:
+            source_path (str): The source prefix or file path.
+            file_type (str): The file type the schema was inferred for, e.g. 'csv'.
+            fingerprint (dict): Current fingerprint of the source; not checked when None.
+
+        Returns:
+            schema (StructType): The registered schema, or None.
+        """
+        try:
+            with open(self.path(source_path, file_type)) as file:
+                entry = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+        if fingerprint is not None and entry.get('fingerprint') != fingerprint:
+            print(f"Registered {file_type} schema of {source_path} no longer matches its source, inferring it again.")
+            return None
+        return StructType.fromJson(entry['schema'])
+
+    def put(self, source_path, file_type, schema, fingerprint=None):
+        """
+        Registers the schema of a source prefix; the write is atomic so concurrent
+        runs never read a partial entry.
+
+        Parameters:
+            source_path (str): The source prefix or file path.
+            file_type (str): The file type the schema was inferred for, e.g. 'csv'.
+            schema (StructType): The schema to register.
+            fingerprint (dict): Fingerprint of the source the schema was inferred from.
+        """
+        os.makedirs(self.registry_dir, exist_ok=True)
+        entry = {'source_path': source_path, 'file_type': file_type, 'schema': schema.jsonValue(),
+                 'fingerprint': fingerprint}
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.registry_dir, prefix='.schema.')
+        with os.fdopen(file_descriptor, 'w') as file:
+            json.dump(entry, file)
+        os.replace(temp_path, self.path(source_path, file_type))
+
+    def invalidate(self, source_path, file_type):
+        """
+        Drops the registered schema of a source prefix, e.g. after its layout changed.
+        """
+        try:
+            os.remove(self.path(source_path, file_type))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,260 @@
+"""
+This module defines the SparkSessionProvider class, which builds the SparkSession used
+by luminex once per process and hands the same session to every reader and writer, so
+the JVM start and the hadoop-aws jar resolution are paid only once.
+"""
+import glob
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+import pyspark
+from pyspark.sql import SparkSession
+
+# Add the package directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# pylint: disable=wrong-import-position
+from configs import load_cfg
+
+# Hadoop version of Spark 3.4 and 3.5, used when the pyspark install bundles no Hadoop client jar
+DEFAULT_HADOOP_VERSION = "3.3.4"
+
+
+def bundled_hadoop_version(jars_dir=None):
+    """
+    Returns the Hadoop version pyspark was built against, from its bundled Hadoop client jar.
+
+    Parameters:
+        jars_dir (str): Directory of the pyspark jars; the installed pyspark's when None.
+
+    Returns:
+        version (str): Hadoop version, DEFAULT_HADOOP_VERSION when no client jar is found.
+    """
+    jars_dir = jars_dir or os.path.join(os.path.dirname(pyspark.__file__), "jars")
+    for jar in sorted(glob.glob(os.path.join(jars_dir, "hadoop-client-api-*.jar"))):
+        return os.path.basename(jar)[len("hadoop-client-api-"):-len(".jar")]
+    return DEFAULT_HADOOP_VERSION
+
+
+HADOOP_VERSION = bundled_hadoop_version()
+
+# Connector that provides the s3a:// filesystem; it must match the Hadoop classes Spark runs with
+HADOOP_AWS_PACKAGE = f"org.apache.hadoop:hadoop-aws:{HADOOP_VERSION}"
+
+# Spark's cloud committer bindings, needed by the S3A committers. The artifact of a Spark release depends
+# on hadoop-aws at the Hadoop version that release bundles, i.e. HADOOP_VERSION, so both resolve to one jar
+SPARK_HADOOP_CLOUD_PACKAGE = "org.apache.spark:spark-hadoop-cloud_{scala}:{version}".format(
+    scala="2.13" if int(pyspark.__version__.split(".")[0]) >= 4 else "2.12", version=pyspark.__version__)
+
+DEFAULT_APP_NAME = "luminex"
+
+
+def s3a_credentials_conf(environ=None):
+    """
+    Builds the S3A credential settings from the AWS environment variables.
+
+    Parameters:
+        environ (dict): Environment to read; os.environ when None.
+
+    Returns:
+        conf (dict): Spark settings; empty when no keys are set, leaving S3A on its default provider chain.
+    """
+    environ = os.environ if environ is None else environ
+    access_key = environ.get('AWS_ACCESS_KEY_ID')
+    secret_key = environ.get('AWS_SECRET_ACCESS_KEY')
+    if not access_key or not secret_key:
+        return {}
+
+    conf = {
+        "spark.hadoop.fs.s3a.access.key": access_key,
+        "spark.hadoop.fs.s3a.secret.key": secret_key,
+    }
+    session_token = environ.get('AWS_SESSION_TOKEN')
+    if session_token:
+        conf["spark.hadoop.fs.s3a.session.token"] = session_token
+        conf["spark.hadoop.fs.s3a.aws.credentials.provider"] = \
+            "org.apache.hadoop.fs.s3a.TemporaryAWSCredentialsProvider"
+    return conf
+
+
+def base_session_conf(environ=None):
+    """
+    Builds the settings every luminex SparkSession is created with.
+
+    Parameters:
+        environ (dict): Environment to read credentials from; os.environ when None.
+
+    Returns:
+        conf (dict): Spark settings.
+    """
+    conf = {
+        "spark.jars.packages": HADOOP_AWS_PACKAGE,
+        "spark.hadoop.fs.s3a.impl": "org.apache.hadoop.fs.s3a.S3AFileSystem",
+    }
+    conf.update(s3a_credentials_conf(environ))
+    return conf
+
+
+def committer_conf(committer):
+    """
+    Builds the settings that make Spark write to S3 through an S3A committer.
+
+    Parameters:
+        committer (str): 'magic' or 'directory'; Spark's default rename-based commit when None.
+
+    Returns:
+        conf (dict): Spark settings.
+    """
+    if committer is None:
+        return {}
+    if committer not in ('magic', 'directory'):
+        raise ValueError(f"Unsupported S3A committer: {committer}")
+    conf = {
+        "spark.hadoop.fs.s3a.committer.name": committer,
+        "spark.sql.sources.commitProtocolClass": "org.apache.spark.internal.io.cloud.PathOutputCommitProtocol",
+        "spark.sql.parquet.output.committer.class":
+            "org.apache.spark.internal.io.cloud.BindingParquetOutputCommitter",
+    }
+    if committer == 'magic':
+        conf["spark.hadoop.fs.s3a.committer.magic.enabled"] = "true"
+    return conf
+
+
+def s3a_profile_conf(cfg, profile=None):
+    """
+    Builds the settings of a named S3A performance profile from the SPARK section of the configuration.
+
+    Parameters:
+        cfg (dict): Configuration dictionary.
+        profile (str): Profile name; SPARK.S3A_PROFILE when None. No settings when neither is set.
+
+    Returns:
+        conf (dict): Spark settings, values as strings.
+    """
+    spark_cfg = cfg.get("SPARK", {})
+    profile = profile or spark_cfg.get("S3A_PROFILE")
+    if not profile:
+        return {}
+    profiles = spark_cfg.get("S3A_PROFILES", {})
+    if profile not in profiles:
+        raise ValueError(f"Unknown S3A profile '{profile}', expected one of: {', '.join(profiles)}")
+
+    conf = {key: str(value).lower() if isinstance(value, bool) else str(value)
+            for key, value in profiles[profile].get("CONF", {}).items()}
+    conf.update(committer_conf(profiles[profile].get("COMMITTER")))
+    return conf
+
+
+class SparkSessionProvider:
+    """
+    SparkSessionProvider: Lazily builds one SparkSession and returns it on every call
+    until it is stopped.
+
+    Attributes:
+        app_name (str): Spark application name.
+        conf (dict): Extra Spark settings applied on top of the base settings.
+
+    Methods:
+        - get_session: Return the shared session, building it on first use.
+        - stop: Stop the shared session; the next get_session builds a new one.
+        - session: Context manager yielding the shared session and stopping it on exit.
+    """
+
+    def __init__(self, app_name=DEFAULT_APP_NAME, conf=None, builder_factory=None):
+        """
+        Initialize SparkSessionProvider.
+
+        Parameters:
+            app_name (str): Spark application name.
+            conf (dict): Extra Spark settings applied on top of the base settings; a
+                spark.jars.packages entry adds to the base packages.
+            builder_factory (callable): Returns a fresh SparkSession builder; SparkSession.builder when None.
+        """
+        self.app_name = app_name
+        self.conf = dict(conf or {})
+        self.builder_factory = builder_factory or (lambda: SparkSession.builder)
+        self.lock = threading.Lock()
+        self._session = None
+
+    @classmethod
+    def from_cfg(cls, cfg, profile=None, app_name=DEFAULT_APP_NAME, builder_factory=None):
+        """
+        Builds a provider applying an S3A performance profile of the configuration.
+
+        Parameters:
+            cfg (dict): Configuration dictionary.
+            profile (str): Profile name; SPARK.S3A_PROFILE when None.
+            app_name (str): Spark application name.
+            builder_factory (callable): Returns a fresh SparkSession builder; SparkSession.builder when None.
+        """
+        return cls(app_name=app_name, conf=s3a_profile_conf(cfg, profile), builder_factory=builder_factory)
+
+    def session_conf(self):
+        """
+        Returns the full set of settings the session is built with.
+        """
+        conf = base_session_conf()
+        packages = [conf["spark.jars.packages"]]
+        conf.update(self.conf)
+        if "spark.jars.packages" in self.conf:
+            packages.append(self.conf["spark.jars.packages"])
+        if "spark.sql.sources.commitProtocolClass" in conf:
+            packages.append(SPARK_HADOOP_CLOUD_PACKAGE)
+        conf["spark.jars.packages"] = ",".join(packages)
+        return conf
+
+    def get_session(self):
+        """
+        Returns the shared SparkSession, building it on first use.
+        """
+        with self.lock:
+            if self._session is None:
+                builder = self.builder_factory().appName(self.app_name)
+                for key, value in self.session_conf().items():
+                    builder = builder.config(key, value)
+                self._session = builder.getOrCreate()
+            return self._session
+
+    def stop(self):
+        """
+        Stops the shared SparkSession, if one was built.
+        """
+        with self.lock:
+            if self._session is not None:
+                self._session.stop()
+                self._session = None
+
+    @contextmanager
+    def session(self):
+        """
+        Yields the shared SparkSession and stops it when the block exits.
+        """
+        try:
+            yield self.get_session()
+        finally:
+            self.stop()
+
+
+_default_provider = None
+_default_provider_lock = threading.Lock()
+
+
+def get_default_provider():
+    """
+    Returns the provider shared by every luminex reader and writer in the process, building it from
+    the configured S3A profile on first use rather than when this module is imported.
+    """
+    global _default_provider  # pylint: disable=global-statement
+    with _default_provider_lock:
+        if _default_provider is None:
+            _default_provider = SparkSessionProvider.from_cfg(load_cfg())
+        return _default_provider
+
+
+def get_spark_session():
+    """
+    Returns the process-wide luminex SparkSession.
+    """
+    return get_default_provider().get_session()
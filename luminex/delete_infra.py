@@ -1,9 +1,8 @@
 import time
 
-import boto3
 import botocore.exceptions
 
-cloudformation = boto3.client('cloudformation')
+from aws_clients import get_client
 
 
 def stack_exists(stack_name):
@@ -16,6 +15,7 @@ def stack_exists(stack_name):
     Returns:
         bool: True if the stack exists, False otherwise.
     """
+    cloudformation = get_client('cloudformation')
     try:
         response = cloudformation.describe_stacks(StackName=stack_name)
         exists = len(response['Stacks']) > 0
@@ -45,6 +45,7 @@ def get_emr_cluster_id(stack_name):
     Returns:
         str: EMR cluster ID if found, otherwise None.
     """
+    cloudformation = get_client('cloudformation')
     try:
         response = cloudformation.describe_stacks(StackName=stack_name)
         outputs = response['Stacks'][0].get('Outputs', [])
@@ -70,7 +71,7 @@ def get_emr_cluster_status(emr_cluster_id):
         str: EMR cluster status.
     """
     try:
-        emr = boto3.client('emr')
+        emr = get_client('emr')
         response = emr.describe_cluster(ClusterId=emr_cluster_id)
         if ('Cluster' in response and
                 'Status' in response['Cluster'] and
@@ -90,6 +91,7 @@ def delete_stack(stack_name):
     Args:
         stack_name (str): The name of the stack.
     """
+    cloudformation = get_client('cloudformation')
     try:
         # Check if EMR cluster is running
         emr_cluster_id = get_emr_cluster_id(stack_name)
@@ -140,6 +142,7 @@ def get_deleted_stacks():
     """
     deleted_stacks = []
 
+    cloudformation = get_client('cloudformation')
     try:
         response = cloudformation.list_stacks(StackStatusFilter=['DELETE_COMPLETE'])
         deleted_stacks = [stack['StackName'] for stack in response.get('StackSummaries', [])]
@@ -5,9 +5,10 @@ running the stack deletion process.
 """
 import time
 
-import boto3
 import botocore.exceptions
 
+from aws_clients import get_client
+
 
 class StackManager:
     """
@@ -18,7 +19,7 @@ class StackManager:
         """
         Initializes the StackManager with an AWS CloudFormation client.
         """
-        self.cloudformation = boto3.client('cloudformation')
+        self.cloudformation = get_client('cloudformation')
         self.stack_name = stack_name
 
     def stack_exists(self):
@@ -107,7 +108,7 @@ class StackManager:
             str: EMR cluster status.
         """
         try:
-            emr = boto3.client('emr')
+            emr = get_client('emr')
             response = emr.describe_cluster(ClusterId=emr_cluster_id)
             if ('Cluster' in response and
                     'Status' in response['Cluster'] and
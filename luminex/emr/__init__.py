@@ -0,0 +1,4 @@
+from .step_tracker import EMRStepTracker
+from .dag import TransformationDAG
+from .dag import DAGStepScheduler
+from .cluster_pool import ClusterPool
\ No newline at end of file
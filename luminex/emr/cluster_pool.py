@@ -0,0 +1,359 @@
+"""
+This module defines the ClusterPool class, which keeps warm EMR clusters for a team and
+configuration and leases them to ETL runs, so a run does not wait for a new cluster.
+Pool membership lives in cluster tags and leases in S3 lease objects created with a conditional
+put, so every process sees the same pool and only one of them can lease a given cluster.
+"""
+import collections
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from botocore.exceptions import ClientError
+
+# Tags recording pool membership and idle time on each cluster
+TEAM_TAG = 'luminex:team'
+POOL_TAG = 'luminex:pool'
+IDLE_SINCE_TAG = 'luminex:idle-since'
+
+# Cluster states in which a pool cluster exists, and those in which it can run steps
+ACTIVE_CLUSTER_STATES = ['STARTING', 'BOOTSTRAPPING', 'RUNNING', 'WAITING']
+READY_CLUSTER_STATES = ('RUNNING', 'WAITING')
+
+# Errors S3 returns when a conditional write or delete loses against another writer
+CONDITIONAL_WRITE_ERRORS = ('PreconditionFailed', 'ConditionalRequestConflict', '412', '409')
+
+ClusterLease = collections.namedtuple('ClusterLease', ['cluster_id', 'lease_id'])
+
+
+class ClusterPool:
+    """
+    ClusterPool: Warm EMR clusters tagged with a team and pool configuration.
+
+    Attributes:
+        emr_client (boto3.client): EMR client used to list, tag and terminate clusters.
+        s3_client (boto3.client): S3 client used for the lease objects.
+        lease_bucket (str): Bucket holding the lease objects.
+        team_name (str): Team owning the pool.
+        pool_config (str): Name of the cluster configuration the pool holds.
+        size (int): Number of idle clusters kept warm.
+        idle_ttl (float): Seconds an idle cluster beyond `size` is kept before it is terminated.
+        lease_ttl (float): Seconds after which a lease is considered abandoned and the cluster returned.
+        provisioner (callable): Called as provisioner(team_name, pool_config) to create a cluster,
+            returning its ID; the pool cannot grow when None.
+        lease_prefix (str): Key prefix of the pool's lease objects, one object per leased cluster.
+
+    Methods:
+        - clusters: List the active clusters of the pool.
+        - lease: Take an idle cluster, provisioning one if none is available.
+        - release: Return a leased cluster to the pool.
+        - renew: Extend a lease that is still held.
+        - keep_alive: Context manager renewing a lease in the background while a run uses the cluster.
+        - adopt: Add an existing cluster, e.g. one created by run_infra, to the pool.
+        - ensure_warm: Provision clusters until `size` are idle.
+        - reap: Return abandoned leases and terminate clusters idle for longer than idle_ttl.
+        - maintain: Reap, then top the pool back up to `size` idle clusters.
+
+    A lease is an S3 object written with If-None-Match, so of two processes racing for the same
+    cluster exactly one put succeeds and the other moves on to the next idle cluster.
+    """
+
+    def __init__(self, emr_client, s3_client, lease_bucket, team_name, pool_config='default', size=1,
+                 idle_ttl=3600, lease_ttl=6 * 3600, provisioner=None, clock=time.time,
+                 lease_prefix='luminex/cluster-pool'):
+        """
+        Initialize ClusterPool.
+
+        Parameters:
+            emr_client (boto3.client): EMR client used to list, tag and terminate clusters.
+            s3_client (boto3.client): S3 client used for the lease objects.
+            lease_bucket (str): Bucket holding the lease objects.
+            team_name (str): Team owning the pool.
+            pool_config (str): Name of the cluster configuration the pool holds.
+            size (int): Number of idle clusters kept warm.
+            idle_ttl (float): Seconds an idle cluster beyond `size` is kept before it is terminated.
+            lease_ttl (float): Seconds after which a lease is considered abandoned.
+            provisioner (callable): Creates a cluster for (team_name, pool_config) and returns its ID.
+            clock (callable): Wall-clock time source in epoch seconds, injectable for tests.
+            lease_prefix (str): Key prefix under which the lease objects of all pools are kept.
+        """
+        self.emr_client = emr_client
+        self.s3_client = s3_client
+        self.lease_bucket = lease_bucket
+        self.team_name = team_name
+        self.pool_config = pool_config
+        self.size = size
+        self.idle_ttl = idle_ttl
+        self.lease_ttl = lease_ttl
+        self.provisioner = provisioner
+        self.clock = clock
+        self.lease_prefix = f"{lease_prefix.rstrip('/')}/{team_name}/{pool_config}"
+
+    @classmethod
+    def from_cfg(cls, emr_client, s3_client, team_name, cfg, provisioner=None):
+        """
+        Build a pool from the POOL section of the configuration, keeping the leases in the ETL temp bucket.
+        """
+        pool_cfg = cfg.get("POOL", {})
+        return cls(emr_client, s3_client, cfg["ETL"]["S3_BUCKET_TEMP"], team_name,
+                   pool_config=pool_cfg.get("CONFIG", "default"), size=pool_cfg.get("SIZE", 1),
+                   idle_ttl=pool_cfg.get("IDLE_TTL", 3600), lease_ttl=pool_cfg.get("LEASE_TTL", 6 * 3600),
+                   provisioner=provisioner, lease_prefix=pool_cfg.get("LEASE_PREFIX", "luminex/cluster-pool"))
+
+    def clusters(self):
+        """
+        Lists the active clusters of this pool.
+
+        Returns:
+            clusters (list): One dict per cluster with its 'id', 'state' and 'tags'.
+        """
+        clusters = []
+        kwargs = {'ClusterStates': ACTIVE_CLUSTER_STATES}
+        while True:
+            response = self.emr_client.list_clusters(**kwargs)
+            for summary in response.get('Clusters', []):
+                cluster = self._describe(summary['Id'])
+                if cluster['tags'].get(TEAM_TAG) == self.team_name and cluster['tags'].get(POOL_TAG) == self.pool_config:
+                    clusters.append(cluster)
+            if not response.get('Marker'):
+                return clusters
+            kwargs['Marker'] = response['Marker']
+
+    def leases(self):
+        """
+        Lists the live lease objects of this pool.
+
+        Returns:
+            leases (dict): Lease record, with its 'lease_id', 'leased_at' and 'etag', by cluster ID.
+        """
+        leases = {}
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.lease_bucket, Prefix=f'{self.lease_prefix}/'):
+            for obj in page.get('Contents', []):
+                cluster_id = obj['Key'].rsplit('/', 1)[-1]
+                lease = self._read_lease(cluster_id)
+                if lease is not None:
+                    leases[cluster_id] = lease
+        return leases
+
+    def idle_clusters(self):
+        """
+        Lists the pool clusters that are ready to run steps and not leased, longest idle first.
+        """
+        leases = self.leases()
+        idle = [cluster for cluster in self.clusters()
+                if cluster['state'] in READY_CLUSTER_STATES and cluster['id'] not in leases]
+        return sorted(idle, key=lambda cluster: float(cluster['tags'].get(IDLE_SINCE_TAG, 0)))
+
+    def lease(self):
+        """
+        Leases an idle cluster, provisioning a new one when none is idle.
+
+        Returns:
+            lease (ClusterLease): The leased cluster and lease ID, or None if no cluster is available.
+        """
+        for cluster in self.idle_clusters():
+            lease = self._put_lease(cluster['id'])
+            if lease is not None:
+                return lease
+        if self.provisioner is None:
+            return None
+        cluster_id = self.provisioner(self.team_name, self.pool_config)
+        # Lease before tagging, so the new cluster never shows up as idle to another process
+        lease = self._put_lease(cluster_id)
+        self._tag_pool(cluster_id)
+        return lease
+
+    def release(self, lease):
+        """
+        Returns a leased cluster to the pool, unless the lease has since been taken over.
+
+        Parameters:
+            lease (ClusterLease): The lease returned by `lease`.
+
+        Returns:
+            released (bool): True if the cluster was returned to the pool.
+        """
+        current = self._read_lease(lease.cluster_id)
+        if current is None or current['lease_id'] != lease.lease_id:
+            return False
+        # Tag before deleting the lease, so a concurrent reap never judges the idle cluster by a stale tag
+        self._tag_idle(lease.cluster_id)
+        return self._delete_lease(lease.cluster_id, current['etag'])
+
+    def renew(self, lease):
+        """
+        Restarts the lease_ttl of a lease that is still held, with a conditional overwrite of its object.
+
+        Parameters:
+            lease (ClusterLease): The lease returned by `lease`.
+
+        Returns:
+            renewed (bool): True if the lease was renewed, False if it was reaped or taken over.
+        """
+        current = self._read_lease(lease.cluster_id)
+        if current is None or current['lease_id'] != lease.lease_id:
+            return False
+        try:
+            self.s3_client.put_object(Bucket=self.lease_bucket, Key=self._lease_key(lease.cluster_id),
+                                      Body=self._lease_body(lease.lease_id), IfMatch=current['etag'])
+        except ClientError as e:
+            if e.response['Error']['Code'] in CONDITIONAL_WRITE_ERRORS + ('NoSuchKey', '404'):
+                return False
+            raise
+        return True
+
+    @contextmanager
+    def keep_alive(self, lease, interval=None):
+        """
+        Renews a lease in a background thread until the block exits, so a run longer than
+        lease_ttl keeps its cluster.
+
+        Parameters:
+            lease (ClusterLease): The lease returned by `lease`.
+            interval (float): Seconds between renewals; a third of lease_ttl when None.
+        """
+        interval = interval or self.lease_ttl / 3
+        stopped = threading.Event()
+
+        def heartbeat():
+            while not stopped.wait(interval):
+                try:
+                    renewed = self.renew(lease)
+                except Exception as e:  # pylint: disable=broad-except
+                    # A failed renewal is retried on the next beat, well before lease_ttl runs out
+                    print(f"Failed to renew the lease on EMR cluster {lease.cluster_id}: {e}")
+                    continue
+                if not renewed:
+                    print(f"Lease on EMR cluster {lease.cluster_id} was lost; it may be handed to another run.")
+                    return
+
+        thread = threading.Thread(target=heartbeat, name=f'lease-{lease.cluster_id}', daemon=True)
+        thread.start()
+        try:
+            yield lease
+        finally:
+            stopped.set()
+            thread.join()
+
+    def adopt(self, cluster_id):
+        """
+        Adds an existing cluster, e.g. the one created by run_infra, to the pool as idle.
+        """
+        self._tag_pool(cluster_id)
+        self._tag_idle(cluster_id)
+
+    def ensure_warm(self):
+        """
+        Provisions clusters until `size` clusters of the pool are idle.
+
+        Returns:
+            cluster_ids (list): IDs of the clusters provisioned.
+        """
+        if self.provisioner is None:
+            return []
+        leases = self.leases()
+        idle = sum(cluster['id'] not in leases for cluster in self.clusters())
+        cluster_ids = []
+        for _ in range(self.size - idle):
+            cluster_id = self.provisioner(self.team_name, self.pool_config)
+            self.adopt(cluster_id)
+            cluster_ids.append(cluster_id)
+        return cluster_ids
+
+    def reap(self):
+        """
+        Returns clusters whose lease outlived lease_ttl to the pool, then terminates the clusters
+        idle for longer than idle_ttl, keeping the `size` most recently used ones warm.
+
+        Returns:
+            terminated (list): IDs of the terminated clusters.
+        """
+        now = self.clock()
+        clusters = {cluster['id']: cluster for cluster in self.clusters()}
+        leases = self.leases()
+        for cluster_id, lease in list(leases.items()):
+            # Leases of terminated clusters are dropped along with the abandoned ones
+            if cluster_id in clusters and now - lease['leased_at'] <= self.lease_ttl:
+                continue
+            if not self._delete_lease(cluster_id, lease['etag']):
+                continue
+            del leases[cluster_id]
+            if cluster_id in clusters:
+                self._tag_idle(cluster_id)
+                clusters[cluster_id]['tags'][IDLE_SINCE_TAG] = str(now)
+
+        idle = sorted((cluster for cluster in clusters.values() if cluster['id'] not in leases),
+                      key=lambda cluster: float(cluster['tags'].get(IDLE_SINCE_TAG, 0)), reverse=True)
+        expired = []
+        for cluster in idle[self.size:]:
+            # Lease the cluster before terminating it, so a concurrent lease cannot get a dying cluster
+            if now - float(cluster['tags'].get(IDLE_SINCE_TAG, 0)) > self.idle_ttl and self._put_lease(cluster['id']):
+                expired.append(cluster['id'])
+        if expired:
+            self.emr_client.terminate_job_flows(JobFlowIds=expired)
+            for cluster_id in expired:
+                self.s3_client.delete_object(Bucket=self.lease_bucket, Key=self._lease_key(cluster_id))
+        return expired
+
+    def maintain(self):
+        """
+        Reaps abandoned leases and expired idle clusters, then provisions clusters until `size` are idle.
+
+        Returns:
+            (terminated, provisioned) (tuple): IDs of the clusters terminated and of those provisioned.
+        """
+        terminated = self.reap()
+        return terminated, self.ensure_warm()
+
+    def _describe(self, cluster_id):
+        cluster = self.emr_client.describe_cluster(ClusterId=cluster_id)['Cluster']
+        return {'id': cluster_id, 'state': cluster['Status']['State'],
+                'tags': {tag['Key']: tag['Value'] for tag in cluster.get('Tags', [])}}
+
+    def _tag_pool(self, cluster_id):
+        self.emr_client.add_tags(ResourceId=cluster_id, Tags=[{'Key': TEAM_TAG, 'Value': self.team_name},
+                                                             {'Key': POOL_TAG, 'Value': self.pool_config}])
+
+    def _tag_idle(self, cluster_id):
+        self.emr_client.add_tags(ResourceId=cluster_id, Tags=[{'Key': IDLE_SINCE_TAG, 'Value': str(self.clock())}])
+
+    def _lease_key(self, cluster_id):
+        return f'{self.lease_prefix}/{cluster_id}'
+
+    def _put_lease(self, cluster_id):
+        # If-None-Match makes the put fail when another process already holds a lease on the cluster
+        lease_id = uuid.uuid4().hex
+        try:
+            self.s3_client.put_object(Bucket=self.lease_bucket, Key=self._lease_key(cluster_id),
+                                      Body=self._lease_body(lease_id), IfNoneMatch='*')
+        except ClientError as e:
+            if e.response['Error']['Code'] in CONDITIONAL_WRITE_ERRORS:
+                return None
+            raise
+        return ClusterLease(cluster_id, lease_id)
+
+    def _lease_body(self, lease_id):
+        return json.dumps({'lease_id': lease_id, 'leased_at': self.clock()}).encode('utf-8')
+
+    def _read_lease(self, cluster_id):
+        try:
+            response = self.s3_client.get_object(Bucket=self.lease_bucket, Key=self._lease_key(cluster_id))
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return None
+            raise
+        lease = json.loads(response['Body'].read())
+        return {'lease_id': lease['lease_id'], 'leased_at': float(lease['leased_at']), 'etag': response['ETag']}
+
+    def _delete_lease(self, cluster_id, etag):
+        # If-Match keeps a lease taken after the read from being deleted
+        try:
+            self.s3_client.delete_object(Bucket=self.lease_bucket, Key=self._lease_key(cluster_id), IfMatch=etag)
+        except ClientError as e:
+            if e.response['Error']['Code'] in CONDITIONAL_WRITE_ERRORS + ('NoSuchKey', '404'):
+                return False
+            raise
+        return True
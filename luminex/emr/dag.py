@@ -0,0 +1,165 @@
+"""
+This module defines the TransformationDAG class, which describes transformations with
+per-transformation inputs and outputs, and the DAGStepScheduler class, which runs the
+DAG on an EMR cluster, submitting independent branches concurrently.
+"""
+from .step_tracker import EMRStepTracker
+
+
+class TransformationDAG:
+    """
+    TransformationDAG: Transformations and the data dependencies between them.
+
+    The spec maps each transformation name to a dict with:
+        - inputs (list): Upstream transformation names, whose outputs are read, or literal
+          s3:// paths. Transformations without inputs read the ETL source path.
+        - output (str, optional): s3:// path for the output; derived by the caller when omitted.
+
+    Attributes:
+        inputs (dict): Declared inputs per transformation.
+        outputs (dict): Explicit output path per transformation, None when not declared.
+        upstream (dict): Upstream transformation names per transformation.
+        downstream (dict): Dependent transformation names per transformation.
+    """
+
+    def __init__(self, spec):
+        """
+        Initialize TransformationDAG and validate it.
+
+        Parameters:
+            spec (dict): Transformation name to {'inputs': [...], 'output': ...}.
+
+        Raises:
+            ValueError: If an input is neither a transformation nor an s3:// path, or the graph has a cycle.
+        """
+        self.inputs = {name: list((node or {}).get('inputs', [])) for name, node in spec.items()}
+        self.outputs = {name: (node or {}).get('output') for name, node in spec.items()}
+        self.upstream = {name: [] for name in spec}
+        self.downstream = {name: [] for name in spec}
+        for name, inputs in self.inputs.items():
+            for upstream_name in inputs:
+                if upstream_name in spec:
+                    self.upstream[name].append(upstream_name)
+                    self.downstream[upstream_name].append(name)
+                elif not upstream_name.startswith('s3://'):
+                    raise ValueError(f"Transformation '{name}' reads unknown input '{upstream_name}'.")
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        remaining = {name: len(upstream) for name, upstream in self.upstream.items()}
+        order = [name for name, count in remaining.items() if count == 0]
+        for name in order:
+            for downstream_name in self.downstream[name]:
+                remaining[downstream_name] -= 1
+                if remaining[downstream_name] == 0:
+                    order.append(downstream_name)
+        if len(order) != len(remaining):
+            cyclic = [name for name in remaining if name not in order]
+            raise ValueError(f"Transformation DAG has a cycle through: {', '.join(cyclic)}.")
+        return order
+
+    def sinks(self):
+        """
+        Returns the transformations no other transformation reads from.
+        """
+        return [name for name in self.order if not self.downstream[name]]
+
+    def resolve_paths(self, source_path, default_output):
+        """
+        Resolves the input and output paths of every transformation.
+
+        Parameters:
+            source_path (str): The s3 path read by transformations without inputs.
+            default_output (callable): Called as default_output(name, is_sink) for transformations
+                                       without an explicit output.
+
+        Returns:
+            paths (dict): Name to (input paths, output path), in topological order.
+        """
+        sinks = set(self.sinks())
+        outputs = {name: self.outputs[name] or default_output(name, name in sinks) for name in self.order}
+        paths = {}
+        for name in self.order:
+            inputs = [outputs.get(item, item) for item in self.inputs[name]] or [source_path]
+            paths[name] = (inputs, outputs[name])
+        return paths
+
+
+class DAGStepScheduler:
+    """
+    DAGStepScheduler: Runs a TransformationDAG as EMR steps. Transformations are submitted
+    as soon as all their upstream transformations completed, at most `max_concurrent_steps`
+    at a time, and the downstream of a failed transformation is skipped.
+
+    Attributes:
+        emr_client (boto3.client): EMR client.
+        cluster_id (str): The EMR cluster the steps run on.
+        states (dict): State per transformation; SKIPPED when an upstream transformation failed.
+    """
+
+    def __init__(self, emr_client, cluster_id, dag, build_step, max_concurrent_steps=1, tracker=None):
+        """
+        Initialize DAGStepScheduler.
+
+        Parameters:
+            emr_client (boto3.client): EMR client.
+            cluster_id (str): The EMR cluster the steps run on.
+            dag (TransformationDAG): The transformations to run.
+            build_step (callable): Called as build_step(name) and returns the EMR step definition.
+            max_concurrent_steps (int): Maximum number of our steps active on the cluster at once.
+            tracker (EMRStepTracker): Tracker used to follow the steps; created when None.
+        """
+        self.emr_client = emr_client
+        self.cluster_id = cluster_id
+        self.dag = dag
+        self.build_step = build_step
+        self.max_concurrent_steps = max(1, max_concurrent_steps)
+        self.tracker = tracker or EMRStepTracker(emr_client, cluster_id)
+        self.states = {name: 'WAITING' for name in dag.order}
+        self.step_names = {}
+
+    def _ready(self):
+        return [name for name in self.dag.order
+                if self.states[name] == 'WAITING'
+                and all(self.states[upstream] == 'COMPLETED' for upstream in self.dag.upstream[name])]
+
+    def _skip_downstream(self, name):
+        for downstream_name in self.dag.downstream[name]:
+            if self.states[downstream_name] == 'WAITING':
+                self.states[downstream_name] = 'SKIPPED'
+                print(f"Skipping transformation {downstream_name}, upstream {name} did not complete.")
+                self._skip_downstream(downstream_name)
+
+    def _submit_ready(self):
+        active = sum(state == 'SUBMITTED' for state in self.states.values())
+        batch = self._ready()[:self.max_concurrent_steps - active]
+        if not batch:
+            return
+        response = self.emr_client.add_job_flow_steps(JobFlowId=self.cluster_id,
+                                                      Steps=[self.build_step(name) for name in batch])
+        for name, step_id in zip(batch, response['StepIds']):
+            self.states[name] = 'SUBMITTED'
+            self.step_names[step_id] = name
+            print(f"Submitted transformation {name} as step {step_id}.")
+        self.tracker.watch(response['StepIds'])
+
+    def _on_step_done(self, step_id, state):
+        name = self.step_names[step_id]
+        self.states[name] = state
+        if state == 'COMPLETED':
+            print(f"Transformation {name} completed.")
+        else:
+            print(f"Transformation {name} ended with status {state}.")
+            self._skip_downstream(name)
+        self._submit_ready()
+
+    def run(self):
+        """
+        Runs every transformation of the DAG and waits for the last one to finish.
+
+        Returns:
+            states (dict): Final state per transformation.
+        """
+        self._submit_ready()
+        self.tracker.wait(on_step_done=self._on_step_done)
+        return dict(self.states)
@@ -0,0 +1,128 @@
+"""
+This module defines the EMRStepTracker class, which watches a set of EMR steps on one
+cluster with batched list_steps calls and reports each step as soon as it finishes.
+"""
+import random
+import time
+
+# EMR step states after which a step no longer changes
+TERMINAL_STEP_STATES = ('COMPLETED', 'FAILED', 'CANCELLED', 'INTERRUPTED')
+
+# list_steps accepts at most this many step IDs per request
+LIST_STEPS_MAX_IDS = 10
+
+
+class EMRStepTracker:
+    """
+    EMRStepTracker: Tracks outstanding EMR steps on a cluster. Every tick issues one
+    list_steps call per batch of ten watched steps, and the polling interval backs off
+    with jitter while nothing changes and drops back to the minimum when a step moves.
+
+    Attributes:
+        emr_client (boto3.client): EMR client used for list_steps.
+        cluster_id (str): The EMR cluster the steps run on.
+        states (dict): Last seen state per watched step ID.
+
+    Methods:
+        - watch: Add step IDs to the tracked set.
+        - poll: Refresh the state of all outstanding steps once.
+        - wait: Poll until every watched step reaches a terminal state.
+    """
+
+    def __init__(self, emr_client, cluster_id, min_interval=2, max_interval=30, backoff=1.5, jitter=0.2,
+                 sleep=None):
+        """
+        Initialize EMRStepTracker.
+
+        Parameters:
+            emr_client (boto3.client): EMR client used for list_steps.
+            cluster_id (str): The EMR cluster the steps run on.
+            min_interval (float): Seconds between polls right after a state change.
+            max_interval (float): Upper bound for the polling interval in seconds.
+            backoff (float): Factor applied to the interval after a tick without changes.
+            jitter (float): Fraction of the interval randomly added or removed on every sleep.
+            sleep (callable): Sleep function, time.sleep when None.
+        """
+        self.emr_client = emr_client
+        self.cluster_id = cluster_id
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.sleep = sleep or time.sleep
+        self.states = {}
+
+    def watch(self, step_ids):
+        """
+        Adds step IDs to the tracked set; may be called while `wait` is running.
+
+        Parameters:
+            step_ids (list): EMR step IDs to track.
+        """
+        for step_id in step_ids:
+            self.states.setdefault(step_id, 'PENDING')
+
+    def outstanding(self):
+        """
+        Returns the watched step IDs that have not reached a terminal state.
+        """
+        return [step_id for step_id, state in self.states.items() if state not in TERMINAL_STEP_STATES]
+
+    def poll(self):
+        """
+        Refreshes the state of every outstanding step with batched list_steps calls.
+
+        Returns:
+            changes (dict): Step ID to new state, for every step whose state changed.
+        """
+        outstanding = self.outstanding()
+        changes = {}
+        for start in range(0, len(outstanding), LIST_STEPS_MAX_IDS):
+            batch = outstanding[start:start + LIST_STEPS_MAX_IDS]
+            kwargs = {'ClusterId': self.cluster_id, 'StepIds': batch}
+            while True:
+                response = self.emr_client.list_steps(**kwargs)
+                for step in response.get('Steps', []):
+                    state = step['Status']['State']
+                    if step['Id'] in self.states and self.states[step['Id']] != state:
+                        self.states[step['Id']] = state
+                        changes[step['Id']] = state
+                if not response.get('Marker'):
+                    break
+                kwargs['Marker'] = response['Marker']
+        return changes
+
+    def wait(self, on_step_done=None, on_step_change=None, timeout=None):
+        """
+        Polls until every watched step reaches a terminal state.
+
+        Parameters:
+            on_step_done (callable): Called as on_step_done(step_id, state) the moment a step
+                reaches a terminal state; it may call `watch` to add follow-up steps.
+            on_step_change (callable): Called as on_step_change(step_id, state) on every state change.
+            timeout (float): Maximum number of seconds to wait; unbounded when None.
+
+        Returns:
+            states (dict): Final state per watched step ID.
+
+        Raises:
+            TimeoutError: If the steps are still running after `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = self.min_interval
+        while self.outstanding():
+            changes = self.poll()
+            for step_id, state in changes.items():
+                if on_step_change:
+                    on_step_change(step_id, state)
+                if state in TERMINAL_STEP_STATES and on_step_done:
+                    on_step_done(step_id, state)
+
+            if not self.outstanding():
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Steps {', '.join(self.outstanding())} still running on {self.cluster_id}.")
+
+            interval = self.min_interval if changes else min(interval * self.backoff, self.max_interval)
+            self.sleep(interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+        return dict(self.states)
@@ -1,55 +1,201 @@
 import os
-import boto3
 import sys
-import time
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-from validation import ETLFileValidator
-from validation import ETLS3Validator
+from botocore.exceptions import ClientError
+
+# Add the repo root to the Python path, so the validators come from the same module as luminex's
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# pylint: disable=wrong-import-position
+# The validators hold process-wide caches, so they are imported through the luminex package: a second
+# copy loaded as the top-level validation module would keep caches that luminex.ETLS3Validator never sees
+from luminex.validation import ETLFileValidator
+from luminex.validation import ETLS3Validator
+from luminex.validation import preflight, run_preflight
 from configs import load_cfg
+from aws_clients import get_client
+from emr import DAGStepScheduler, EMRStepTracker, TransformationDAG
+from script_cache import TransformationScriptCache
 
 # declare global variable
 cfg = load_cfg()
 logger = logging.getLogger(__name__)
 
+# Number of transformation scripts fetched and uploaded concurrently
+DEFAULT_SCRIPT_WORKERS = 8
 
-def clone_specific_files(repo_url, local_repo_path, token, subfolder, file_names):
+
+def create_github_session(token, max_workers=DEFAULT_SCRIPT_WORKERS):
     """
-    Clones specific files from a GitHub repository to a local path.
+    Creates a requests session with a connection pool sized for concurrent GitHub downloads.
 
     Parameters:
-        repo_url (str): The GitHub repository URL.
-        local_repo_path (str): The local path where the files should be saved.
         token (str): GitHub token for authentication.
+        max_workers (int): Number of connections kept in the pool.
+
+    Returns:
+        session (requests.Session): The authenticated, pooled session.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount('https://', adapter)
+    session.headers['Authorization'] = f'token {token}'
+    return session
+
+
+def list_transformation_blob_shas(session, repo_url, subfolder):
+    """
+    Lists the Git blob SHA of every file in the transformation folder with one contents API call.
+
+    Parameters:
+        session (requests.Session): Pooled GitHub session.
+        repo_url (str): The GitHub repository URL.
         subfolder (str): Subfolder within the repository where the files are located.
-        file_names (list): Transformation files that needs to be cloned
 
     Returns:
-        local_repo_path (str): The local path where the files have been saved.
+        blob_shas (dict): File name to Git blob SHA.
     """
-    try:
-        for file_name in file_names:
-            url = f'https://raw.githubusercontent.com/{repo_url}/main/{subfolder}/{file_name}.py'
-            response = requests.get(url, headers={'Authorization': f'token {token}'})
-
-            # Check if the request was successful (status code 200)
-            if response.status_code == 200:
-                # Save the content to a local file
-                local_file_path = os.path.join(local_repo_path, f"{file_name}.py")
-                os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
-                with open(local_file_path, 'w') as file:
-                    file.write(response.text)
-                print(f"Cloned {file_name}.py to {local_file_path}")
-            else:
-                print(f"Error: {file_name}.py does not exist in the repository")
+    url = f'https://api.github.com/repos/{repo_url}/contents/{subfolder}?ref=main'
+    response = session.get(url, headers={'Accept': 'application/vnd.github.v3+json'})
+    response.raise_for_status()
+    return {item['name']: item['sha'] for item in response.json() if item.get('type') == 'file'}
 
-        return local_repo_path
-    except Exception as e:
-        print(f"Error: {e}")
+
+def fetch_transformation_blob(session, repo_url, sha):
+    """
+    Downloads the exact contents of a Git blob, which unlike raw.githubusercontent.com
+    is never served stale by a CDN.
+
+    Parameters:
+        session (requests.Session): Pooled GitHub session.
+        repo_url (str): The GitHub repository URL.
+        sha (str): Git blob SHA.
+
+    Returns:
+        content (bytes): The blob contents.
+    """
+    url = f'https://api.github.com/repos/{repo_url}/git/blobs/{sha}'
+    response = session.get(url, headers={'Accept': 'application/vnd.github.raw'})
+    response.raise_for_status()
+    return response.content
+
+
+def s3_object_exists(s3_client, s3_bucket, s3_object_key):
+    """
+    Checks whether an S3 object exists.
+
+    Parameters:
+        s3_client (boto3.client): S3 client.
+        s3_bucket (str): The bucket name.
+        s3_object_key (str): The object key.
+
+    Returns:
+        exists (bool): True if the object exists.
+    """
+    try:
+        s3_client.head_object(Bucket=s3_bucket, Key=s3_object_key)
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return False
         raise
 
 
+def stage_transformation_scripts(repo_url, token, subfolder, file_names, s3_client, s3_bucket,
+                                 max_workers=DEFAULT_SCRIPT_WORKERS, script_cache=None, blob_shas=None):
+    """
+    Stages transformation scripts in S3 under content-addressed keys,
+    scripts/transformation/<blob sha>/<name>.py, fetching and uploading them concurrently.
+
+    Scripts already staged under their current blob SHA are neither downloaded nor uploaded;
+    scripts found in the local cache are uploaded without being downloaded. A repeat run of an
+    unchanged pipeline therefore costs one listing call and one HEAD request per script.
+
+    Parameters:
+        repo_url (str): The GitHub repository URL.
+        token (str): GitHub token for authentication.
+        subfolder (str): Subfolder within the repository where the files are located.
+        file_names (list): Transformation files that needs to be staged
+        s3_client (boto3.client): S3 client used for the uploads.
+        s3_bucket (str): The bucket the scripts are uploaded to.
+        max_workers (int): Number of scripts fetched and uploaded concurrently.
+        script_cache (TransformationScriptCache): Local cache of script contents; not used when None.
+        blob_shas (dict): File name to Git blob SHA, e.g. from ETLFileValidator; listed from GitHub when None.
+
+    Returns:
+        script_paths (dict): Transformation name to the s3 path of its script.
+
+    Raises:
+        FileNotFoundError: If any of the scripts does not exist in the repository.
+    """
+    def stage(file_name):
+        sha = blob_shas.get(f'{file_name}.py')
+        if sha is None:
+            print(f"Error: {file_name}.py does not exist in the repository")
+            return None
+
+        s3_object_key = f'scripts/transformation/{sha}/{file_name}.py'
+        script_path = f"s3://{s3_bucket}/{s3_object_key}"
+        if s3_object_exists(s3_client, s3_bucket, s3_object_key):
+            print(f"{file_name}.py is unchanged, reusing {script_path}")
+            return script_path
+
+        content = script_cache.get(sha) if script_cache else None
+        if content is None:
+            content = fetch_transformation_blob(session, repo_url, sha)
+            if script_cache:
+                script_cache.put(sha, content)
+        s3_client.put_object(Bucket=s3_bucket, Key=s3_object_key, Body=content)
+        print(f"Uploaded {file_name}.py to S3: {script_path}")
+        return script_path
+
+    with create_github_session(token, max_workers) as session:
+        if blob_shas is None:
+            blob_shas = list_transformation_blob_shas(session, repo_url, subfolder)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            script_paths = dict(zip(file_names, executor.map(stage, file_names)))
+
+    missing_files = [name for name, script_path in script_paths.items() if script_path is None]
+    if missing_files:
+        raise FileNotFoundError(f"Transformation scripts not found: {', '.join(missing_files)}")
+    return script_paths
+
+
+def build_spark_step(step_name, script_s3_path, s3_input_path, s3_output_path, action_on_failure='CONTINUE'):
+    """
+    Builds the add_job_flow_steps definition of a spark-submit transformation step.
+
+            Parameters:
+                    step_name (str): The name for the step
+                    script_s3_path (str): The s3 path to the transformation script
+                    s3_input_path (str or list): The s3 path to the input dataset, or a list of paths
+                                                 passed as one --input argument each
+                    s3_output_path (str): The s3 path to store the transformed output
+                    action_on_failure (str): EMR ActionOnFailure for the step
+
+            Returns:
+                    step (dict): The EMR step definition
+    """
+    input_paths = [s3_input_path] if isinstance(s3_input_path, str) else s3_input_path
+    input_args = [arg for path in input_paths for arg in ('--input', path)]
+    return {
+        'Name': step_name,
+        'ActionOnFailure': action_on_failure,
+        'HadoopJarStep': {
+            'Jar': 'command-runner.jar',
+            'Args': [
+                'spark-submit',
+                script_s3_path,
+                *input_args,
+                '--output', s3_output_path
+            ]
+        }
+    }
+
+
 def submit_spark_job(aws_access_key_id, aws_secret_access_key, aws_session_token, region_name, emr_cluster_id,
                      step_name, script_s3_path, s3_input_path, s3_output_path):
     """
@@ -66,37 +212,19 @@ def submit_spark_job(aws_access_key_id, aws_secret_access_key, aws_session_token
                     s3_input_path ( str): The s3 path to the input dataset
                     s3_output_path (str): The s3 path to store the transformed output
     """
-    emr_client = boto3.client('emr', aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key,
-                              aws_session_token=aws_session_token, region_name=region_name)
+    emr_client = get_client('emr', aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key,
+                            aws_session_token=aws_session_token, region_name=region_name)
     response = emr_client.add_job_flow_steps(
         JobFlowId=emr_cluster_id,
-        Steps=[
-            {
-                'Name': step_name,
-                'ActionOnFailure': 'CONTINUE',
-                'HadoopJarStep': {
-                    'Jar': 'command-runner.jar',
-                    'Args': [
-                        'spark-submit',
-                        script_s3_path,
-                        '--input', s3_input_path,
-                        '--output', s3_output_path
-                    ]
-                }
-            }
-        ]
+        Steps=[build_spark_step(step_name, script_s3_path, s3_input_path, s3_output_path)]
     )
 
     step_id = response['StepIds'][0]
 
-    while True:
-        step_status = emr_client.describe_step(ClusterId=emr_cluster_id, StepId=step_id)['Step']['Status']['State']
-        print(f'Step {step_id} status: {step_status}')
-
-        if step_status in ['COMPLETED', 'FAILED', 'CANCELLED']:
-            break
-
-        time.sleep(20)
+    tracker = EMRStepTracker(emr_client, emr_cluster_id)
+    tracker.watch([step_id])
+    states = tracker.wait(on_step_change=lambda changed_id, state: print(f'Step {changed_id} status: {state}'))
+    step_status = states[step_id]
 
     if step_status == 'COMPLETED':
         print(f'Transformation executed, refer to {s3_output_path} for the transformed output.')
@@ -107,7 +235,112 @@ def submit_spark_job(aws_access_key_id, aws_secret_access_key, aws_session_token
     return {'StepId': step_id, 'Status': step_status}
 
 
-def run_etl(emr_cluster_id, pat, team_name, num_transformations, transformation_names, source_path, destination_bucket):
+def submit_spark_pipeline(aws_access_key_id, aws_secret_access_key, aws_session_token, region_name, emr_cluster_id,
+                          pipeline_steps):
+    """
+    Submits a whole chain of EMR spark jobs(steps) in one add_job_flow_steps call and tracks them as a group,
+    so the cluster moves from one step to the next without a client round trip in between.
+
+    Steps are submitted with ActionOnFailure CONTINUE, and when one fails only the steps of this chain
+    that have not finished are cancelled, so no later transformation runs to completion on missing input.
+    CANCEL_AND_WAIT is not used because it also cancels the pending steps of other submitters sharing
+    the cluster. The chain relies on EMR running the steps in submission order, i.e. a cluster
+    StepConcurrencyLevel of 1.
+
+            Parameters:
+                    aws_access_key_id (str): AWS Temp Credentials: Access Key ID
+                    aws_secret_access_key (str): AWS Temp Credentials: Secret Access Key
+                    aws_session_token (str): AWS Temp Credentials: Session Token
+                    region_name (str): The aws region from where the EMR steps needs to be created
+                    emr_cluster_id ( str): The emr cluster id to which the spark jobs should be added
+                    pipeline_steps (list): Dicts with step_name, script_s3_path, s3_input_path and s3_output_path,
+                                           in execution order
+
+            Returns:
+                    results (list): {'StepId': ..., 'Status': ...} per step, in execution order
+    """
+    emr_client = get_client('emr', aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key,
+                            aws_session_token=aws_session_token, region_name=region_name)
+    response = emr_client.add_job_flow_steps(
+        JobFlowId=emr_cluster_id,
+        Steps=[build_spark_step(**step) for step in pipeline_steps]
+    )
+
+    step_ids = response['StepIds']
+    steps_by_id = dict(zip(step_ids, pipeline_steps))
+    tracker = EMRStepTracker(emr_client, emr_cluster_id)
+
+    def on_step_done(step_id, state):
+        step = steps_by_id[step_id]
+        if state == 'COMPLETED':
+            print(f"Transformation {step['step_name']} executed, refer to {step['s3_output_path']} "
+                  f"for the transformed output.")
+            return
+        print(f"Transformation {step['step_name']} aborted with status {state}")
+        # The next step of the chain may already have started by the time the failure is seen
+        remaining = tracker.outstanding()
+        if remaining:
+            emr_client.cancel_steps(ClusterId=emr_cluster_id, StepIds=remaining,
+                                    StepCancellationOption='SEND_INTERRUPT')
+
+    tracker.watch(step_ids)
+    states = tracker.wait(on_step_done=on_step_done,
+                          on_step_change=lambda changed_id, state: print(f'Step {changed_id} status: {state}'))
+
+    return [{'StepId': step_id, 'Status': states[step_id]} for step_id in step_ids]
+
+
+def submit_spark_dag(aws_access_key_id, aws_secret_access_key, aws_session_token, region_name, emr_cluster_id,
+                     transformation_dag, dag_steps):
+    """
+    Runs a DAG of EMR spark jobs(steps). Independent branches are submitted concurrently, up to the
+    cluster's StepConcurrencyLevel, and a transformation starts as soon as all its inputs are complete.
+    Steps use ActionOnFailure CONTINUE so a failing branch does not cancel the others; its downstream
+    transformations are skipped.
+
+            Parameters:
+                    aws_access_key_id (str): AWS Temp Credentials: Access Key ID
+                    aws_secret_access_key (str): AWS Temp Credentials: Secret Access Key
+                    aws_session_token (str): AWS Temp Credentials: Session Token
+                    region_name (str): The aws region from where the EMR steps needs to be created
+                    emr_cluster_id ( str): The emr cluster id to which the spark jobs should be added
+                    transformation_dag (TransformationDAG): The transformations and their dependencies
+                    dag_steps (dict): Transformation name to a dict with step_name, script_s3_path,
+                                      s3_input_path and s3_output_path
+
+            Returns:
+                    states (dict): Final state per transformation
+    """
+    emr_client = get_client('emr', aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key,
+                            aws_session_token=aws_session_token, region_name=region_name)
+    scheduler = DAGStepScheduler(emr_client, emr_cluster_id, transformation_dag,
+                                 lambda name: build_spark_step(**dag_steps[name]),
+                                 max_concurrent_steps=get_step_concurrency_level(emr_client, emr_cluster_id))
+    states = scheduler.run()
+
+    for name in transformation_dag.sinks():
+        if states[name] == 'COMPLETED':
+            print(f"Transformation executed, refer to {dag_steps[name]['s3_output_path']} for the transformed output.")
+    return states
+
+
+def get_step_concurrency_level(emr_client, emr_cluster_id):
+    """
+    Returns the number of steps the EMR cluster runs concurrently.
+
+            Parameters:
+                    emr_client (boto3.client): EMR client
+                    emr_cluster_id ( str): The emr cluster id
+
+            Returns:
+                    step_concurrency_level (int): The cluster's StepConcurrencyLevel
+    """
+    cluster = emr_client.describe_cluster(ClusterId=emr_cluster_id)['Cluster']
+    return cluster.get('StepConcurrencyLevel', 1)
+
+
+def run_etl(emr_cluster_id, pat, team_name, num_transformations, transformation_names, source_path, destination_bucket,
+            pipelined=True, transformation_dag=None, cluster_pool=None):
     """
     Main function that triggers required functions in the required order to run the transformation on the EMR Cluster.
 
@@ -117,6 +350,15 @@ def run_etl(emr_cluster_id, pat, team_name, num_transformations, transformation_
                     team_name : team name used to separate data stored in the temporary s3 bucket
                     num_transformations (int): No of transformations that needs to be performed on the dataset
                     transformation_names (list): The list of transformations
+                    source_path (str): The s3 path to the input dataset
+                    destination_bucket (str): The s3 bucket to store the final transformed output
+                    pipelined (bool): Submit all transformations in one request instead of one at a time
+                    transformation_dag (dict): Optional DAG spec over transformation_names, mapping each name to
+                                               {'inputs': [upstream names or s3 paths], 'output': optional s3 path};
+                                               independent branches then run concurrently instead of as a chain
+                    cluster_pool (ClusterPool): Pool to lease a warm cluster from when emr_cluster_id is None;
+                                                the cluster is returned to the pool when the run ends, which
+                                                then reaps abandoned leases and idle clusters and is kept warm
                     ENV: aws_access_key_id (str): AWS Temp Credentials: Access Key ID
                     ENV: aws_secret_access_key (str): AWS Temp Credentials: Secret Access Key
                     ENV: aws_session_token (str): AWS Temp Credentials: Session Token
@@ -130,50 +372,104 @@ def run_etl(emr_cluster_id, pat, team_name, num_transformations, transformation_
         print("Please set AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY and AWS_SESSION_TOKEN environment variables.")
         return
 
-    # ETL Validations
-    s3_validator = ETLS3Validator(source_path, destination_bucket)
-    s3_validator.run_validation()
+    if emr_cluster_id is None and cluster_pool is not None:
+        lease = cluster_pool.lease()
+        if lease is None:
+            print(f"No warm EMR cluster available in the pool of team {team_name}.")
+            return
+        print(f"Leased EMR cluster {lease.cluster_id} from the pool.")
+        try:
+            # Renew the lease while steps run, so a run longer than the lease TTL is not reaped
+            with cluster_pool.keep_alive(lease):
+                return run_etl(lease.cluster_id, pat, team_name, num_transformations, transformation_names,
+                               source_path, destination_bucket, pipelined=pipelined,
+                               transformation_dag=transformation_dag)
+        finally:
+            cluster_pool.release(lease)
+            # Runs are the only regular callers of the pool, so they also drive its scale-down
+            cluster_pool.maintain()
 
+    # ETL Validations, run concurrently
+    region_name = cfg["AWS"]["REGION"]
+    aws_credentials = {'aws_access_key_id': aws_access_key_id, 'aws_secret_access_key': aws_secret_access_key,
+                       'aws_session_token': aws_session_token, 'region_name': region_name}
+    s3_validator = ETLS3Validator(source_path, destination_bucket, deep=True)
     etl_file_validator = ETLFileValidator(cfg, pat, transformation_names)
-    etl_file_validator.validate_files()
 
-    local_repo_path = None
+    preflight_report = run_preflight([
+        ('S3 source path', preflight.s3_path_check(s3_validator, source_path, "Source")),
+        ('S3 destination bucket', preflight.s3_path_check(s3_validator, destination_bucket, "Destination")),
+        ('Transformation files', preflight.transformation_files_check(etl_file_validator)),
+        ('EMR cluster', preflight.emr_cluster_check(get_client('emr', **aws_credentials), emr_cluster_id)),
+        ('AWS credentials', preflight.aws_credentials_check(get_client('sts', **aws_credentials))),
+    ])
+    print(preflight_report.summary())
+    if not preflight_report.passed:
+        print("ETL preflight validation failed. Check the error messages for details.")
+        sys.exit(1)
+
+    if transformation_dag is not None:
+        if set(transformation_dag) != set(transformation_names):
+            print("Transformation DAG must declare exactly the given transformation names")
+            return
+        try:
+            transformation_dag = TransformationDAG(transformation_dag)
+        except ValueError as e:
+            print(f"Invalid transformation DAG: {e}")
+            return
+
     emr_cluster_id = emr_cluster_id
     github_token = pat
-    region_name = cfg["AWS"]["REGION"]
     if num_transformations == len(transformation_names):
         try:
             github_repo_url = cfg["ETL"]["TRANSFORMATION_FOLDER_PATH"]
 
             transformation_subfolder = cfg["ETL"]["TRANSFORMATION_SUBFOLDER"]
 
-            # Cloning the GitHub repository
-            local_repo_path = clone_specific_files(github_repo_url, "local_transformation_repo", github_token,
-                                                   transformation_subfolder, transformation_names)
-
             s3_bucket_temp = cfg["ETL"]["S3_BUCKET_TEMP"]
 
             # Initializing the S3 client
-            s3 = boto3.client('s3', aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key,
-                              aws_session_token=aws_session_token, region_name=region_name, verify=False)
-
-            # Upload files from the transformation folder based on user input
-            transformation_folder = "local_transformation_repo"
-            for name in transformation_names:
-                for root, dirs, files in os.walk(transformation_folder):
-                    for file in files:
-                        if file.startswith(name):
-                            file_path = os.path.join(root, file)
-                            s3_object_key = f'scripts/transformation/{file}'
-                            s3.upload_file(file_path, s3_bucket_temp, s3_object_key)
-                            print(f"Uploaded {file_path} to S3: s3://{s3_bucket_temp}/{s3_object_key}")
-                            print(file_path)
+            s3 = get_client('s3', aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key,
+                            aws_session_token=aws_session_token, region_name=region_name, verify=False)
+
+            # Stage the transformation scripts in S3, skipping the ones already staged
+            script_cache = TransformationScriptCache(cfg["ETL"]["SCRIPT_CACHE_DIR"])
+            script_paths = stage_transformation_scripts(github_repo_url, github_token, transformation_subfolder,
+                                                        transformation_names, s3, s3_bucket_temp,
+                                                        script_cache=script_cache,
+                                                        blob_shas=etl_file_validator.blob_shas or None)
 
             folder = team_name
 
-            # Step 1: Run transformations
+            if transformation_dag is not None:
+                def default_output(name, is_sink):
+                    if is_sink:
+                        return f"s3://{destination_bucket}/{name}_output/"
+                    return f"s3://{s3_bucket_temp}/temp-etl-data/{folder}/{name}_output/"
+
+                dag_steps = {
+                    name: {
+                        'step_name': f'Luminex_{name}',
+                        'script_s3_path': script_paths[name],
+                        's3_input_path': input_paths,
+                        's3_output_path': output_path,
+                    }
+                    for name, (input_paths, output_path)
+                    in transformation_dag.resolve_paths(source_path, default_output).items()
+                }
+                print(f'Executing {num_transformations} Transformations as a DAG...')
+                submit_spark_dag(aws_access_key_id,
+                                 aws_secret_access_key,
+                                 aws_session_token,
+                                 region_name,
+                                 emr_cluster_id,
+                                 transformation_dag,
+                                 dag_steps)
+                return
+
+            # Step 1: Build the transformation chain, each output feeds the next input
+            pipeline_steps = []
             for i, transformation_script_name in enumerate(transformation_names, start=1):
-                print(f'Executing {i}/{num_transformations} Transformations...')
                 if i == num_transformations:
                     # transformation_output_path = destination_bucket + transformation_script_name + '_output/'
                     transformation_output_path = f"s3://{destination_bucket}/{transformation_script_name}_output/"
@@ -181,27 +477,43 @@ def run_etl(emr_cluster_id, pat, team_name, num_transformations, transformation_
                     # transformation_output_path = s3_bucket_temp + 'temp-etl-data'+ folder + transformation_script_name + '_output/'
                     transformation_output_path = f"s3://{s3_bucket_temp}/temp-etl-data/{folder}/{transformation_script_name}_output/"
 
-                transformation_script = transformation_script_name + '.py'
-                transformation_step_name = f'Luminex_' + transformation_script_name
-                scripts_path = f"s3://{s3_bucket_temp}/scripts/transformation/{transformation_script}"
-
-                submit_spark_job(aws_access_key_id,
-                                 aws_secret_access_key,
-                                 aws_session_token,
-                                 region_name,
-                                 emr_cluster_id,
-                                 transformation_step_name,
-                                 scripts_path,
-                                 source_path,
-                                 transformation_output_path)
+                pipeline_steps.append({
+                    'step_name': f'Luminex_' + transformation_script_name,
+                    'script_s3_path': script_paths[transformation_script_name],
+                    's3_input_path': source_path,
+                    's3_output_path': transformation_output_path,
+                })
                 source_path = transformation_output_path
 
+            if pipelined:
+                emr_client = get_client('emr', aws_access_key_id=aws_access_key_id,
+                                        aws_secret_access_key=aws_secret_access_key,
+                                        aws_session_token=aws_session_token, region_name=region_name)
+                if get_step_concurrency_level(emr_client, emr_cluster_id) > 1:
+                    print('Cluster runs steps concurrently, submitting transformations one at a time.')
+                    pipelined = False
+
+            # Step 2: Run transformations
+            if pipelined:
+                print(f'Executing {num_transformations} Transformations as one pipeline...')
+                submit_spark_pipeline(aws_access_key_id,
+                                      aws_secret_access_key,
+                                      aws_session_token,
+                                      region_name,
+                                      emr_cluster_id,
+                                      pipeline_steps)
+            else:
+                for i, step in enumerate(pipeline_steps, start=1):
+                    print(f'Executing {i}/{num_transformations} Transformations...')
+                    submit_spark_job(aws_access_key_id,
+                                     aws_secret_access_key,
+                                     aws_session_token,
+                                     region_name,
+                                     emr_cluster_id,
+                                     **step)
+
         except Exception as e:
             print(f"Error: {e}")
 
-        finally:
-            if local_repo_path and os.path.exists(local_repo_path):
-                os.system(f"rm -rf {local_repo_path}")
-
     else:
         print("Invalid transformation number:name combination")
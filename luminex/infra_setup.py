@@ -1,7 +1,6 @@
 import requests
 import json
 import time
-import boto3
 import os
 import base64
 import binascii
@@ -9,14 +8,46 @@ from base64 import b64encode
 from nacl import encoding, public
 import zipfile
 import logging
+import re
+import tempfile
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 
 from validation import IAMRoleValidator
 from configs import load_cfg
+from aws_clients import get_client
+from stack_tracker import SUCCESSFUL_STACK_STATES, StackEventTracker
 
 # declare global variable
 cfg = load_cfg()
 logger = logging.getLogger(__name__)
 
+# Backoff used while waiting for GitHub to register a dispatched run and for the run to complete
+WORKFLOW_POLL_MIN_INTERVAL = 1
+WORKFLOW_POLL_MAX_INTERVAL = 16
+WORKFLOW_RUN_DISCOVERY_TIMEOUT = 300
+WORKFLOW_RUN_COMPLETION_TIMEOUT = 3600
+
+# Tolerated clock difference with GitHub when filtering runs by creation time
+WORKFLOW_CLOCK_SKEW = timedelta(seconds=60)
+
+# Log archives are held in memory up to this size, larger ones spill to an anonymous temporary file
+LOG_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+LOG_CHUNK_SIZE = 64 * 1024
+LOG_TAIL_LINES = 50
+
+# Connections kept open to the GitHub API, shared by concurrent secret uploads
+GITHUB_POOL_SIZE = 10
+_github_session = None
+_github_session_lock = threading.Lock()
+
+# Log archive members are named "<job name>/<step number>_<step name>.txt"
+LOG_STEP_MEMBER_PATTERN = re.compile(r'^(?P<job>.+)/\d+_(?P<step>.+)\.txt$')
+
 
 def get_stack_outputs(stack_name, region, aws_access_key_id, aws_secret_access_key, aws_session_token):
     """
@@ -33,8 +64,8 @@ def get_stack_outputs(stack_name, region, aws_access_key_id, aws_secret_access_k
                     EMR Cluster ID (str): It returns the output of the stack i.e.
                     EMR Cluster ID to the trigger_workflow function
     """
-    client = boto3.client('cloudformation', region_name=region, aws_access_key_id=aws_access_key_id,
-                          aws_secret_access_key=aws_secret_access_key, aws_session_token=aws_session_token)
+    client = get_client('cloudformation', region_name=region, aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key, aws_session_token=aws_session_token)
 
     try:
         stack = client.describe_stacks(StackName=stack_name)
@@ -48,7 +79,7 @@ def get_stack_outputs(stack_name, region, aws_access_key_id, aws_secret_access_k
 
 
 def fetch_stack_status_with_retry(stack_name, aws_region, aws_access_key_id, aws_secret_access_key, aws_session_token,
-                                  max_retries=15, retry_delay=60, initial_delay=120):
+                                  max_retries=15, retry_delay=60, initial_delay=120, since=None):
     """
     Returns the EMR cluster ID.
 
@@ -58,94 +89,120 @@ def fetch_stack_status_with_retry(stack_name, aws_region, aws_access_key_id, aws
                     aws_access_key_id (str): AWS Temp Credentials: Access Key ID
                     aws_secret_access_key (str): AWS Temp Credentials: Secret Access Key
                     aws_session_token (str): AWS Temp Credentials: Session Token
-                    max_retries (int): Max retries to trigger the AWS to check if the stack deployment is complete
-                    retry_delay (int): Delay seconds between each retry
-                    initial_delay (int): The initial delay in seconds before checking on the stack creation
+                    max_retries (int): Together with the delays, bounds how long the stack deployment is awaited
+                    retry_delay (int): Longest delay in seconds between two polls of the stack events
+                    initial_delay (int): Extra seconds allowed for the stack to be created
+                    since (datetime): Time the deployment was triggered; older stack events are not printed
 
             Returns:
-                    If the stack creation has been successful or not
+                    If the stack creation has been successful or not, None if it did not finish in time
     """
-    # Initial waiting period before starting retries
     print(f"Waiting for stack {stack_name} to be created...")
-    time.sleep(initial_delay)
-    client = boto3.client('cloudformation', region_name=aws_region, aws_access_key_id=aws_access_key_id,
-                          aws_secret_access_key=aws_secret_access_key, aws_session_token=aws_session_token)
+    client = get_client('cloudformation', region_name=aws_region, aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key, aws_session_token=aws_session_token)
 
-    # Retry fetching the EMR Cluster ID with a delay in case of 404 errors
-    for retry_count in range(max_retries):
-        try:
-            stack_resources = client.list_stack_resources(StackName=stack_name)
-            stack_resources = stack_resources['StackResourceSummaries']
-            print("Resources:")
-            for resource in stack_resources:
-                print("| {} | {} | {} | {} |".format(resource['LogicalResourceId'], resource['PhysicalResourceId'],
-                                                     resource['ResourceType'], resource['ResourceStatus']))
-
-            stack = client.describe_stacks(StackName=stack_name)
-            status = stack['Stacks'][0]['StackStatus']
-
-            if status.endswith('COMPLETE'):
-                print(f"Stack {stack_name} creation complete.")
-                return True
-
-            elif status.endswith('ROLLBACK'):
-                print(f"Stack {stack_name} creation failed.")
-                return False
-
-        except client.exceptions.ClientError as e:
-            if 'does not exist' in str(e):
-                pass  # Stack doesn't exist yet, continue waiting
-            else:
-                raise
+    # New stack events are printed as they happen; the wait ends as soon as the stack is terminal.
+    # Events from before the dispatch belong to earlier deployments of an existing stack and are skipped.
+    tracker = StackEventTracker(client, stack_name, since=since, max_interval=retry_delay)
 
-        print(
-            f'Retry {retry_count + 1}/{max_retries}. EMR Cluster creation in progress, waiting {retry_delay}'
-            f' seconds before fetching more details...')
-        time.sleep(retry_delay)
+    def print_event(event):
+        print("| {} | {} | {} | {} | {}".format(event['LogicalResourceId'], event.get('PhysicalResourceId', ''),
+                                               event['ResourceType'], event['ResourceStatus'],
+                                               event.get('ResourceStatusReason', '')))
+
+    try:
+        status = tracker.wait(on_event=print_event, timeout=initial_delay + max_retries * retry_delay)
+    except TimeoutError as e:
+        print(f'{e} Failed to retrieve EMR Cluster ID. Please check the logs for more information.')
+        return None
 
-    print(f'Exceeded maximum retries. Failed to retrieve EMR Cluster ID. Please check the logs for more information.')
-    return None
+    if status in SUCCESSFUL_STACK_STATES:
+        print(f"Stack {stack_name} creation complete.")
+        return True
+    print(f"Stack {stack_name} creation failed with status {status}.")
+    return False
 
 
-def get_latest_workflow_run_id(organization, repository, workflow_name, token):
+def find_workflow_run(organization, repository, workflow_name, token, dispatch_id, created_after,
+                      timeout=WORKFLOW_RUN_DISCOVERY_TIMEOUT):
     """
-    Retrieve the ID of the latest run for a specified GitHub Actions workflow.
+    Find the workflow run started by a specific repository dispatch.
 
     Parameters:
     - organization (str): The GitHub organization or username.
     - repository (str): The name of the GitHub repository.
     - workflow_name (str): The name of the GitHub Actions workflow.
     - token (str): Personal access token for authentication.
+    - dispatch_id (str): The unique ID sent in the dispatch payload; the workflow's run-name contains it.
+    - created_after (datetime): Only runs created at or after this time are considered.
+    - timeout (float): Seconds to wait for the run to appear.
 
     Returns:
-    - int or None: The ID of the latest workflow run if available, or None if no runs exist or an error occurs.
-
-    This function sends a GET request to the GitHub API to fetch information about the workflow runs
-    for the specified repository and workflow. It extracts the ID of the latest run and returns it.
-    If there are no runs or if an error occurs during the API request, the function returns None.
+    - int or None: The ID of the matching workflow run, or None if it does not appear in time.
 
-    Note: Make sure the provided token has the necessary permissions to access workflow run information.
+    The runs list is filtered server-side with `created>=`, so only the few runs started since the
+    dispatch are transferred. It is polled immediately and then with exponential backoff, so the run
+    is found as soon as GitHub registers it, even when several users trigger the workflow at once.
     """
-
     url = f'https://api.github.com/repos/{organization}/{repository}/actions/workflows/{workflow_name}/runs'
     headers = {
         'Authorization': f'Bearer {token}',
         'Accept': 'application/vnd.github.v3+json'
     }
+    params = {
+        'event': 'repository_dispatch',
+        'created': f'>={created_after.strftime("%Y-%m-%dT%H:%M:%SZ")}',
+    }
 
-    response = requests.get(url, headers=headers, verify=False)
-
-    if response.status_code == 200:
-        data = response.json()
-        if data['workflow_runs']:
-            # Assuming the first run is the latest one
-            latest_run = data['workflow_runs'][0]
-            return latest_run['id']
+    deadline = time.monotonic() + timeout
+    interval = WORKFLOW_POLL_MIN_INTERVAL
+    while True:
+        response = requests.get(url, headers=headers, params=params)
+        if response.status_code == 200:
+            for run in response.json().get('workflow_runs', []):
+                if dispatch_id in (run.get('display_title') or run.get('name') or ''):
+                    return run['id']
         else:
+            print(f'Error: {response.status_code}, {response.text}')
+
+        if time.monotonic() + interval > deadline:
             return None
-    else:
-        print(f'Error: {response.status_code}, {response.text}')
-        return None
+        time.sleep(interval)
+        interval = min(interval * 2, WORKFLOW_POLL_MAX_INTERVAL)
+
+
+def wait_for_workflow_run(owner, repo, run_id, github_token, timeout=WORKFLOW_RUN_COMPLETION_TIMEOUT):
+    """
+    Wait for a GitHub Actions workflow run to complete.
+
+    Parameters:
+    - owner (str): The owner of the GitHub repository (organization or username).
+    - repo (str): The name of the GitHub repository.
+    - run_id (int): The ID of the GitHub Actions workflow run to wait for.
+    - github_token (str): Personal access token for authentication.
+    - timeout (float): Seconds to wait for completion.
+
+    Returns:
+    - dict or None: The details of the completed run, or None if the run cannot be fetched or
+      does not complete in time.
+
+    The run is polled with exponential backoff capped at WORKFLOW_POLL_MAX_INTERVAL seconds.
+    """
+    deadline = time.monotonic() + timeout
+    interval = WORKFLOW_POLL_MIN_INTERVAL
+    while True:
+        details = get_workflow_run_details(owner, repo, run_id, github_token)
+        if not isinstance(details, dict):
+            print(details)
+            return None
+        if details.get('status') == 'completed':
+            return details
+
+        if time.monotonic() + interval > deadline:
+            print(f'Workflow run {run_id} did not complete within {timeout} seconds.')
+            return None
+        time.sleep(interval)
+        interval = min(interval * 2, WORKFLOW_POLL_MAX_INTERVAL)
 
 
 def get_workflow_run_details(owner, repo, run_id, github_token):
@@ -176,7 +233,7 @@ def get_workflow_run_details(owner, repo, run_id, github_token):
         'Accept': 'application/vnd.github.v3+json'
     }
 
-    response = requests.get(url, headers=headers, verify=False)
+    response = requests.get(url, headers=headers)
 
     if response.status_code == 200:
         data = response.json()
@@ -198,11 +255,11 @@ def print_step_logs(organization, repository, workflow_run_id, token):
     Returns:
     - str: A message indicating the status of the workflow run. If the workflow is successful,
       the message is "workflow successfully ran". If there are failed steps, it provides details
-      about the failure and advises checking downloaded logs for more information.
+      about the failure and prints the tail of the failed steps' logs.
 
     This function retrieves information about the jobs and steps in a GitHub Actions workflow run.
     It prints the status of each step and, if any step fails, provides details about the failure
-    along with a message suggesting checking the downloaded logs for more information.
+    along with the last lines of the failed steps' logs.
 
     Note: Ensure that the provided token has the necessary permissions to access workflow run details
     and annotations.
@@ -215,7 +272,7 @@ def print_step_logs(organization, repository, workflow_run_id, token):
         'Accept': 'application/vnd.github.v3+json'
     }
 
-    response = requests.get(jobs_url, headers=headers, verify=False)
+    response = requests.get(jobs_url, headers=headers)
     print(f"job-response-code:{response.status_code}")
 
     if response.status_code == 200:
@@ -234,14 +291,17 @@ def print_step_logs(organization, repository, workflow_run_id, token):
 
                     failure_step = step_name
             check_run_url = job["check_run_url"]
-            get_failure_msgs_details = requests.get(check_run_url, headers=headers, verify=False)
+            get_failure_msgs_details = requests.get(check_run_url, headers=headers)
             annotation_url = get_failure_msgs_details.json()["output"]["annotations_url"]
             if len(step_failure_list) != 0:
-                failure_response = requests.get(annotation_url, headers=headers, verify=False)
+                failure_response = requests.get(annotation_url, headers=headers)
                 workflow_message = failure_response.json()[0]["message"]
-                print(f"Github workflow failed at {failure_step} step  with error message : {workflow_message}. "
-                      f"Check downloaded logs for more details")
-                get_workflow_run_logs(organization, repository, workflow_run_id, token)
+                print(f"Github workflow failed at {failure_step} step  with error message : {workflow_message}.")
+                step_logs = get_workflow_run_logs(organization, repository, workflow_run_id, token,
+                                                  {job_name: step_failure_list})
+                for step, lines in (step_logs or {}).items():
+                    print(f"Last {len(lines)} log lines of {step}:")
+                    print("\n".join(lines))
                 return workflow_message
             else:
                 workflow_message = "success"
@@ -252,9 +312,9 @@ def print_step_logs(organization, repository, workflow_run_id, token):
         print(f'Failed to fetch jobs. Status code: {response.status_code}')
 
 
-def get_workflow_run_logs(owner, repo, run_id, token):
+def stream_workflow_run_logs(owner, repo, run_id, token):
     """
-    Download and extract the logs of a specific GitHub Actions workflow run.
+    Download the log archive of a GitHub Actions workflow run into a bounded buffer.
 
     Parameters:
     - owner (str): The owner of the GitHub repository (organization or username).
@@ -263,37 +323,113 @@ def get_workflow_run_logs(owner, repo, run_id, token):
     - token (str): Personal access token for authentication.
 
     Returns:
-    - int or None: The HTTP status code indicating the success of the operation (200 for success),
-      or None if an error occurs during the API request.
+    - SpooledTemporaryFile or None: The zip archive, positioned at its start, or None if an error
+      occurs during the API request. The caller closes it.
 
-    This function sends a GET request to the GitHub API to fetch the logs of the specified
-    GitHub Actions workflow run in the given repository. If the request is successful (status code 200),
-    the function downloads the logs as a zip file, extracts the contents, and returns the HTTP status code.
-    If an error occurs during the API request, the function prints an error message and returns None.
-
-    Note: Ensure that the provided token has the necessary permissions to access workflow run logs.
+    The archive is streamed in LOG_CHUNK_SIZE chunks into a SpooledTemporaryFile, which stays in
+    memory up to LOG_SPOOL_MAX_SIZE bytes and spills to an anonymous temporary file beyond that,
+    so nothing is written to the working directory.
     """
     url = f"https://api.github.com/repos/{owner}/{repo}/actions/runs/{run_id}/logs"
     headers = {
         "Authorization": f"Bearer {token}",
     }
 
-    response = requests.get(url, headers=headers, verify=False)
+    with requests.get(url, headers=headers, stream=True) as response:
+        if response.status_code != 200:
+            print(f"Error: {response.status_code}")
+            print(response.text)
+            return None
 
-    if response.status_code == 200:
-        zip_file_path = os.path.join('downloaded_file.zip')
-        with open(zip_file_path, 'wb') as f:
-            f.write(response.content)
-        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-            zip_ref.extractall()
-        return response.status_code
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
+        archive = tempfile.SpooledTemporaryFile(max_size=LOG_SPOOL_MAX_SIZE)
+        for chunk in response.iter_content(chunk_size=LOG_CHUNK_SIZE):
+            archive.write(chunk)
+    archive.seek(0)
+    return archive
+
+
+def _log_name(name):
+    # GitHub drops characters that are not allowed in file names from job and step names in the archive
+    return re.sub(r'[\\/:*?"<>|]', '', name).strip()
+
+
+def read_step_logs(archive, failed_steps, tail=LOG_TAIL_LINES, pattern=None):
+    """
+    Read the logs of selected steps from a workflow run log archive, without extracting it.
+
+    Parameters:
+    - archive (file-like): Seekable zip archive, as returned by stream_workflow_run_logs.
+    - failed_steps (dict): Job name to the list of step names whose logs are wanted.
+    - tail (int): Number of last lines kept per step, or None for all lines.
+    - pattern (str): Regular expression; when given only matching lines are kept.
+
+    Returns:
+    - dict: "<job>/<step>" to the list of selected log lines, in archive order.
+
+    Members are decompressed one line at a time, so only the selected lines are held in memory.
+    """
+    wanted = {(_log_name(job), _log_name(step)) for job, steps in failed_steps.items() for step in steps}
+    regex = re.compile(pattern) if pattern else None
+
+    logs = {}
+    with zipfile.ZipFile(archive) as zip_file:
+        for member in zip_file.infolist():
+            match = LOG_STEP_MEMBER_PATTERN.match(member.filename)
+            if not match or (match.group('job'), match.group('step')) not in wanted:
+                continue
+            lines = deque(maxlen=tail)
+            with zip_file.open(member) as stream:
+                for raw_line in stream:
+                    line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+                    if regex is None or regex.search(line):
+                        lines.append(line)
+            logs[f"{match.group('job')}/{match.group('step')}"] = list(lines)
+    return logs
+
+
+def get_workflow_run_logs(owner, repo, run_id, token, failed_steps, tail=LOG_TAIL_LINES, pattern=None):
+    """
+    Fetch the logs of the failed steps of a GitHub Actions workflow run.
+
+    Parameters:
+    - owner (str): The owner of the GitHub repository (organization or username).
+    - repo (str): The name of the GitHub repository.
+    - run_id (int): The ID of the GitHub Actions workflow run to retrieve logs for.
+    - token (str): Personal access token for authentication.
+    - failed_steps (dict): Job name to the list of failed step names.
+    - tail (int): Number of last lines kept per step, or None for all lines.
+    - pattern (str): Regular expression; when given only matching lines are kept.
+
+    Returns:
+    - dict or None: "<job>/<step>" to the list of selected log lines, or None if an error occurs
+      during the API request.
+
+    Note: Ensure that the provided token has the necessary permissions to access workflow run logs.
+    """
+    archive = stream_workflow_run_logs(owner, repo, run_id, token)
+    if archive is None:
         return None
+    with archive:
+        return read_step_logs(archive, failed_steps, tail=tail, pattern=pattern)
 
 
-def create_github_secret(key_id, key, owner, repo, token, secret_name, secret_value):
+def get_github_session():
+    """
+    Returns the process-wide requests session used for GitHub secret calls. Its connection pool
+    keeps TCP and TLS connections open, so consecutive and concurrent calls reuse them.
+    """
+    global _github_session
+    with _github_session_lock:
+        if _github_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=GITHUB_POOL_SIZE)
+            session.mount('https://', adapter)
+            _github_session = session
+        return _github_session
+
+
+def create_github_secret(key_id, key, owner, repo, token, secret_name, secret_value, session=None):
+    session = session or get_github_session()
     url = f'https://api.github.com/repos/{owner}/{repo}/actions/secrets/{secret_name}'
     headers = {
         'Authorization': f'token {token}',
@@ -304,7 +440,7 @@ def create_github_secret(key_id, key, owner, repo, token, secret_name, secret_va
         'key_id': key_id
     }
 
-    response = requests.put(url, json=data, headers=headers, verify=False)
+    response = session.put(url, json=data, headers=headers)
 
     if response.status_code == 201:
         print(f"Secret '{secret_name}' added successfully.")
@@ -313,6 +449,32 @@ def create_github_secret(key_id, key, owner, repo, token, secret_name, secret_va
     else:
         print(f"Failed to add/update secret '{secret_name}'. Status code: {response.status_code}")
         print(response.text)
+    return response.status_code
+
+
+def create_github_secrets(key_id, key, owner, repo, token, secrets):
+    """
+    Encrypts and uploads several GitHub secrets concurrently over the pooled session.
+
+            Parameters:
+                    key_id (str): ID of the repository public key
+                    key (str): The repository public key, base64 encoded
+                    owner (str): The owner of the GitHub repository
+                    repo (str): The name of the Repo
+                    token (str): The personal access token
+                    secrets (dict): Secret name to secret value
+
+            Returns:
+                    Dictionary of secret name to the HTTP status code of its upload
+    """
+    if not secrets:
+        return {}
+    session = get_github_session()
+    with ThreadPoolExecutor(max_workers=min(len(secrets), GITHUB_POOL_SIZE)) as executor:
+        futures = {secret_name: executor.submit(create_github_secret, key_id, key, owner, repo, token,
+                                                secret_name, secret_value, session)
+                   for secret_name, secret_value in secrets.items()}
+        return {secret_name: future.result() for secret_name, future in futures.items()}
 
 
 def get_github_public_key(owner, repo, token):
@@ -322,7 +484,7 @@ def get_github_public_key(owner, repo, token):
         'Accept': 'application/vnd.github.v3+json'
     }
 
-    response = requests.get(url, headers=headers, verify=False)
+    response = get_github_session().get(url, headers=headers)
 
     if response.status_code == 200:
         key_data = response.json()
@@ -343,11 +505,15 @@ def get_github_public_key(owner, repo, token):
         return None, None
 
 
+@lru_cache(maxsize=16)
+def _sealed_box(public_key: str) -> public.SealedBox:
+    """Build the sealed box of a public key once; every secret sealed for the key reuses it."""
+    return public.SealedBox(public.PublicKey(public_key.encode("utf-8"), encoding.Base64Encoder()))
+
+
 def encrypt(public_key: str, secret_value: str) -> str:
     """Encrypt a Unicode string using the public key."""
-    public_key = public.PublicKey(public_key.encode("utf-8"), encoding.Base64Encoder())
-    sealed_box = public.SealedBox(public_key)
-    encrypted = sealed_box.encrypt(secret_value.encode("utf-8"))
+    encrypted = _sealed_box(public_key).encrypt(secret_value.encode("utf-8"))
     return b64encode(encrypted).decode("utf-8")
 
 
@@ -379,24 +545,26 @@ def trigger_workflow(organization, repository, workflow_name, event_type, aws_re
         'Content-Type': 'application/json',
     }
 
+    # The workflow puts the dispatch ID in its run-name, which identifies our run among concurrent ones
+    dispatch_id = uuid.uuid4().hex
     payload = {
         'event_type': event_type,
         'client_payload': {
             'workflow': workflow_name,
+            'dispatch_id': dispatch_id,
             'inputs': inputs or {},
         }
     }
 
-    response = requests.post(url, headers=headers, data=json.dumps(payload), verify=False)
+    dispatched_at = datetime.now(timezone.utc) - WORKFLOW_CLOCK_SKEW
+    response = requests.post(url, headers=headers, data=json.dumps(payload))
 
     if response.status_code == 204:
         print(f'Response status code: {response.status_code}, Workflow triggered successfully.Fetching workflow run id')
-        time.sleep(15)
-        latest_run_id = get_latest_workflow_run_id(organization, repository, workflow_name, token)
+        latest_run_id = find_workflow_run(organization, repository, workflow_name, token, dispatch_id, dispatched_at)
         if latest_run_id is not None:
             print(f'Latest Workflow Run ID: {latest_run_id}. Getting Workflow status step by step')
-            time.sleep(20)
-            workflow_run_details = get_workflow_run_details(organization, repository, latest_run_id, token)
+            workflow_run_details = wait_for_workflow_run(organization, repository, latest_run_id, token)
             if workflow_run_details is not None:
                 conclusion = workflow_run_details['conclusion']
                 print(f'Workflow status : {conclusion}')
@@ -405,7 +573,7 @@ def trigger_workflow(organization, repository, workflow_name, event_type, aws_re
                     failure_reason = print_step_logs(organization, repository, latest_run_id, token)
                     if failure_reason == "success":
                         if fetch_stack_status_with_retry(stack_name, aws_region, aws_access_key_id, aws_secret_access_key,
-                                                         aws_session_token):
+                                                         aws_session_token, since=dispatched_at):
                             outputs = get_stack_outputs(stack_name, aws_region, aws_access_key_id, aws_secret_access_key, aws_session_token)
                             for key, value in outputs.items():
                                 print(f"Infra has been set.{key}: {value} ")
@@ -465,10 +633,12 @@ def run_infra(pat, stack_name):
         'AWS_SESSION_TOKEN': aws_session_token
     }
 
-    for secret_name, secret_value in workflow_inputs.items():
-        key_id, key = get_github_public_key(organization_name, repository_name, personal_access_token)
-        create_github_secret(key_id, key, organization_name, repository_name, personal_access_token,
-                             secret_name, secret_value)
+    # One public key fetch for all secrets, which are then uploaded concurrently
+    key_id, key = get_github_public_key(organization_name, repository_name, personal_access_token)
+    if key_id is None:
+        print("Failed to fetch the repository public key, GitHub secrets were not updated.")
+        return
+    create_github_secrets(key_id, key, organization_name, repository_name, personal_access_token, workflow_inputs)
 
     workflow_inputs['stack-name'] = stack_name
     trigger_workflow(organization_name, repository_name, workflow_name, event_type, aws_region, personal_access_token,
@@ -0,0 +1,81 @@
+"""
+This module defines the TransformationScriptCache class, a content-addressed local cache
+of transformation scripts keyed by their Git blob SHA.
+"""
+import hashlib
+import os
+import tempfile
+
+
+def git_blob_sha(content):
+    """
+    Computes the Git blob SHA of a file's contents, as reported by the GitHub API.
+
+    Parameters:
+        content (bytes): The file contents.
+
+    Returns:
+        sha (str): Hex digest of the Git blob object.
+    """
+    return hashlib.sha1(b'blob %d\0' % len(content) + content).hexdigest()
+
+
+class TransformationScriptCache:
+    """
+    TransformationScriptCache: Stores script contents on disk under their Git blob SHA.
+    Entries are immutable, so a hit never needs revalidating against GitHub.
+
+    Attributes:
+        cache_dir (str): Directory holding one file per blob SHA.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Initialize TransformationScriptCache.
+
+        Parameters:
+            cache_dir (str): Directory holding one file per blob SHA; created on first write.
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+
+    def path(self, sha):
+        """
+        Returns the cache file path of a blob SHA.
+        """
+        return os.path.join(self.cache_dir, sha)
+
+    def get(self, sha):
+        """
+        Returns the cached contents of a blob SHA, or None on a miss. Entries whose
+        contents no longer match their SHA are dropped.
+
+        Parameters:
+            sha (str): Git blob SHA.
+
+        Returns:
+            content (bytes): The script contents, or None.
+        """
+        try:
+            with open(self.path(sha), 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+        if git_blob_sha(content) != sha:
+            os.remove(self.path(sha))
+            return None
+        return content
+
+    def put(self, sha, content):
+        """
+        Stores script contents under their blob SHA; the write is atomic so
+        concurrent runs never see a partial entry.
+
+        Parameters:
+            sha (str): Git blob SHA.
+            content (bytes): The script contents.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f'.{sha}.')
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(content)
+        os.replace(temp_path, self.path(sha))
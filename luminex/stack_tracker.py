@@ -0,0 +1,132 @@
+"""
+This module defines the StackEventTracker class, which tails the events of a CloudFormation
+stack incrementally and reports the stack status as soon as it reaches a terminal state.
+"""
+import random
+import time
+
+from botocore.exceptions import ClientError
+
+# Stack statuses after which an operation has succeeded
+SUCCESSFUL_STACK_STATES = ('CREATE_COMPLETE', 'UPDATE_COMPLETE', 'IMPORT_COMPLETE')
+
+STACK_RESOURCE_TYPE = 'AWS::CloudFormation::Stack'
+
+
+def is_terminal_stack_status(status):
+    """
+    Checks whether a stack status ends an operation, i.e. is neither missing nor in progress.
+    """
+    return bool(status) and not status.endswith('_IN_PROGRESS') and status.endswith(('_COMPLETE', '_FAILED'))
+
+
+class StackEventTracker:
+    """
+    StackEventTracker: Tails describe_stack_events of one stack. Each poll pages through the
+    newest events only until it reaches the last event already seen, so every event is emitted
+    once, and the stack status is read from the stack's own events instead of describe_stacks.
+    The polling interval backs off with jitter while nothing happens and drops back to the
+    minimum when new events arrive.
+
+    Attributes:
+        cf_client (boto3.client): CloudFormation client used for describe_stack_events.
+        stack_name (str): Name of the tracked stack.
+        status (str): Last seen stack status, None until the stack has events.
+        last_event_id (str): ID of the newest event seen.
+
+    Methods:
+        - poll: Fetch the events published since the last poll.
+        - wait: Poll until the stack reaches a terminal status.
+    """
+
+    def __init__(self, cf_client, stack_name, since=None, min_interval=5, max_interval=30, backoff=1.5, jitter=0.2,
+                 sleep=None):
+        """
+        Initialize StackEventTracker.
+
+        Parameters:
+            cf_client (boto3.client): CloudFormation client used for describe_stack_events.
+            stack_name (str): Name of the tracked stack.
+            since (datetime): Events older than this are ignored on the first poll; all when None.
+            min_interval (float): Seconds between polls right after new events.
+            max_interval (float): Upper bound for the polling interval in seconds.
+            backoff (float): Factor applied to the interval after a poll without events.
+            jitter (float): Fraction of the interval randomly added or removed on every sleep.
+            sleep (callable): Sleep function, time.sleep when None.
+        """
+        self.cf_client = cf_client
+        self.stack_name = stack_name
+        self.since = since
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.sleep = sleep or time.sleep
+        self.status = None
+        self.last_event_id = None
+
+    def poll(self):
+        """
+        Fetches the stack events published since the previous poll.
+
+        Returns:
+            events (list): New events, oldest first; empty while the stack does not exist yet.
+        """
+        new_events = []
+        kwargs = {'StackName': self.stack_name}
+        try:
+            while True:
+                response = self.cf_client.describe_stack_events(**kwargs)
+                # Events are returned newest first, stop at the first one already seen
+                for event in response.get('StackEvents', []):
+                    if event['EventId'] == self.last_event_id:
+                        break
+                    if self.last_event_id is None and self.since is not None and event['Timestamp'] < self.since:
+                        break
+                    new_events.append(event)
+                else:
+                    if response.get('NextToken'):
+                        kwargs['NextToken'] = response['NextToken']
+                        continue
+                break
+        except ClientError as e:
+            if 'does not exist' in str(e):
+                return []
+            raise
+
+        new_events.reverse()
+        for event in new_events:
+            if event['LogicalResourceId'] == self.stack_name and event['ResourceType'] == STACK_RESOURCE_TYPE:
+                self.status = event['ResourceStatus']
+        if new_events:
+            self.last_event_id = new_events[-1]['EventId']
+        return new_events
+
+    def wait(self, on_event=None, timeout=None):
+        """
+        Polls until the stack reaches a terminal status.
+
+        Parameters:
+            on_event (callable): Called as on_event(event) for every new event, oldest first.
+            timeout (float): Maximum number of seconds to wait; unbounded when None.
+
+        Returns:
+            status (str): The terminal stack status.
+
+        Raises:
+            TimeoutError: If the stack is still in progress after `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = self.min_interval
+        while True:
+            events = self.poll()
+            for event in events:
+                if on_event:
+                    on_event(event)
+            if is_terminal_stack_status(self.status):
+                return self.status
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Stack {self.stack_name} is still {self.status or 'not created'}.")
+
+            interval = self.min_interval if events else min(interval * self.backoff, self.max_interval)
+            self.sleep(interval * random.uniform(1 - self.jitter, 1 + self.jitter))
@@ -1,3 +1,4 @@
 from .validate_multiple_files import ETLFileValidator
 from .infra_validator import IAMRoleValidator
-from .s3_validator import ETLS3Validator
\ No newline at end of file
+from .s3_validator import ETLS3Validator
+from .preflight import run_preflight
\ No newline at end of file
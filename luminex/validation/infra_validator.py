@@ -1,12 +1,25 @@
-import boto3
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 import re
 
+from aws_clients import get_client
+from .ttl_cache import TTLCache
+
+# Number of roles validated at once
+ROLE_VALIDATION_WORKERS = 8
+
+# Attaching or detaching a policy does not change any timestamp on the role, so cached policy lists also expire
+POLICY_CACHE_TTL = 900
+POLICY_CACHE_MAXSIZE = 256
+
 class IAMRoleValidator:
+    # Attached policy names shared by every validator in the process, keyed by role ARN and version
+    policy_cache = TTLCache(maxsize=POLICY_CACHE_MAXSIZE, ttl=POLICY_CACHE_TTL)
+
     def __init__(self, cfg):
         # Initialize IAMRoleValidator class with the path to the configuration file
         self.config = cfg  # Load configuration from the specified file
-        self.iam_client = boto3.client('iam')
+        self.iam_client = get_client('iam')
 
 
     def is_valid_role_name_format(self, role_name):
@@ -16,41 +29,74 @@ class IAMRoleValidator:
         return bool(re.match(pattern, role_name))
 
     def validate_roles(self):
-        # Validate IAM roles based on the specified permissions in the configuration
+        # Validate IAM roles based on the specified permissions in the configuration.
+        # Roles are checked concurrently, the messages are printed in configuration order.
         permissions_config = self.config["VALIDATION"]["PERMISSIONS"]
 
-        for role_name, required_permissions in permissions_config.items():
-            if self.iam_role_exists(role_name):
-                print(f"Role '{role_name}' exists.")
+        with ThreadPoolExecutor(max_workers=ROLE_VALIDATION_WORKERS) as executor:
+            futures = {role_name: executor.submit(self.validate_role, role_name, required_permissions)
+                       for role_name, required_permissions in permissions_config.items()}
+            results = {role_name: future.result() for role_name, future in futures.items()}
 
-                # Check if the role name follows the specified format
-                if self.is_valid_role_name_format(role_name):
-                    print(f"Role '{role_name}' follows the specified naming format.")
-                else:
-                    print(f"Role '{role_name}' does not follow the specified naming format.")
+        missing = {}
+        for role_name, (missing_permissions, messages) in results.items():
+            for message in messages:
+                print(message)
+            missing[role_name] = missing_permissions
+        return missing
 
-                # List policies attached to the IAM role and collect permissions
-                role_policies = self.iam_client.list_attached_role_policies(RoleName=role_name)
-                role_permissions = [item.get('PolicyName', '') for item in role_policies.get('AttachedPolicies', [])]
+    def validate_role(self, role_name, required_permissions):
+        # Validate one role; returns its missing permissions (None if the role does not exist) and the messages to print
+        role = self.get_role(role_name)
+        if role is None:
+            return None, [f"Role '{role_name}' does not exist. Skipping validation."]
 
-                # Track missing permissions
-                missing_permissions = [p for p in required_permissions if p not in role_permissions]
+        messages = [f"Role '{role_name}' exists."]
 
-                # Print the final message
-                if not missing_permissions:
-                    print(f"Role '{role_name}' has all required permissions.")
-                else:
-                    print(f"Role '{role_name}' is missing the following permissions: {', '.join(missing_permissions)}")
-            else:
-                print(f"Role '{role_name}' does not exist. Skipping validation.")
+        # Check if the role name follows the specified format
+        if self.is_valid_role_name_format(role_name):
+            messages.append(f"Role '{role_name}' follows the specified naming format.")
+        else:
+            messages.append(f"Role '{role_name}' does not follow the specified naming format.")
 
-    def iam_role_exists(self, role_name):
-        # Check if the IAM role exists
+        # List policies attached to the IAM role and collect permissions
+        role_permissions = self.attached_policy_names(role)
+
+        # Track missing permissions
+        missing_permissions = [p for p in required_permissions if p not in role_permissions]
+
+        if not missing_permissions:
+            messages.append(f"Role '{role_name}' has all required permissions.")
+        else:
+            messages.append(f"Role '{role_name}' is missing the following permissions: {', '.join(missing_permissions)}")
+        return missing_permissions, messages
+
+    def attached_policy_names(self, role):
+        # Names of all policies attached to a role, following pagination. IAM roles carry no
+        # last-modified timestamp, so the cache key pairs the ARN with RoleId and CreateDate,
+        # which change whenever the role is recreated.
+        cache_key = (role['Arn'], role['RoleId'], str(role['CreateDate']))
+        policy_names = self.policy_cache.get(cache_key)
+        if policy_names is not None:
+            return policy_names
+
+        paginator = self.iam_client.get_paginator('list_attached_role_policies')
+        policy_names = [item.get('PolicyName', '')
+                        for page in paginator.paginate(RoleName=role['RoleName'])
+                        for item in page.get('AttachedPolicies', [])]
+        self.policy_cache.set(cache_key, policy_names)
+        return policy_names
+
+    def get_role(self, role_name):
+        # Fetch the IAM role, or None if it does not exist
         try:
-            self.iam_client.get_role(RoleName=role_name)
-            return True
+            return self.iam_client.get_role(RoleName=role_name)['Role']
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchEntity':
-                return False
+                return None
             else:
                 raise
+
+    def iam_role_exists(self, role_name):
+        # Check if the IAM role exists
+        return self.get_role(role_name) is not None
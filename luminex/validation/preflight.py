@@ -0,0 +1,141 @@
+"""
+This module runs the ETL preflight checks (S3 paths, GitHub transformation files,
+EMR cluster state and AWS credentials) concurrently and aggregates them into one report,
+so preflight takes as long as the slowest check instead of the sum of all of them.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+# EMR cluster states in which steps can be submitted
+ACTIVE_CLUSTER_STATES = ('STARTING', 'BOOTSTRAPPING', 'RUNNING', 'WAITING')
+
+
+class PreflightResult:
+    """
+    Outcome of one preflight check.
+
+    Attributes:
+        name (str): Name of the check.
+        passed (bool): Whether the check passed.
+        detail (str): Human readable detail.
+        duration (float): Seconds the check took.
+    """
+
+    def __init__(self, name, passed, detail='', duration=0.0):
+        self.name = name
+        self.passed = passed
+        self.detail = detail
+        self.duration = duration
+
+    def __repr__(self):
+        return f'PreflightResult({self.name!r}, passed={self.passed}, detail={self.detail!r})'
+
+
+class PreflightReport:
+    """
+    Aggregated outcome of all preflight checks.
+
+    Attributes:
+        results (list): PreflightResult per check, in the order the checks were given.
+    """
+
+    def __init__(self, results):
+        self.results = results
+
+    @property
+    def passed(self):
+        return all(result.passed for result in self.results)
+
+    def failures(self):
+        """
+        Returns the results of the checks that failed.
+        """
+        return [result for result in self.results if not result.passed]
+
+    def summary(self):
+        """
+        Returns one line per check with its status, duration and detail.
+        """
+        lines = []
+        for result in self.results:
+            status = 'PASSED' if result.passed else 'FAILED'
+            detail = f': {result.detail}' if result.detail else ''
+            lines.append(f'[{status}] {result.name} ({result.duration:.2f}s){detail}')
+        return '\n'.join(lines)
+
+
+def _run_check(name, check):
+    start = time.monotonic()
+    try:
+        passed, detail = check()
+    except Exception as e:  # pylint: disable=broad-except
+        passed, detail = False, f'{type(e).__name__}: {e}'
+    return PreflightResult(name, passed, detail, time.monotonic() - start)
+
+
+def run_preflight(checks, max_workers=None):
+    """
+    Runs preflight checks concurrently and aggregates their results. A check that raises
+    is reported as failed instead of aborting the others.
+
+    Parameters:
+        checks (list): (name, callable) pairs; each callable returns (passed, detail).
+        max_workers (int): Number of checks run at once; all of them when None.
+
+    Returns:
+        report (PreflightReport): The aggregated results.
+    """
+    if not checks:
+        return PreflightReport([])
+    with ThreadPoolExecutor(max_workers=max_workers or len(checks)) as executor:
+        futures = [executor.submit(_run_check, name, check) for name, check in checks]
+        return PreflightReport([future.result() for future in futures])
+
+
+def s3_path_check(s3_validator, s3_path, path_type):
+    """
+    Builds a check validating one S3 path with an ETLS3Validator.
+    """
+    def check():
+        return s3_validator.validate_s3_path(s3_path, path_type), s3_path
+    return check
+
+
+def transformation_files_check(file_validator):
+    """
+    Builds a check validating that every transformation file exists in GitHub.
+    """
+    def check():
+        missing_files = file_validator.find_missing_files()
+        if missing_files:
+            return False, f'missing in {file_validator.repo_name}: {", ".join(missing_files)}'
+        return True, f'{len(file_validator.files_to_validate)} files found in {file_validator.repo_name}'
+    return check
+
+
+def emr_cluster_check(emr_client, emr_cluster_id):
+    """
+    Builds a check validating that the EMR cluster can accept steps.
+    """
+    def check():
+        try:
+            state = emr_client.describe_cluster(ClusterId=emr_cluster_id)['Cluster']['Status']['State']
+        except (BotoCoreError, ClientError) as e:
+            return False, f'{emr_cluster_id}: {e}'
+        return state in ACTIVE_CLUSTER_STATES, f'{emr_cluster_id} is {state}'
+    return check
+
+
+def aws_credentials_check(sts_client):
+    """
+    Builds a check validating that the AWS credentials are accepted.
+    """
+    def check():
+        try:
+            identity = sts_client.get_caller_identity()
+        except (BotoCoreError, ClientError) as e:
+            return False, str(e)
+        return True, identity['Arn']
+    return check
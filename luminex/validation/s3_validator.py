@@ -1,11 +1,41 @@
+import codecs
 import sys
-import boto3
+
+from botocore.exceptions import ClientError
+
+from aws_clients import get_client
+from .ttl_cache import TTLCache
+
+# Seconds a head_bucket result is reused for, and how many buckets are remembered
+BUCKET_CACHE_TTL = 300
+BUCKET_CACHE_MAXSIZE = 256
+
+# head_bucket error codes that definitively mean the bucket is missing or forbidden; only these
+# failures are cached, transient ones (throttling, connection or expired token errors) are retried
+DEFINITIVE_BUCKET_ERRORS = ('403', '404', 'NoSuchBucket', 'AccessDenied', 'Forbidden', 'NotFound')
+
+# Deep source validation lists one page of this many keys and sniffs this many leading bytes of a sample
+SAMPLE_MAX_KEYS = 100
+SNIFF_BYTES = 4096
+PARQUET_MAGIC = b'PAR1'
+
+# File extensions recognised by the format sniff
+FORMAT_EXTENSIONS = {'.parquet': 'parquet', '.json': 'json', '.jsonl': 'json', '.csv': 'csv'}
+
+# Delimiters a CSV header cut off by the sniff window must contain
+CSV_DELIMITERS = (',', '\t', ';', '|')
 
 class ETLS3Validator:
-    def __init__(self, source_path, destination_bucket):
+    # head_bucket results shared by every validator in the process, keyed by bucket name
+    bucket_cache = TTLCache(maxsize=BUCKET_CACHE_MAXSIZE, ttl=BUCKET_CACHE_TTL)
+
+    def __init__(self, source_path, destination_bucket, deep=False, file_type=None):
         # Extract source and destination bucket names from the provided paths
         self.source_path = source_path
         self.destination_bucket = destination_bucket
+        # Deep validation also samples the source prefix; file_type is inferred from the sample when None
+        self.deep = deep
+        self.file_type = file_type
 
     def validate_input(self):
         # Validate source and destination paths
@@ -27,17 +57,15 @@ class ETLS3Validator:
             print(f"{path_type} path is missing the bucket name.")
             return False
 
-        s3 = boto3.client('s3', verify=False)
-
-        try:
-            # Check if the specified S3 bucket exists
-            s3.head_bucket(Bucket=bucket)
-        except Exception as e:
-            print(f"{path_type} bucket not found: {e}")
+        bucket_error = self.check_bucket(bucket)
+        if bucket_error is not None:
+            print(f"{path_type} bucket not found: {bucket_error}")
             return False
 
         if path_type == "Source":
             # For source path, key is not mandatory
+            if self.deep:
+                return self.validate_source_objects(bucket, key)
             return True
 
             # Uncomment the following block if you want to check for the existence of the object key
@@ -54,6 +82,163 @@ class ETLS3Validator:
 
         return True
 
+    def check_bucket(self, bucket):
+        """
+        Check that a bucket exists and is accessible, reusing a recent head_bucket result.
+
+        Parameters:
+            - bucket (str): Name of the S3 bucket.
+
+        Returns:
+            - error (str): Why the bucket cannot be used, or None if it is accessible.
+        """
+        cached = self.bucket_cache.get(bucket)
+        if cached is not None:
+            return cached[0]
+
+        s3 = get_client('s3', verify=False)
+        try:
+            # Check if the specified S3 bucket exists
+            s3.head_bucket(Bucket=bucket)
+            error = None
+        except ClientError as e:
+            error = str(e)
+            if e.response.get('Error', {}).get('Code') not in DEFINITIVE_BUCKET_ERRORS:
+                return error
+        except Exception as e:
+            return str(e)
+
+        # Wrapped in a tuple so that an accessible bucket (None) is still a cache hit
+        self.bucket_cache.set(bucket, (error,))
+        return error
+
+    def validate_source_objects(self, bucket, prefix):
+        """
+        Check that a source prefix holds data in the expected format, using one listing page
+        and ranged reads of the first bytes (and for Parquet the footer) of one sample object.
+
+        Parameters:
+            - bucket (str): Name of the S3 bucket.
+            - prefix (str): Key prefix of the source data.
+
+        Returns:
+            - valid (bool): True if the sample object looks like the expected format.
+        """
+        s3 = get_client('s3', verify=False)
+        try:
+            page = s3.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=SAMPLE_MAX_KEYS)
+        except Exception as e:
+            print(f"Source path s3://{bucket}/{prefix} cannot be listed: {e}")
+            return False
+
+        sample = None
+        for item in page.get('Contents', []):
+            file_name = item['Key'].rsplit('/', 1)[-1]
+            # Skip folder markers, empty objects and Hadoop/Spark metadata files such as _SUCCESS
+            if file_name and not file_name.startswith(('_', '.')) and item.get('Size', 0) > 0:
+                sample = item
+                break
+        if sample is None:
+            print(f"Source path s3://{bucket}/{prefix} contains no data objects.")
+            return False
+
+        sample_key, size = sample['Key'], sample['Size']
+        file_type = self.file_type or self.infer_file_type(sample_key)
+        if file_type is None:
+            # Nothing to sniff against, the prefix is at least not empty
+            return True
+
+        try:
+            head = self.read_range(s3, bucket, sample_key, 0, min(size, SNIFF_BYTES) - 1)
+            tail = b''
+            if file_type == 'parquet':
+                tail = head[-len(PARQUET_MAGIC):] if size <= SNIFF_BYTES else \
+                    self.read_range(s3, bucket, sample_key, size - len(PARQUET_MAGIC), size - 1)
+        except Exception as e:
+            print(f"Source object s3://{bucket}/{sample_key} cannot be read: {e}")
+            return False
+
+        error = self.sniff_format(file_type, head, tail, complete=size <= SNIFF_BYTES)
+        if error:
+            print(f"Source object s3://{bucket}/{sample_key} is not valid {file_type}: {error}")
+            return False
+        return True
+
+    @staticmethod
+    def infer_file_type(key):
+        """
+        Map an object key to a file type by its extension, or None if it is not recognised.
+        """
+        for extension, file_type in FORMAT_EXTENSIONS.items():
+            if key.lower().endswith(extension):
+                return file_type
+        return None
+
+    @staticmethod
+    def read_range(s3, bucket, key, start, end):
+        # Inclusive byte range, read with a single ranged GET
+        response = s3.get_object(Bucket=bucket, Key=key, Range=f'bytes={start}-{end}')
+        return response['Body'].read()
+
+    @staticmethod
+    def sniff_format(file_type, head, tail=b'', complete=False):
+        """
+        Check the leading bytes of an object (and for Parquet its last bytes) against a format.
+
+        Parameters:
+            - file_type (str): One of 'parquet', 'json' or 'csv'.
+            - head (bytes): Leading bytes of the object.
+            - tail (bytes): Last bytes of the object, only used for Parquet.
+            - complete (bool): Whether head holds the whole object.
+
+        Returns:
+            - error (str): Why the bytes do not match the format, or None if they do.
+        """
+        if file_type == 'parquet':
+            if not head.startswith(PARQUET_MAGIC) or not tail.endswith(PARQUET_MAGIC):
+                return "missing PAR1 magic bytes in header or footer"
+            return None
+
+        if head.startswith(PARQUET_MAGIC) or b'\x00' in head:
+            return "object is binary"
+        text = head.decode('utf-8-sig', errors='replace').lstrip()
+        if file_type == 'json':
+            if not text.startswith(('{', '[')):
+                return "does not start with a JSON object or array"
+            return None
+        if file_type == 'csv':
+            lines = text.splitlines()
+            if not lines or not lines[0].strip(', \t;|'):
+                return "header line is empty"
+            if '\n' not in text and not complete:
+                # A header wider than the sniff window is cut off; it must still be delimited text,
+                # decoding cleanly up to a character possibly split at the end of the window
+                try:
+                    codecs.getincrementaldecoder('utf-8-sig')().decode(head, final=False)
+                except UnicodeDecodeError:
+                    return "header line is not UTF-8 text"
+                if not any(delimiter in lines[0] for delimiter in CSV_DELIMITERS):
+                    return f"no delimited header line within the first {SNIFF_BYTES} bytes"
+            return None
+        return f"unsupported file type {file_type}"
+
+    @classmethod
+    def invalidate_bucket(cls, bucket=None):
+        """
+        Forget the cached head_bucket result of one bucket, or of every bucket when None.
+        """
+        if bucket is None:
+            cls.bucket_cache.clear()
+        else:
+            cls.bucket_cache.invalidate(bucket)
+
+    @classmethod
+    def bucket_cache_stats(cls):
+        """
+        Return the hit and miss counters of the head_bucket cache.
+        """
+        return cls.bucket_cache.stats()
+
     def extract_bucket_and_key(self, s3_path):
         # Remove "s3://" prefix and split into bucket and key
         s3_path = s3_path.replace("s3://", "")
@@ -1,7 +1,11 @@
 import sys
-import boto3
 import os
 
+# Add the package directory to the Python path, this module also runs as a workflow script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aws_clients import get_client
+
 
 def stack_exists(input_stack_name):
     """
@@ -16,7 +20,7 @@ def stack_exists(input_stack_name):
     Raises:
     - botocore.exceptions.ClientError: If an unexpected error occurs during the AWS API call.
     """
-    cf_client = boto3.client('cloudformation')
+    cf_client = get_client('cloudformation')
 
     try:
         cf_client.describe_stacks(StackName=input_stack_name)
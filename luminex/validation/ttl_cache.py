@@ -0,0 +1,97 @@
+"""
+This module defines the TTLCache class, a thread-safe, size-bounded cache whose
+entries expire after a fixed time to live and are evicted least recently used first.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    TTLCache: Thread-safe mapping with per-entry expiry and LRU eviction.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept.
+        ttl (float): Seconds an entry stays valid after it is set.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that found no valid entry.
+
+    Methods:
+        - get: Return a valid cached value or a default.
+        - set: Store a value, evicting the least recently used entry when full.
+        - invalidate: Drop one entry.
+        - clear: Drop every entry.
+        - stats: Return the hit and miss counters and the current size.
+    """
+
+    def __init__(self, maxsize=128, ttl=300, clock=time.monotonic):
+        """
+        Initialize TTLCache.
+
+        Parameters:
+        - maxsize (int): Maximum number of entries kept.
+        - ttl (float): Seconds an entry stays valid after it is set.
+        - clock (callable): Monotonic time source, injectable for tests.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive number.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value of a key, or default if it is missing or expired.
+        """
+        with self.lock:
+            value, expires_at = self.entries.get(key, (_MISSING, None))
+            if value is not _MISSING and expires_at <= self.clock():
+                del self.entries[key]
+                value = _MISSING
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Stores a value, evicting the least recently used entry when the cache is full.
+        """
+        with self.lock:
+            self.entries[key] = (value, self.clock() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """
+        Drops the entry of a key, if any.
+        """
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        """
+        Drops every entry; the hit and miss counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        Returns the hit and miss counters and the number of entries held.
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+    def __len__(self):
+        return len(self.entries)
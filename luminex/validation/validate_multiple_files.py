@@ -1,14 +1,92 @@
+import json
+import os
+import tempfile
+import threading
+
 import requests
 import sys
-import urllib3
 from urllib.parse import quote
 
-# Suppress only the InsecureRequestWarning from urllib3 needed in this case
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Commit trees kept per repository; older commits are evicted first
+MAX_TREES_PER_REPO = 20
+
+
+class GitTreeCache:
+    """
+    Cache of GitHub lookups for the ETLFileValidator, shared process-wide and optionally
+    persisted as JSON so it also survives across runs.
+
+    It holds the ETag and commit SHA of each branch head, so unchanged branches are answered
+    by a 304 conditional request that does not count against the rate limit, and the blob
+    listing of each commit, which never changes once fetched. Only the max_trees_per_repo
+    most recently fetched commits of each repository are kept.
+    """
+
+    def __init__(self, cache_dir=None, max_trees_per_repo=MAX_TREES_PER_REPO):
+        """
+        Initialize the GitTreeCache.
+
+        Parameters:
+            - cache_dir (str): Directory of the JSON cache file; in-memory only when None.
+            - max_trees_per_repo (int): Commit listings kept per repository.
+        """
+        self.cache_file = os.path.join(os.path.expanduser(cache_dir), 'trees.json') if cache_dir else None
+        self.max_trees_per_repo = max_trees_per_repo
+        self.lock = threading.Lock()
+        self.heads = {}
+        self.trees = {}
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file) as stream:
+                    data = json.load(stream)
+                self.heads = data.get('heads', {})
+                self.trees = data.get('trees', {})
+            except (OSError, ValueError):
+                pass
+
+    def get_head(self, head_key):
+        """
+        Returns the cached (etag, commit sha) of a branch head, or (None, None).
+        """
+        return tuple(self.heads.get(head_key, (None, None)))
+
+    def set_head(self, head_key, etag, commit_sha):
+        with self.lock:
+            self.heads[head_key] = [etag, commit_sha]
+            self._save()
+
+    def get_tree(self, tree_key):
+        """
+        Returns the cached path-to-blob-SHA mapping of a commit, or None.
+        """
+        return self.trees.get(tree_key)
+
+    def set_tree(self, tree_key, blobs):
+        with self.lock:
+            # Trees are kept in insertion order, so the first ones of a repository are its oldest
+            self.trees.pop(tree_key, None)
+            self.trees[tree_key] = blobs
+            repo = tree_key.split('@', 1)[0]
+            repo_keys = [key for key in self.trees if key.split('@', 1)[0] == repo]
+            for key in repo_keys[:-self.max_trees_per_repo]:
+                del self.trees[key]
+            self._save()
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.cache_file))
+        with os.fdopen(file_descriptor, 'w') as stream:
+            json.dump({'heads': self.heads, 'trees': self.trees}, stream)
+        os.replace(temp_path, self.cache_file)
 
 
 class ETLFileValidator:
-    def __init__(self, cfg, pat, transformation_names):
+    # Caches shared by every validator in the process, one per cache directory
+    tree_caches = {}
+
+    def __init__(self, cfg, pat, transformation_names, branch='main'):
         """
         Initialize the ETLFileValidator.
 
@@ -16,10 +94,19 @@ class ETLFileValidator:
             - cfg (dict): Configuration dictionary containing necessary information.
             - pat (str): GitHub personal access token for authentication.
             - transformation_names (list): List of transformation file names.
+            - branch (str): Branch of the transformation repository to validate against.
         """
         self.repo_name = cfg["ETL"]["TRANSFORMATION_FOLDER_PATH"]
+        self.subfolder = cfg["ETL"].get("TRANSFORMATION_SUBFOLDER", "data-source/transformations")
         self.access_token = pat
+        self.branch = branch
         self.files_to_validate = [string + ".py" for string in transformation_names]
+        self.blob_shas = {}
+
+        cache_dir = cfg["ETL"].get("GITHUB_CACHE_DIR")
+        if cache_dir not in self.tree_caches:
+            self.tree_caches[cache_dir] = GitTreeCache(cache_dir)
+        self.tree_cache = self.tree_caches[cache_dir]
 
     def validate_file(self, file_name):
         """
@@ -31,28 +118,98 @@ class ETLFileValidator:
         Returns:
             - response (Response): The response object from the GitHub API request.
         """
-        full_file_name = f'data-source/transformations/{file_name}'
+        full_file_name = f'{self.subfolder}/{file_name}'
         encoded_file_path = quote(full_file_name)
         api_url = f'https://api.github.com/repos/{self.repo_name}/contents/{encoded_file_path}'
         headers = {'Authorization': f'token {self.access_token}'}
-        response = requests.get(api_url, headers=headers, verify=False)
+        response = requests.get(api_url, headers=headers)
 
         return response
 
-    def validate_files(self):
+    def resolve_commit_sha(self):
         """
-        Validate the existence of multiple files within a GitHub repository.
+        Resolve the commit SHA at the head of the branch with a conditional request;
+        an unchanged branch is answered with a 304 that costs no rate-limit quota.
+
+        Returns:
+            - commit_sha (str): The head commit SHA, or None if the branch cannot be resolved.
+        """
+        head_key = f'{self.repo_name}@{self.branch}'
+        etag, commit_sha = self.tree_cache.get_head(head_key)
+        headers = {'Authorization': f'token {self.access_token}', 'Accept': 'application/vnd.github.sha'}
+        if etag:
+            headers['If-None-Match'] = etag
+
+        api_url = f'https://api.github.com/repos/{self.repo_name}/commits/{quote(self.branch)}'
+        response = requests.get(api_url, headers=headers)
+        if response.status_code == 304:
+            return commit_sha
+        if response.status_code != 200:
+            return None
+
+        commit_sha = response.text.strip()
+        self.tree_cache.set_head(head_key, response.headers.get('ETag'), commit_sha)
+        return commit_sha
+
+    def fetch_blob_shas(self, commit_sha):
+        """
+        Fetch the blob SHA of every file under the transformation subfolder with one
+        recursive Git Trees request, or from the cache for an already seen commit.
+
+        Parameters:
+            - commit_sha (str): The commit to list.
+
+        Returns:
+            - blob_shas (dict): File name to blob SHA, or None if the tree could not be listed completely.
+        """
+        tree_key = f'{self.repo_name}@{commit_sha}:{self.subfolder}'
+        blob_shas = self.tree_cache.get_tree(tree_key)
+        if blob_shas is not None:
+            return blob_shas
+
+        api_url = f'https://api.github.com/repos/{self.repo_name}/git/trees/{commit_sha}?recursive=1'
+        headers = {'Authorization': f'token {self.access_token}', 'Accept': 'application/vnd.github.v3+json'}
+        response = requests.get(api_url, headers=headers)
+        if response.status_code != 200:
+            return None
+        tree = response.json()
+        if tree.get('truncated'):
+            return None
+
+        prefix = f'{self.subfolder}/'
+        blob_shas = {item['path'][len(prefix):]: item['sha'] for item in tree.get('tree', [])
+                     if item['type'] == 'blob' and item['path'].startswith(prefix)}
+        self.tree_cache.set_tree(tree_key, blob_shas)
+        return blob_shas
+
+    def find_missing_files(self):
+        """
+        Find the transformation files that do not exist in the GitHub repository, checking
+        all of them against one tree listing. Falls back to one contents request per file
+        when the tree cannot be listed.
 
         Returns:
             - missing_files (list): List of transformation files that do not exist.
         """
-        missing_files = []
+        commit_sha = self.resolve_commit_sha()
+        blob_shas = self.fetch_blob_shas(commit_sha) if commit_sha else None
+
+        if blob_shas is None:
+            return [file_name for file_name in self.files_to_validate
+                    if self.validate_file(file_name).status_code != 200]
 
-        for file_name in self.files_to_validate:
-            response = self.validate_file(file_name)
+        self.blob_shas = {file_name: blob_shas[file_name] for file_name in self.files_to_validate
+                          if file_name in blob_shas}
+        return [file_name for file_name in self.files_to_validate if file_name not in blob_shas]
 
-            if response.status_code != 200:
-                missing_files.append(file_name)
+    def validate_files(self):
+        """
+        Validate the existence of multiple files within a GitHub repository.
+
+        Returns:
+            - missing_files (list): List of transformation files that do not exist.
+        """
+        missing_files = self.find_missing_files()
 
         if not missing_files:
             print(f'All given transformation files exist in Repo {self.repo_name}.')
@@ -61,4 +218,3 @@ class ETLFileValidator:
             sys.exit(1)
 
         return missing_files
-
@@ -60,7 +60,9 @@ setup(
     license='Dish Wireless',
     packages=find_packages(
         include=['luminex',
+                 'luminex.aws_clients',
                  'luminex.data_standardization',
+                 'luminex.emr',
                  'luminex.validation'
                  ]
     ),
@@ -3,8 +3,13 @@ Define fixtures and configuration
 that can be reused throughout pytest without redefinition.
 It also defines the configurations for pytest.
 """
+import hashlib
 import os
+from io import BytesIO
+
 import pytest
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
 
 from luminex import S3DataLoader
 from luminex import S3DataUploader
@@ -73,3 +78,249 @@ def s3_uploader(bucket_name):
     - s3_loader (S3DataLoader): An instance of the S3DataLoader class.
     """
     return S3DataUploader(bucket_name=bucket_name)
+
+def _etag(data):
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+class FakeS3Client:
+    """
+    Minimal in-memory stand-in for a boto3 S3 client, used by offline tests.
+    """
+    def __init__(self, objects=None):
+        self.objects = dict(objects or {})
+        self.calls = []
+        self.bytes_served = 0
+        self.page_size = 1000
+
+    def list_objects_v2(self, Bucket, Prefix='', MaxKeys=1000, ContinuationToken=None, **kwargs):
+        """
+        List stored keys under a prefix, one page at a time.
+        """
+        self.calls.append(('list_objects_v2', Bucket, Prefix, kwargs))
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page_keys = keys[start:start + min(MaxKeys, self.page_size)]
+        page = {'KeyCount': len(page_keys), 'IsTruncated': start + len(page_keys) < len(keys)}
+        if page_keys:
+            page['Contents'] = [{'Key': key, 'Size': len(self.objects[key]), 'ETag': _etag(self.objects[key])}
+                                for key in page_keys]
+        if page['IsTruncated']:
+            page['NextContinuationToken'] = str(start + len(page_keys))
+        return page
+
+    def get_paginator(self, operation_name):
+        """
+        Return a paginator over list_objects_v2.
+        """
+        assert operation_name == 'list_objects_v2'
+        return FakeListObjectsPaginator(self)
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        """
+        Store an object body, failing an If-None-Match put when the key exists and an If-Match put
+        when its ETag differs.
+        """
+        self.calls.append(('put_object', Bucket, Key, kwargs))
+        if_match = kwargs.get('IfMatch')
+        if (kwargs.get('IfNoneMatch') == '*' and Key in self.objects) or \
+                (if_match is not None and (Key not in self.objects or _etag(self.objects[Key]) != if_match)):
+            raise ClientError({'Error': {'Code': 'PreconditionFailed', 'Message': 'At least one of the '
+                                         'pre-conditions you specified did not hold'}}, 'PutObject')
+        self.objects[Key] = Body if isinstance(Body, bytes) else Body.read()
+        return {'ETag': _etag(self.objects[Key])}
+
+    def delete_object(self, Bucket, Key, IfMatch=None):
+        """
+        Delete an object, failing an If-Match delete when the ETag differs.
+        """
+        self.calls.append(('delete_object', Bucket, Key, {'IfMatch': IfMatch}))
+        if IfMatch is not None and (Key not in self.objects or _etag(self.objects[Key]) != IfMatch):
+            raise ClientError({'Error': {'Code': 'PreconditionFailed', 'Message': 'At least one of the '
+                                         'pre-conditions you specified did not hold'}}, 'DeleteObject')
+        self.objects.pop(Key, None)
+        return {}
+
+    def head_object(self, Bucket, Key):
+        """
+        Return the stored object size.
+        """
+        self.calls.append(('head_object', Bucket, Key, {}))
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': '404', 'Message': 'Not Found'}}, 'HeadObject')
+        return {'ContentLength': len(self.objects[Key]), 'ETag': _etag(self.objects[Key])}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        """
+        Return the stored object body wrapped in a botocore StreamingBody.
+        """
+        self.calls.append(('get_object', Bucket, Key, kwargs))
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'The specified key does not exist.'}},
+                              'GetObject')
+        data = self.objects[Key]
+        if kwargs.get('IfMatch') not in (None, _etag(data)):
+            raise ClientError({'Error': {'Code': 'PreconditionFailed', 'Message': 'At least one of the '
+                                         'pre-conditions you specified did not hold'}}, 'GetObject')
+        if 'Range' not in kwargs:
+            self.bytes_served += len(data)
+            return {'Body': StreamingBody(BytesIO(data), len(data)), 'ContentLength': len(data),
+                    'ETag': _etag(data)}
+
+        start, end = kwargs['Range'].replace('bytes=', '').split('-')
+        if not start:
+            start, end = max(len(data) - int(end), 0), len(data) - 1
+        start, end = int(start), min(int(end), len(data) - 1)
+        part = data[start:end + 1]
+        self.bytes_served += len(part)
+        return {
+            'Body': StreamingBody(BytesIO(part), len(part)),
+            'ContentLength': len(part),
+            'ContentRange': f'bytes {start}-{end}/{len(data)}',
+            'ETag': _etag(data),
+        }
+
+class FakeListObjectsPaginator:
+    """
+    Paginator over FakeS3Client.list_objects_v2 following continuation tokens.
+    """
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, **kwargs):
+        """
+        Yield list_objects_v2 pages until the listing is exhausted.
+        """
+        token = None
+        while True:
+            page = self.client.list_objects_v2(ContinuationToken=token, **kwargs)
+            yield page
+            if not page['IsTruncated']:
+                return
+            token = page['NextContinuationToken']
+
+@pytest.fixture
+def fake_s3_client():
+    """
+    Create an empty in-memory S3 client; tests populate `objects` as needed.
+    """
+    return FakeS3Client()
+
+class FakeEMRClient:
+    """
+    In-memory stand-in for a boto3 EMR client. Every list_steps call advances the
+    simulated cluster by one tick: running steps finish, then pending steps start in
+    submission order up to the cluster's step concurrency level.
+    """
+    def __init__(self, step_concurrency_level=1, failing_steps=(), cluster_state='WAITING'):
+        self.step_concurrency_level = step_concurrency_level
+        self.cluster_state = cluster_state
+        self.failing_steps = set(failing_steps)
+        self.steps = {}
+        self.clusters = {}
+        self.calls = []
+
+    def add_cluster(self, cluster_id, state='WAITING', tags=None):
+        """
+        Register a cluster, e.g. one created by a provisioner, with its tags.
+        """
+        self.clusters[cluster_id] = {'state': state, 'tags': dict(tags or {})}
+        return cluster_id
+
+    def list_clusters(self, ClusterStates=None, Marker=None):
+        """
+        List the registered clusters in the given states, one per page.
+        """
+        self.calls.append(('list_clusters', ClusterStates))
+        ids = [cluster_id for cluster_id, cluster in self.clusters.items()
+               if ClusterStates is None or cluster['state'] in ClusterStates]
+        start = int(Marker or 0)
+        page = {'Clusters': [{'Id': cluster_id} for cluster_id in ids[start:start + 1]]}
+        if start + 1 < len(ids):
+            page['Marker'] = str(start + 1)
+        return page
+
+    def add_tags(self, ResourceId, Tags):
+        self.calls.append(('add_tags', ResourceId, Tags))
+        self.clusters[ResourceId]['tags'].update({tag['Key']: tag['Value'] for tag in Tags})
+
+    def remove_tags(self, ResourceId, TagKeys):
+        self.calls.append(('remove_tags', ResourceId, TagKeys))
+        for key in TagKeys:
+            self.clusters[ResourceId]['tags'].pop(key, None)
+
+    def terminate_job_flows(self, JobFlowIds):
+        self.calls.append(('terminate_job_flows', JobFlowIds))
+        for cluster_id in JobFlowIds:
+            self.clusters[cluster_id]['state'] = 'TERMINATING'
+
+    def add_job_flow_steps(self, JobFlowId, Steps):
+        """
+        Queue steps on the cluster and return their generated IDs.
+        """
+        self.calls.append(('add_job_flow_steps', JobFlowId, Steps))
+        step_ids = []
+        for step in Steps:
+            step_id = f's-{len(self.steps) + 1:04d}'
+            self.steps[step_id] = {'Id': step_id, 'Name': step['Name'], 'Config': step,
+                                   'Status': {'State': 'PENDING'}}
+            step_ids.append(step_id)
+        return {'StepIds': step_ids}
+
+    def cancel_steps(self, ClusterId, StepIds, StepCancellationOption='SEND_INTERRUPT'):
+        """
+        Cancel the given steps that have not finished.
+        """
+        self.calls.append(('cancel_steps', ClusterId, list(StepIds)))
+        for step_id in StepIds:
+            if self.steps[step_id]['Status']['State'] in ('PENDING', 'RUNNING'):
+                self.steps[step_id]['Status']['State'] = 'CANCELLED'
+        return {'CancelStepsInfoList': [{'StepId': step_id, 'Status': 'SUBMITTED'} for step_id in StepIds]}
+
+    def describe_cluster(self, ClusterId):
+        """
+        Return the cluster's state, tags and step concurrency level.
+        """
+        self.calls.append(('describe_cluster', ClusterId))
+        cluster = self.clusters.get(ClusterId, {'state': self.cluster_state, 'tags': {}})
+        return {'Cluster': {'Id': ClusterId, 'Status': {'State': cluster['state']},
+                            'StepConcurrencyLevel': self.step_concurrency_level,
+                            'Tags': [{'Key': key, 'Value': value} for key, value in cluster['tags'].items()]}}
+
+    def _tick(self):
+        for step in self.steps.values():
+            if step['Status']['State'] != 'RUNNING':
+                continue
+            if step['Name'] in self.failing_steps:
+                step['Status']['State'] = 'FAILED'
+                if step['Config']['ActionOnFailure'] in ('CANCEL_AND_WAIT', 'TERMINATE_CLUSTER'):
+                    for other in self.steps.values():
+                        if other['Status']['State'] == 'PENDING':
+                            other['Status']['State'] = 'CANCELLED'
+            else:
+                step['Status']['State'] = 'COMPLETED'
+        running = sum(step['Status']['State'] == 'RUNNING' for step in self.steps.values())
+        for step in self.steps.values():
+            if running >= self.step_concurrency_level:
+                break
+            if step['Status']['State'] == 'PENDING':
+                step['Status']['State'] = 'RUNNING'
+                running += 1
+
+    def list_steps(self, ClusterId, StepIds=None, Marker=None):
+        """
+        Advance the simulation one tick and return the requested steps.
+        """
+        self.calls.append(('list_steps', ClusterId, list(StepIds or [])))
+        assert StepIds is None or len(StepIds) <= 10
+        self._tick()
+        steps = [step for step_id, step in self.steps.items() if StepIds is None or step_id in StepIds]
+        return {'Steps': [{'Id': step['Id'], 'Name': step['Name'], 'Status': dict(step['Status'])}
+                          for step in steps]}
+
+@pytest.fixture
+def fake_emr_client():
+    """
+    Create an in-memory EMR client running one step at a time.
+    """
+    return FakeEMRClient()
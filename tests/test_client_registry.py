@@ -0,0 +1,34 @@
+"""
+Test module for the shared boto3 client registry.
+"""
+from aws_clients import clear_clients, get_client
+
+
+def test_get_client_reuses_client_per_service_and_region():
+    """
+    Tests get_client returns one shared client per service, region and credentials.
+
+    Expected Outcome:
+    - Passes if repeated lookups share a client and a different region gets its own.
+    """
+    clear_clients()
+    s3_client = get_client('s3', region_name='us-east-1')
+
+    assert get_client('s3', region_name='us-east-1') is s3_client
+    assert get_client('s3', region_name='us-west-2') is not s3_client
+    assert get_client('emr', region_name='us-east-1') is not s3_client
+    assert s3_client.meta.config.max_pool_connections == 50
+
+
+def test_clear_clients_drops_cached_clients():
+    """
+    Tests clear_clients forces new clients to be built.
+
+    Expected Outcome:
+    - Passes if lookups after clear_clients return new instances.
+    """
+    s3_client = get_client('s3', region_name='us-east-1')
+
+    clear_clients()
+
+    assert get_client('s3', region_name='us-east-1') is not s3_client
@@ -0,0 +1,232 @@
+"""
+Test module for the ClusterPool class.
+"""
+import json
+import time
+
+import pytest
+
+from emr import ClusterPool
+from emr.cluster_pool import IDLE_SINCE_TAG, POOL_TAG, TEAM_TAG
+
+POOL_TAGS = {TEAM_TAG: 'analytics', POOL_TAG: 'default'}
+LEASE_PREFIX = 'luminex/cluster-pool/analytics/default'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _pool(emr_client, s3_client, clock, **kwargs):
+    return ClusterPool(emr_client, s3_client, 'leases', 'analytics', clock=clock, **kwargs)
+
+
+def _hold_lease(s3_client, cluster_id, leased_at=0):
+    s3_client.objects[f'{LEASE_PREFIX}/{cluster_id}'] = json.dumps({'lease_id': 'someone',
+                                                                    'leased_at': leased_at}).encode('utf-8')
+
+
+def test_lease_takes_idle_pool_cluster_and_release_returns_it(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests a lease only takes idle clusters of the team's pool and release makes it idle again.
+
+    Expected Outcome:
+    - Passes if the idle cluster is leased, a second lease finds nothing, and release frees it.
+    """
+    fake_emr_client.add_cluster('j-OTHER', tags={TEAM_TAG: 'billing', POOL_TAG: 'default'})
+    fake_emr_client.add_cluster('j-BUSY', tags=POOL_TAGS)
+    _hold_lease(fake_s3_client, 'j-BUSY')
+    fake_emr_client.add_cluster('j-IDLE', tags=POOL_TAGS)
+    pool = _pool(fake_emr_client, fake_s3_client, clock)
+
+    lease = pool.lease()
+
+    assert lease.cluster_id == 'j-IDLE'
+    assert pool.lease() is None
+    assert pool.release(lease)
+    assert f'{LEASE_PREFIX}/j-IDLE' not in fake_s3_client.objects
+    assert fake_emr_client.clusters['j-IDLE']['tags'][IDLE_SINCE_TAG] == '1000.0'
+
+
+def test_lease_provisions_when_pool_is_empty(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests an empty pool provisions a cluster through the injected provisioner.
+
+    Expected Outcome:
+    - Passes if the provisioned cluster is tagged into the pool and leased.
+    """
+    def provisioner(team_name, pool_config):
+        return fake_emr_client.add_cluster(f'j-{team_name}-{pool_config}')
+
+    lease = _pool(fake_emr_client, fake_s3_client, clock, provisioner=provisioner).lease()
+
+    assert lease.cluster_id == 'j-analytics-default'
+    assert fake_emr_client.clusters[lease.cluster_id]['tags'][TEAM_TAG] == 'analytics'
+
+
+def test_concurrent_lease_of_the_same_cluster_fails(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests two pools that both see a cluster as idle cannot both lease it.
+
+    Expected Outcome:
+    - Passes if the conditional put of the second lease fails and it reports no cluster, and a stale
+      release does not free the cluster.
+    """
+    fake_emr_client.add_cluster('j-IDLE', tags=POOL_TAGS)
+    first, second = _pool(fake_emr_client, fake_s3_client, clock), _pool(fake_emr_client, fake_s3_client, clock)
+    assert [cluster['id'] for cluster in second.idle_clusters()] == ['j-IDLE']
+
+    lease = first.lease()
+
+    assert lease.cluster_id == 'j-IDLE'
+    assert second.lease() is None
+    assert not second.release(lease._replace(lease_id='stale'))
+    assert f'{LEASE_PREFIX}/j-IDLE' in fake_s3_client.objects
+
+
+def test_lease_provisions_outside_any_lock(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests a slow provisioner does not block another pool from leasing an idle cluster.
+
+    Expected Outcome:
+    - Passes if a lease taken while the provisioner runs gets the idle cluster.
+    """
+    fake_emr_client.add_cluster('j-BUSY', tags=POOL_TAGS)
+    _hold_lease(fake_s3_client, 'j-BUSY')
+    other = _pool(fake_emr_client, fake_s3_client, clock)
+    leased_meanwhile = []
+
+    def provisioner(team_name, pool_config):
+        fake_emr_client.add_cluster('j-RETURNED', tags=POOL_TAGS)
+        leased_meanwhile.append(other.lease())
+        return fake_emr_client.add_cluster('j-NEW')
+
+    lease = _pool(fake_emr_client, fake_s3_client, clock, provisioner=provisioner).lease()
+
+    assert lease.cluster_id == 'j-NEW'
+    assert leased_meanwhile[0].cluster_id == 'j-RETURNED'
+
+
+def test_reap_returns_abandoned_leases_and_scales_down_idle_clusters(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests reap frees expired leases and terminates clusters idle past the TTL beyond the warm size.
+
+    Expected Outcome:
+    - Passes if the abandoned lease is returned and kept warm while the expired idle clusters are terminated.
+    """
+    fake_emr_client.add_cluster('j-OLD', tags={**POOL_TAGS, IDLE_SINCE_TAG: '0'})
+    fake_emr_client.add_cluster('j-RECENT', tags={**POOL_TAGS, IDLE_SINCE_TAG: '10'})
+    fake_emr_client.add_cluster('j-STUCK', tags=POOL_TAGS)
+    _hold_lease(fake_s3_client, 'j-STUCK', leased_at=0)
+    _hold_lease(fake_s3_client, 'j-GONE', leased_at=9000)
+    clock.now = 10000.0
+
+    terminated = _pool(fake_emr_client, fake_s3_client, clock, size=1, idle_ttl=3600, lease_ttl=3600).reap()
+
+    assert terminated == ['j-RECENT', 'j-OLD']
+    assert fake_emr_client.clusters['j-STUCK']['state'] == 'WAITING'
+    assert fake_emr_client.clusters['j-STUCK']['tags'][IDLE_SINCE_TAG] == '10000.0'
+    assert not [key for key in fake_s3_client.objects if key.startswith(LEASE_PREFIX)]
+
+
+def test_maintain_reaps_then_keeps_the_pool_warm(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests maintain terminates expired idle clusters beyond the warm size and provisions back up to it.
+
+    Expected Outcome:
+    - Passes if the expired idle cluster is terminated while one cluster stays idle, and a cluster is
+      provisioned once no cluster is idle.
+    """
+    fake_emr_client.add_cluster('j-LEASED', tags={**POOL_TAGS, IDLE_SINCE_TAG: '0'})
+    _hold_lease(fake_s3_client, 'j-LEASED', leased_at=9000)
+    fake_emr_client.add_cluster('j-OLD', tags={**POOL_TAGS, IDLE_SINCE_TAG: '0'})
+    fake_emr_client.add_cluster('j-RECENT', tags={**POOL_TAGS, IDLE_SINCE_TAG: '9000'})
+    clock.now = 10000.0
+    pool = _pool(fake_emr_client, fake_s3_client, clock, size=1, idle_ttl=3600,
+                 provisioner=lambda team_name, pool_config: fake_emr_client.add_cluster('j-NEW'))
+
+    assert pool.maintain() == (['j-OLD'], [])
+
+    fake_emr_client.clusters['j-RECENT']['state'] = 'TERMINATED'
+
+    assert pool.maintain() == ([], ['j-NEW'])
+    assert fake_emr_client.clusters['j-NEW']['tags'][POOL_TAG] == 'default'
+
+
+def test_renewed_lease_outlives_lease_ttl(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests a renewed lease is not reclaimed by another process once lease_ttl has passed since it was taken.
+
+    Expected Outcome:
+    - Passes if after renewal a reap and a lease from another pool leave the cluster with its holder,
+      and a lease that was taken over cannot be renewed.
+    """
+    fake_emr_client.add_cluster('j-BUSY', tags=POOL_TAGS)
+    pool = _pool(fake_emr_client, fake_s3_client, clock, lease_ttl=3600)
+    other = _pool(fake_emr_client, fake_s3_client, clock, lease_ttl=3600)
+    lease = pool.lease()
+
+    clock.now += 3000
+    assert pool.renew(lease)
+    clock.now += 3000
+    other.reap()
+
+    assert other.lease() is None
+    assert pool.release(lease)
+    assert not pool.renew(lease)
+
+
+def test_keep_alive_renews_the_lease_in_the_background(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests keep_alive renews the lease while the block runs and stops when it exits.
+
+    Expected Outcome:
+    - Passes if the lease object is rewritten with the current time during the block.
+    """
+    fake_emr_client.add_cluster('j-BUSY', tags=POOL_TAGS)
+    pool = _pool(fake_emr_client, fake_s3_client, clock)
+    lease = pool.lease()
+    clock.now = 5000.0
+
+    def leased_at():
+        return json.loads(fake_s3_client.objects[f'{LEASE_PREFIX}/j-BUSY'])['leased_at']
+
+    with pool.keep_alive(lease, interval=0.01):
+        deadline = time.monotonic() + 5
+        while leased_at() != 5000.0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert leased_at() == 5000.0
+
+
+def test_release_tags_idle_before_dropping_the_lease(fake_emr_client, fake_s3_client, clock):
+    """
+    Tests release writes the idle-since tag while the lease is still held.
+
+    Expected Outcome:
+    - Passes if the lease object still exists when the tag is written, and is gone afterwards.
+    """
+    fake_emr_client.add_cluster('j-IDLE', tags=POOL_TAGS)
+    pool = _pool(fake_emr_client, fake_s3_client, clock)
+    lease = pool.lease()
+    add_tags = fake_emr_client.add_tags
+    held_when_tagged = []
+
+    def recording_add_tags(ResourceId, Tags):
+        held_when_tagged.append(f'{LEASE_PREFIX}/{ResourceId}' in fake_s3_client.objects)
+        return add_tags(ResourceId=ResourceId, Tags=Tags)
+
+    fake_emr_client.add_tags = recording_add_tags
+
+    assert pool.release(lease)
+    assert held_when_tagged == [True]
+    assert f'{LEASE_PREFIX}/j-IDLE' not in fake_s3_client.objects
@@ -0,0 +1,82 @@
+"""
+Test module for the TransformationDAG and DAGStepScheduler classes.
+"""
+import pytest
+
+from emr import DAGStepScheduler, EMRStepTracker, TransformationDAG
+
+DIAMOND = {
+    'clean': {},
+    'enrich': {'inputs': ['clean']},
+    'aggregate': {'inputs': ['clean']},
+    'join': {'inputs': ['enrich', 'aggregate']},
+}
+
+
+def _scheduler(emr_client, dag):
+    def build_step(name):
+        return {'Name': name, 'ActionOnFailure': 'CONTINUE', 'HadoopJarStep': {'Jar': 'command-runner.jar'}}
+    tracker = EMRStepTracker(emr_client, 'j-TEST', sleep=lambda seconds: None)
+    return DAGStepScheduler(emr_client, 'j-TEST', dag, build_step,
+                            max_concurrent_steps=emr_client.step_concurrency_level, tracker=tracker)
+
+
+def test_resolve_paths_chains_outputs_into_inputs():
+    """
+    Tests resolve_paths feeds upstream outputs into downstream inputs.
+
+    Expected Outcome:
+    - Passes if roots read the source, joins read every upstream output and only sinks
+      get the final output location.
+    """
+    dag = TransformationDAG(DIAMOND)
+
+    paths = dag.resolve_paths('s3://source/', lambda name, is_sink: f"s3://{'final' if is_sink else 'temp'}/{name}/")
+
+    assert paths['clean'] == (['s3://source/'], 's3://temp/clean/')
+    assert paths['join'] == (['s3://temp/enrich/', 's3://temp/aggregate/'], 's3://final/join/')
+
+
+def test_dag_rejects_cycles_and_unknown_inputs():
+    """
+    Tests TransformationDAG validation.
+
+    Expected Outcome:
+    - Passes if cycles and unknown inputs raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        TransformationDAG({'a': {'inputs': ['b']}, 'b': {'inputs': ['a']}})
+    with pytest.raises(ValueError):
+        TransformationDAG({'a': {'inputs': ['missing']}})
+
+
+def test_scheduler_submits_independent_branches_together(fake_emr_client):
+    """
+    Tests independent branches are submitted in the same request and run concurrently.
+
+    Expected Outcome:
+    - Passes if both branches go out together once 'clean' completes and 'join' runs last.
+    """
+    fake_emr_client.step_concurrency_level = 2
+
+    states = _scheduler(fake_emr_client, TransformationDAG(DIAMOND)).run()
+
+    submissions = [[step['Name'] for step in call[2]] for call in fake_emr_client.calls
+                   if call[0] == 'add_job_flow_steps']
+    assert submissions == [['clean'], ['enrich', 'aggregate'], ['join']]
+    assert set(states.values()) == {'COMPLETED'}
+
+
+def test_scheduler_skips_downstream_of_failed_branch(fake_emr_client):
+    """
+    Tests a failed transformation skips its downstream but not independent branches.
+
+    Expected Outcome:
+    - Passes if the sibling branch completes and the join is skipped.
+    """
+    fake_emr_client.step_concurrency_level = 2
+    fake_emr_client.failing_steps.add('enrich')
+
+    states = _scheduler(fake_emr_client, TransformationDAG(DIAMOND)).run()
+
+    assert states == {'clean': 'COMPLETED', 'enrich': 'FAILED', 'aggregate': 'COMPLETED', 'join': 'SKIPPED'}
@@ -0,0 +1,76 @@
+"""
+Test module for the EMRStepTracker class.
+"""
+from emr import EMRStepTracker
+
+
+def _submit(emr_client, names):
+    steps = [{'Name': name, 'ActionOnFailure': 'CONTINUE', 'HadoopJarStep': {'Jar': 'command-runner.jar'}}
+             for name in names]
+    return emr_client.add_job_flow_steps(JobFlowId='j-TEST', Steps=steps)['StepIds']
+
+
+def test_wait_reports_each_step_when_it_finishes(fake_emr_client):
+    """
+    Tests wait tracks several steps with one batched list_steps call per tick.
+
+    Expected Outcome:
+    - Passes if every step is reported once, in completion order, without sleeping
+      after the last step finishes.
+    """
+    step_ids = _submit(fake_emr_client, ['first', 'second', 'third'])
+    sleeps = []
+    done = []
+    tracker = EMRStepTracker(fake_emr_client, 'j-TEST', sleep=sleeps.append)
+    tracker.watch(step_ids)
+
+    states = tracker.wait(on_step_done=lambda step_id, state: done.append(step_id))
+
+    assert states == {step_id: 'COMPLETED' for step_id in step_ids}
+    assert done == step_ids
+    list_calls = [call for call in fake_emr_client.calls if call[0] == 'list_steps']
+    assert len(list_calls) == 4
+    assert len(sleeps) == 3
+
+
+def test_poll_batches_step_ids(fake_emr_client):
+    """
+    Tests poll splits more than ten steps into list_steps batches.
+
+    Expected Outcome:
+    - Passes if each request carries at most ten IDs.
+    """
+    step_ids = _submit(fake_emr_client, [f'step-{i}' for i in range(12)])
+    tracker = EMRStepTracker(fake_emr_client, 'j-TEST')
+    tracker.watch(step_ids)
+
+    tracker.poll()
+
+    list_calls = [call for call in fake_emr_client.calls if call[0] == 'list_steps']
+    assert [len(call[2]) for call in list_calls] == [10, 2]
+
+
+def test_wait_backs_off_while_nothing_changes(fake_emr_client):
+    """
+    Tests the polling interval grows while steps do not change state.
+
+    Expected Outcome:
+    - Passes if sleeps grow by the backoff factor and stop at the maximum interval.
+    """
+    sleeps = []
+    tracker = EMRStepTracker(fake_emr_client, 'j-TEST', min_interval=1, max_interval=4, backoff=2, jitter=0,
+                             sleep=sleeps.append)
+    tracker.watch(['s-0001'])
+    ticks = iter([{}, {}, {}, {}])
+
+    def poll():
+        changes = next(ticks, None)
+        if changes is None:
+            tracker.states['s-0001'] = 'COMPLETED'
+            return {'s-0001': 'COMPLETED'}
+        return changes
+
+    tracker.poll = poll
+    tracker.wait()
+
+    assert sleeps == [2, 4, 4, 4]
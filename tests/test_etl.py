@@ -0,0 +1,146 @@
+"""
+Test module for the script staging and EMR step submission functions of the etl module.
+"""
+import pytest
+
+import etl
+from script_cache import TransformationScriptCache, git_blob_sha
+
+
+def _pipeline_steps(names):
+    return [{'step_name': name,
+             'script_s3_path': f's3://scripts/{name}.py',
+             's3_input_path': f's3://data/{name}_input/',
+             's3_output_path': f's3://data/{name}_output/'} for name in names]
+
+
+@pytest.fixture
+def pipeline_emr_client(fake_emr_client, monkeypatch):
+    """
+    Route the etl module's EMR client lookups to the in-memory EMR client.
+    """
+    monkeypatch.setattr(etl, 'get_client', lambda *args, **kwargs: fake_emr_client)
+    monkeypatch.setattr('emr.step_tracker.time.sleep', lambda seconds: None)
+    return fake_emr_client
+
+
+def test_submit_spark_pipeline_submits_chain_in_one_request(pipeline_emr_client):
+    """
+    Tests submit_spark_pipeline sends every step in a single add_job_flow_steps call.
+
+    Expected Outcome:
+    - Passes if one request carries all steps with CONTINUE and all complete.
+    """
+    results = etl.submit_spark_pipeline('key', 'secret', 'token', 'us-east-1', 'j-TEST',
+                                        _pipeline_steps(['clean', 'enrich', 'aggregate']))
+
+    submissions = [call for call in pipeline_emr_client.calls if call[0] == 'add_job_flow_steps']
+    assert len(submissions) == 1
+    assert [step['ActionOnFailure'] for step in submissions[0][2]] == ['CONTINUE'] * 3
+    assert [result['Status'] for result in results] == ['COMPLETED'] * 3
+
+
+def test_submit_spark_pipeline_cancels_steps_after_failure(pipeline_emr_client):
+    """
+    Tests a failing step stops the rest of the chain without touching other submitters' steps.
+
+    Expected Outcome:
+    - Passes if the steps after the failed one are cancelled instead of run, and a step queued on the
+      shared cluster by another submitter is left to run.
+    """
+    pipeline_emr_client.failing_steps.add('enrich')
+    add_job_flow_steps = pipeline_emr_client.add_job_flow_steps
+
+    def add_with_other_submitter(JobFlowId, Steps):
+        response = add_job_flow_steps(JobFlowId=JobFlowId, Steps=Steps)
+        add_job_flow_steps(JobFlowId=JobFlowId, Steps=[etl.build_spark_step('other', 's3://x.py', 's3://in/',
+                                                                            's3://out/')])
+        return response
+
+    pipeline_emr_client.add_job_flow_steps = add_with_other_submitter
+
+    results = etl.submit_spark_pipeline('key', 'secret', 'token', 'us-east-1', 'j-TEST',
+                                        _pipeline_steps(['clean', 'enrich', 'aggregate']))
+
+    assert [result['Status'] for result in results] == ['COMPLETED', 'FAILED', 'CANCELLED']
+    cancels = [call[2] for call in pipeline_emr_client.calls if call[0] == 'cancel_steps']
+    assert cancels == [[results[2]['StepId']]]
+    assert pipeline_emr_client.steps['s-0004']['Status']['State'] != 'CANCELLED'
+
+
+@pytest.fixture
+def github_scripts(monkeypatch):
+    """
+    Serve transformation scripts from memory instead of GitHub, counting blob downloads.
+    """
+    scripts = {'clean': b'print("clean")', 'enrich': b'print("enrich")'}
+    blobs = {git_blob_sha(content): content for content in scripts.values()}
+    downloads = []
+
+    def fetch_blob(session, repo_url, sha):
+        downloads.append(sha)
+        return blobs[sha]
+
+    monkeypatch.setattr(etl, 'list_transformation_blob_shas',
+                        lambda session, repo_url, subfolder: {f'{name}.py': git_blob_sha(content)
+                                                              for name, content in scripts.items()})
+    monkeypatch.setattr(etl, 'fetch_transformation_blob', fetch_blob)
+    return scripts, downloads
+
+
+def test_stage_transformation_scripts_uploads_by_blob_sha(fake_s3_client, github_scripts, tmp_path):
+    """
+    Tests stage_transformation_scripts uploads every script under its blob SHA
+    and a repeat run transfers nothing.
+
+    Expected Outcome:
+    - Passes if the first run uploads both scripts and the second run neither downloads nor uploads.
+    """
+    scripts, downloads = github_scripts
+    cache = TransformationScriptCache(str(tmp_path))
+
+    script_paths = etl.stage_transformation_scripts('org/repo', 'token', 'transformations', ['clean', 'enrich'],
+                                                    fake_s3_client, 'temp-bucket', script_cache=cache)
+
+    enrich_sha = git_blob_sha(scripts['enrich'])
+    assert script_paths['enrich'] == f's3://temp-bucket/scripts/transformation/{enrich_sha}/enrich.py'
+    assert fake_s3_client.objects[f'scripts/transformation/{enrich_sha}/enrich.py'] == scripts['enrich']
+    assert len(downloads) == 2
+
+    fake_s3_client.calls.clear()
+    repeat_paths = etl.stage_transformation_scripts('org/repo', 'token', 'transformations', ['clean', 'enrich'],
+                                                    fake_s3_client, 'temp-bucket', script_cache=cache)
+
+    assert repeat_paths == script_paths
+    assert len(downloads) == 2
+    assert not [call for call in fake_s3_client.calls if call[0] == 'put_object']
+
+
+def test_stage_transformation_scripts_uploads_from_local_cache(fake_s3_client, github_scripts, tmp_path):
+    """
+    Tests scripts found in the local cache are uploaded without being downloaded.
+
+    Expected Outcome:
+    - Passes if the script is staged and GitHub is not asked for its contents.
+    """
+    scripts, downloads = github_scripts
+    cache = TransformationScriptCache(str(tmp_path))
+    cache.put(git_blob_sha(scripts['clean']), scripts['clean'])
+
+    etl.stage_transformation_scripts('org/repo', 'token', 'transformations', ['clean'],
+                                     fake_s3_client, 'temp-bucket', script_cache=cache)
+
+    assert not downloads
+    assert scripts['clean'] in fake_s3_client.objects.values()
+
+
+def test_stage_transformation_scripts_reports_missing_scripts(fake_s3_client, github_scripts):
+    """
+    Tests stage_transformation_scripts fails when a script does not exist.
+
+    Expected Outcome:
+    - Passes if FileNotFoundError names the missing script.
+    """
+    with pytest.raises(FileNotFoundError, match='missing'):
+        etl.stage_transformation_scripts('org/repo', 'token', 'transformations', ['clean', 'missing'],
+                                         fake_s3_client, 'temp-bucket')
@@ -0,0 +1,257 @@
+"""
+Test module for the GitHub workflow helpers in infra_setup.
+"""
+import io
+import os
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import infra_setup
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, text='', content=b''):
+        self.status_code = status_code
+        self.body = body
+        self.text = text
+        self.content = content
+
+    def json(self):
+        return self.body
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class FakeWorkflowRuns:
+    """
+    Serves a runs list that gains our dispatched run after a few polls, next to a concurrent run.
+    """
+    def __init__(self, appears_after=2):
+        self.appears_after = appears_after
+        self.requests = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        assert 'verify' not in kwargs
+        self.requests.append((url, params))
+        runs = [{'id': 1, 'display_title': 'Deploy EMR Cluster other-dispatch'}]
+        if len(self.requests) > self.appears_after:
+            runs.insert(0, {'id': 2, 'display_title': 'Deploy EMR Cluster our-dispatch'})
+        return FakeResponse(200, {'workflow_runs': runs})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(infra_setup.time, 'sleep', recorded.append)
+    return recorded
+
+
+def test_find_workflow_run_matches_dispatch_id_with_backoff(monkeypatch, sleeps):
+    """
+    Tests the dispatched run is matched by its ID among concurrent runs, polling with backoff.
+
+    Expected Outcome:
+    - Passes if run 2 is returned, runs are filtered by creation time and the waits double.
+    """
+    github = FakeWorkflowRuns(appears_after=2)
+    monkeypatch.setattr(infra_setup.requests, 'get', github.get)
+    created_after = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+    run_id = infra_setup.find_workflow_run('org', 'repo', 'create-emr-cft.yml', 'token', 'our-dispatch', created_after)
+
+    assert run_id == 2
+    assert sleeps == [1, 2]
+    assert github.requests[0][1]['created'] == '>=2024-05-01T12:00:00Z'
+
+
+def test_find_workflow_run_gives_up_after_timeout(monkeypatch, sleeps):
+    """
+    Tests find_workflow_run returns None when the run never appears.
+
+    Expected Outcome:
+    - Passes if None is returned without sleeping past the timeout.
+    """
+    monkeypatch.setattr(infra_setup.requests, 'get', FakeWorkflowRuns(appears_after=10 ** 6).get)
+    clock = iter(range(0, 10 ** 6, 5))
+    monkeypatch.setattr(infra_setup.time, 'monotonic', lambda: next(clock))
+
+    assert infra_setup.find_workflow_run('org', 'repo', 'wf.yml', 'token', 'our-dispatch',
+                                         datetime.now(timezone.utc), timeout=30) is None
+    assert sum(sleeps) <= 30
+
+
+def test_wait_for_workflow_run_returns_completed_details(monkeypatch, sleeps):
+    """
+    Tests wait_for_workflow_run polls until the run is completed.
+
+    Expected Outcome:
+    - Passes if the completed details are returned after two waits.
+    """
+    statuses = iter(['queued', 'in_progress', 'completed'])
+    monkeypatch.setattr(infra_setup, 'get_workflow_run_details',
+                        lambda *args: {'status': next(statuses), 'conclusion': 'success'})
+
+    details = infra_setup.wait_for_workflow_run('org', 'repo', 2, 'token')
+
+    assert details['status'] == 'completed'
+    assert sleeps == [1, 2]
+
+
+def _log_archive():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        zip_file.writestr('1_deployment.txt', 'whole job log')
+        zip_file.writestr('deployment/1_Checkout.txt', 'checked out\n')
+        zip_file.writestr('deployment/5_Validate Stack.txt',
+                          ''.join(f'line {index}\n' for index in range(100)) + 'ERROR stack exists\n')
+    return buffer.getvalue()
+
+
+def test_get_workflow_run_logs_reads_failed_steps_in_memory(monkeypatch, tmp_path):
+    """
+    Tests only the failed step's log is read, tailed and grepped, without touching the working directory.
+
+    Expected Outcome:
+    - Passes if the tail and grep results come from the failed step only and no files are created.
+    """
+    archive = _log_archive()
+    requests_seen = []
+
+    def fake_get(url, headers=None, stream=False, **kwargs):
+        assert 'verify' not in kwargs
+        requests_seen.append(stream)
+        return FakeResponse(200, content=archive)
+
+    monkeypatch.setattr(infra_setup.requests, 'get', fake_get)
+    monkeypatch.chdir(tmp_path)
+    failed_steps = {'deployment': ['Validate Stack']}
+
+    tail = infra_setup.get_workflow_run_logs('org', 'repo', 2, 'token', failed_steps, tail=2)
+    errors = infra_setup.get_workflow_run_logs('org', 'repo', 2, 'token', failed_steps, tail=None, pattern='ERROR')
+
+    assert tail == {'deployment/Validate Stack': ['line 99', 'ERROR stack exists']}
+    assert errors == {'deployment/Validate Stack': ['ERROR stack exists']}
+    assert requests_seen == [True, True]
+    assert os.listdir(tmp_path) == []
+
+
+def test_create_github_secrets_shares_one_key_and_session(monkeypatch):
+    """
+    Tests all secrets are sealed with one cached box and uploaded over the pooled session.
+
+    Expected Outcome:
+    - Passes if every secret decrypts with the private key and the sealed box is built once.
+    """
+    from nacl import encoding, public
+
+    private_key = public.PrivateKey.generate()
+    key = private_key.public_key.encode(encoding.Base64Encoder()).decode('utf-8')
+    uploads = {}
+
+    class FakeSession:
+        def put(self, url, json=None, headers=None, **kwargs):
+            assert 'verify' not in kwargs
+            uploads[url.rsplit('/', 1)[-1]] = json
+            return FakeResponse(201)
+
+    monkeypatch.setattr(infra_setup, 'get_github_session', lambda: FakeSession())
+    infra_setup._sealed_box.cache_clear()
+    secrets = {'AWS_ACCESS_KEY_ID': 'id', 'AWS_SECRET_ACCESS_KEY': 'secret', 'AWS_SESSION_TOKEN': 'token'}
+
+    statuses = infra_setup.create_github_secrets('key-1', key, 'org', 'repo', 'pat', secrets)
+
+    assert statuses == {name: 201 for name in secrets}
+    unseal = public.SealedBox(private_key)
+    for name, value in secrets.items():
+        assert uploads[name]['key_id'] == 'key-1'
+        assert unseal.decrypt(uploads[name]['encrypted_value'], encoding.Base64Encoder()).decode() == value
+    assert infra_setup._sealed_box.cache_info().misses == 1
+
+
+def test_github_session_verifies_tls(monkeypatch):
+    """
+    Tests the pooled GitHub session, which carries the PAT and the sealed secrets, verifies certificates.
+
+    Expected Outcome:
+    - Passes if the shared session keeps TLS verification on.
+    """
+    monkeypatch.setattr(infra_setup, '_github_session', None)
+
+    assert infra_setup.get_github_session().verify is True
+
+
+class FakeCloudFormation:
+    """
+    Serves the stack events of an existing stack, newest first: an earlier deployment's history
+    followed by the update started by our dispatch.
+    """
+    def __init__(self, dispatched_at):
+        def event(number, logical_id, status, resource_type, seconds):
+            return {'EventId': f'event-{number}', 'LogicalResourceId': logical_id, 'ResourceType': resource_type,
+                    'ResourceStatus': status, 'Timestamp': dispatched_at + timedelta(seconds=seconds)}
+        self.events = [
+            event(1, 'luminex', 'CREATE_IN_PROGRESS', 'AWS::CloudFormation::Stack', -7200),
+            event(2, 'Cluster', 'CREATE_COMPLETE', 'AWS::EMR::Cluster', -7100),
+            event(3, 'luminex', 'CREATE_COMPLETE', 'AWS::CloudFormation::Stack', -7000),
+            event(4, 'luminex', 'UPDATE_IN_PROGRESS', 'AWS::CloudFormation::Stack', 30),
+            event(5, 'luminex', 'UPDATE_COMPLETE', 'AWS::CloudFormation::Stack', 90),
+        ]
+
+    def describe_stack_events(self, StackName, NextToken=None):
+        return {'StackEvents': list(reversed(self.events))}
+
+
+def test_fetch_stack_status_skips_events_before_dispatch(monkeypatch, capsys):
+    """
+    Tests only the events of the dispatched deployment are printed for an existing stack.
+
+    Expected Outcome:
+    - Passes if the update succeeds and none of the earlier deployment's events are printed.
+    """
+    dispatched_at = datetime.now(timezone.utc)
+    monkeypatch.setattr(infra_setup, 'get_client', lambda *args, **kwargs: FakeCloudFormation(dispatched_at))
+
+    assert infra_setup.fetch_stack_status_with_retry('luminex', 'us-east-1', 'key', 'secret', 'token',
+                                                     since=dispatched_at) is True
+
+    printed = capsys.readouterr().out
+    assert 'UPDATE_IN_PROGRESS' in printed
+    assert 'CREATE_IN_PROGRESS' not in printed and 'AWS::EMR::Cluster' not in printed
+
+
+def test_trigger_workflow_tracks_stack_from_dispatch_time(monkeypatch):
+    """
+    Tests trigger_workflow hands the time recorded before the dispatch to the stack tracking.
+
+    Expected Outcome:
+    - Passes if the stack status is fetched with a `since` taken before the workflow was triggered.
+    """
+    before = datetime.now(timezone.utc)
+    tracked = {}
+
+    def fake_fetch_stack_status(*args, since=None, **kwargs):
+        tracked['since'] = since
+        return True
+
+    monkeypatch.setattr(infra_setup.requests, 'post', lambda *args, **kwargs: FakeResponse(204))
+    monkeypatch.setattr(infra_setup, 'find_workflow_run', lambda *args: 2)
+    monkeypatch.setattr(infra_setup, 'wait_for_workflow_run', lambda *args: {'conclusion': 'success'})
+    monkeypatch.setattr(infra_setup, 'print_step_logs', lambda *args: 'success')
+    monkeypatch.setattr(infra_setup, 'fetch_stack_status_with_retry', fake_fetch_stack_status)
+    monkeypatch.setattr(infra_setup, 'get_stack_outputs', lambda *args: {})
+
+    inputs = {'stack-name': 'luminex', 'AWS_ACCESS_KEY_ID': 'key', 'AWS_SECRET_ACCESS_KEY': 'secret',
+              'AWS_SESSION_TOKEN': 'token'}
+    assert infra_setup.trigger_workflow('org', 'repo', 'deploy', 'deploy-infra', 'us-east-1', 'pat', inputs) == 'success'
+
+    assert tracked['since'] is not None and tracked['since'] <= before
@@ -0,0 +1,86 @@
+"""
+Test module for the IAMRoleValidator class.
+"""
+import datetime
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+
+from validation import infra_validator
+from validation.infra_validator import IAMRoleValidator
+from validation.ttl_cache import TTLCache
+
+
+class FakeIAMClient:
+    """
+    In-memory IAM client serving roles and pages of at most 100 attached policies.
+    """
+    def __init__(self, roles):
+        self.roles = roles
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_role(self, RoleName):
+        with self.lock:
+            self.calls.append(('get_role', RoleName))
+        if RoleName not in self.roles:
+            raise ClientError({'Error': {'Code': 'NoSuchEntity', 'Message': 'not found'}}, 'GetRole')
+        return {'Role': {'RoleName': RoleName, 'Arn': f'arn:aws:iam::123:role/{RoleName}', 'RoleId': f'ID{RoleName}',
+                         'CreateDate': datetime.datetime(2024, 1, 1)}}
+
+    def get_paginator(self, operation_name):
+        assert operation_name == 'list_attached_role_policies'
+        return self
+
+    def paginate(self, RoleName):
+        policies = self.roles[RoleName]
+        for start in range(0, len(policies), 100):
+            with self.lock:
+                self.calls.append(('list_attached_role_policies', RoleName))
+            yield {'AttachedPolicies': [{'PolicyName': name} for name in policies[start:start + 100]]}
+
+
+@pytest.fixture
+def fake_iam_client(monkeypatch):
+    policies = [f'Policy{index}' for index in range(150)]
+    client = FakeIAMClient({'EMRJobRole': policies, 'StackSetAdminRole': ['AdministratorAccess']})
+    monkeypatch.setattr(infra_validator, 'get_client', lambda *args, **kwargs: client)
+    monkeypatch.setattr(IAMRoleValidator, 'policy_cache', TTLCache(maxsize=8, ttl=60))
+    return client
+
+
+def _cfg(permissions):
+    return {'VALIDATION': {'PERMISSIONS': permissions}}
+
+
+def test_validate_roles_follows_policy_pagination(fake_iam_client, capsys):
+    """
+    Tests a permission attached beyond the first page of policies is found.
+
+    Expected Outcome:
+    - Passes if nothing is missing for the role and the output keeps configuration order.
+    """
+    cfg = _cfg({'EMRJobRole': ['Policy149'], 'MissingRole': ['Policy0'], 'StackSetAdminRole': ['Other']})
+
+    missing = IAMRoleValidator(cfg).validate_roles()
+
+    assert missing == {'EMRJobRole': [], 'MissingRole': None, 'StackSetAdminRole': ['Other']}
+    output = capsys.readouterr().out
+    assert output.index('EMRJobRole') < output.index('MissingRole') < output.index('StackSetAdminRole')
+
+
+def test_validate_roles_reuses_cached_policies(fake_iam_client):
+    """
+    Tests repeated validations do not list the policies of unchanged roles again.
+
+    Expected Outcome:
+    - Passes if the second run only issues get_role calls.
+    """
+    cfg = _cfg({'EMRJobRole': ['Policy0'], 'StackSetAdminRole': ['AdministratorAccess']})
+    IAMRoleValidator(cfg).validate_roles()
+    fake_iam_client.calls.clear()
+
+    IAMRoleValidator(cfg).validate_roles()
+
+    assert sorted(call[0] for call in fake_iam_client.calls) == ['get_role', 'get_role']
@@ -0,0 +1,75 @@
+"""
+Test module for the concurrent ETL preflight checks.
+"""
+import threading
+
+from validation.preflight import emr_cluster_check, run_preflight, transformation_files_check
+
+
+def test_run_preflight_runs_checks_concurrently():
+    """
+    Tests run_preflight starts every check before any of them finishes.
+
+    Expected Outcome:
+    - Passes if all checks meet at a barrier, which only happens when they run at the same time.
+    """
+    barrier = threading.Barrier(3, timeout=5)
+
+    def check():
+        barrier.wait()
+        return True, 'ok'
+
+    report = run_preflight([('a', check), ('b', check), ('c', check)])
+
+    assert report.passed
+    assert [result.name for result in report.results] == ['a', 'b', 'c']
+
+
+def test_run_preflight_reports_every_failure():
+    """
+    Tests run_preflight aggregates failures, including checks that raise.
+
+    Expected Outcome:
+    - Passes if both failing checks are reported and the passing one is not.
+    """
+    def broken():
+        raise RuntimeError('boom')
+
+    report = run_preflight([('ok', lambda: (True, '')), ('bad', lambda: (False, 'nope')), ('broken', broken)])
+
+    assert not report.passed
+    assert [result.name for result in report.failures()] == ['bad', 'broken']
+    assert 'RuntimeError: boom' in report.summary()
+
+
+def test_emr_cluster_check_rejects_terminated_cluster(fake_emr_client):
+    """
+    Tests emr_cluster_check accepts active clusters and rejects terminated ones.
+
+    Expected Outcome:
+    - Passes if a WAITING cluster passes and a TERMINATED cluster fails.
+    """
+    assert emr_cluster_check(fake_emr_client, 'j-TEST')() == (True, 'j-TEST is WAITING')
+
+    fake_emr_client.cluster_state = 'TERMINATED'
+    assert emr_cluster_check(fake_emr_client, 'j-TEST')()[0] is False
+
+
+def test_transformation_files_check_lists_missing_files():
+    """
+    Tests transformation_files_check reports the files missing from the repository.
+
+    Expected Outcome:
+    - Passes if the check fails and names the missing file.
+    """
+    class StubValidator:
+        repo_name = 'org/repo'
+        files_to_validate = ['clean.py', 'join.py']
+
+        def find_missing_files(self):
+            return ['join.py']
+
+    passed, detail = transformation_files_check(StubValidator())()
+
+    assert not passed
+    assert 'join.py' in detail
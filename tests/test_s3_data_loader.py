@@ -3,9 +3,16 @@ Test module for the S3DataLoader class.
 """
 import os
 import sys
+from io import BytesIO
+
+import pyarrow as pa
+import pytest
+import pyarrow.parquet as pq
 from pandas import DataFrame
 from dotenv import load_dotenv
 
+from luminex import S3DataLoader
+
 load_dotenv()
 
 # Add the parent directory to the Python path
@@ -75,3 +82,151 @@ def test_read_parquet_from_s3(s3_loader):
     - Passes if Parquet file is read successfully and DataFrame is returned.
     """
     assert isinstance(s3_loader.read_parquet_from_s3(PARQUET_KEY), DataFrame)
+
+
+def test_iter_csv_from_s3_yields_bounded_chunks(fake_s3_client):
+    """
+    Tests iter_csv_from_s3 streams a CSV object as fixed-size DataFrame chunks.
+
+    Expected Outcome:
+    - Passes if every chunk holds at most `chunksize` rows and all rows are read.
+    """
+    rows = "".join(f"{i},{i * 2}\n" for i in range(25))
+    fake_s3_client.objects['data.csv'] = f"a,b\n{rows}".encode()
+    loader = S3DataLoader(bucket_name='test-bucket')
+    loader.client = fake_s3_client
+
+    chunks = list(loader.iter_csv_from_s3('data.csv', chunksize=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert all(isinstance(chunk, DataFrame) for chunk in chunks)
+    assert chunks[-1]['b'].iloc[-1] == 48
+
+
+def test_iter_csv_from_s3_raises_on_malformed_row_after_first_chunk(fake_s3_client):
+    """
+    Tests a row that fails to parse mid-stream raises instead of ending the stream early.
+
+    Expected Outcome:
+    - Passes if the first chunk is yielded and the malformed row then raises an IOError naming the key.
+    """
+    rows = "".join(f"{i},{i * 2}\n" for i in range(15))
+    fake_s3_client.objects['data.csv'] = f"a,b\n{rows}1,2,3,4\n".encode()
+    loader = S3DataLoader(bucket_name='test-bucket')
+    loader.client = fake_s3_client
+    chunks = loader.iter_csv_from_s3('data.csv', chunksize=10)
+
+    assert len(next(chunks)) == 10
+    with pytest.raises(IOError, match="data.csv"):
+        list(chunks)
+
+
+def test_read_csv_from_s3_uses_ranged_download(fake_s3_client):
+    """
+    Tests read_csv_from_s3 reads an object fetched through the ranged download engine.
+
+    Expected Outcome:
+    - Passes if the full CSV is parsed from several ranged GETs.
+    """
+    rows = "".join(f"{i},{i * 2}\n" for i in range(200))
+    fake_s3_client.objects['data.csv'] = f"a,b\n{rows}".encode()
+    loader = S3DataLoader(bucket_name='test-bucket', part_size=256, max_concurrency=3)
+    loader.client = fake_s3_client
+
+    dataframe = loader.read_csv_from_s3('data.csv')
+
+    assert dataframe.shape == (200, 2)
+    assert len(fake_s3_client.calls) > 1
+
+
+def test_read_parquet_from_s3_projects_columns_and_prunes_row_groups(fake_s3_client):
+    """
+    Tests read_parquet_from_s3 with column projection and a row-group filter.
+
+    Expected Outcome:
+    - Passes if only the matching rows and requested columns are returned and
+      fewer bytes than the whole object are fetched.
+    """
+    table = pa.table({f'col_{i}': list(range(1000)) for i in range(20)})
+    sink = BytesIO()
+    pq.write_table(table, sink, row_group_size=100)
+    fake_s3_client.objects['data.parquet'] = sink.getvalue()
+    loader = S3DataLoader(bucket_name='test-bucket', part_size=4096)
+    loader.client = fake_s3_client
+
+    dataframe = loader.read_parquet_from_s3('data.parquet', columns=['col_1', 'col_2'],
+                                            filters=[('col_0', '>=', 950)])
+
+    assert list(dataframe.columns) == ['col_1', 'col_2']
+    assert dataframe['col_1'].tolist() == list(range(950, 1000))
+    assert fake_s3_client.bytes_served < len(sink.getvalue()) / 2
+
+
+def test_read_parquet_from_s3_restarts_pushdown_when_object_changes(fake_s3_client):
+    """
+    Tests a Parquet object overwritten between its footer and column chunk reads is read again.
+
+    Expected Outcome:
+    - Passes if the pinned read fails over to the new version instead of mixing both versions.
+    """
+    def parquet_bytes(offset):
+        sink = BytesIO()
+        pq.write_table(pa.table({'id': [offset + i for i in range(100)]}), sink)
+        return sink.getvalue()
+
+    fake_s3_client.objects['data.parquet'] = parquet_bytes(0)
+    get_object = fake_s3_client.get_object
+
+    def overwriting_get_object(**kwargs):
+        response = get_object(**kwargs)
+        fake_s3_client.objects['data.parquet'] = parquet_bytes(1000)
+        return response
+
+    fake_s3_client.get_object = overwriting_get_object
+    loader = S3DataLoader(bucket_name='test-bucket')
+    loader.client = fake_s3_client
+
+    dataframe = loader.read_parquet_from_s3('data.parquet', columns=['id'])
+
+    assert dataframe['id'].tolist() == list(range(1000, 1100))
+
+
+def test_read_prefix_concatenates_part_files(fake_s3_client):
+    """
+    Tests read_prefix reads every part file under a prefix across listing pages.
+
+    Expected Outcome:
+    - Passes if all part files are combined in key order and marker files are skipped.
+    """
+    for part in range(5):
+        fake_s3_client.objects[f'output/part-{part:05d}.csv'] = f"a\n{part}\n{part}\n".encode()
+    fake_s3_client.objects['output/_SUCCESS'] = b''
+    fake_s3_client.page_size = 2
+    loader = S3DataLoader(bucket_name='test-bucket')
+    loader.client = fake_s3_client
+
+    dataframe = loader.read_prefix('output/', 'csv', max_workers=2)
+
+    assert dataframe['a'].tolist() == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+    assert len(list(loader.read_prefix('output/', 'csv', iterator=True))) == 5
+
+
+def test_read_prefix_raises_when_a_part_file_fails(fake_s3_client):
+    """
+    Tests read_prefix does not return a partial DataFrame when one part file cannot be parsed.
+
+    Expected Outcome:
+    - Passes if an IOError naming the broken part is raised after the other parts were read.
+    """
+    buffer = BytesIO()
+    pq.write_table(pa.table({'a': [1, 2]}), buffer)
+    for part in range(4):
+        fake_s3_client.objects[f'output/part-{part:05d}.parquet'] = buffer.getvalue()
+    fake_s3_client.objects['output/part-00002.parquet'] = b'PAR1 not really parquet'
+    loader = S3DataLoader(bucket_name='test-bucket')
+    loader.client = fake_s3_client
+
+    with pytest.raises(IOError, match='part-00002') as error:
+        loader.read_prefix('output/', 'parquet', max_workers=2)
+
+    assert 'Failed to read 1 of 4 objects' in str(error.value)
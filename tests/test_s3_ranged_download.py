@@ -0,0 +1,89 @@
+"""
+Test module for the S3RangedDownloader class.
+"""
+import os
+
+import pytest
+
+from luminex.data_standardization.s3_ranged_download import ObjectChangedError, S3RangedDownloader, S3RangedFile
+
+
+def test_download_reassembles_ranged_parts(fake_s3_client):
+    """
+    Tests download splits an object into ranges and reassembles it in order.
+
+    Expected Outcome:
+    - Passes if the buffer matches the object and one GET was issued per part.
+    """
+    data = os.urandom(1000)
+    fake_s3_client.objects['blob.bin'] = data
+    downloader = S3RangedDownloader(fake_s3_client, part_size=128, max_concurrency=4)
+
+    buffer = downloader.download('test-bucket', 'blob.bin')
+
+    assert bytes(buffer) == data
+    ranges = sorted(call[3]['Range'] for call in fake_s3_client.calls)
+    assert len(ranges) == 8
+    assert 'bytes=896-999' in ranges
+
+
+def test_download_small_object_uses_single_request(fake_s3_client):
+    """
+    Tests download of an object smaller than one part.
+
+    Expected Outcome:
+    - Passes if the object is returned after a single ranged GET.
+    """
+    fake_s3_client.objects['small.csv'] = b'a,b\n1,2\n'
+    downloader = S3RangedDownloader(fake_s3_client, part_size=1024)
+
+    assert bytes(downloader.download('test-bucket', 'small.csv')) == b'a,b\n1,2\n'
+    assert len(fake_s3_client.calls) == 1
+
+
+def _overwrite_after(client, key, data, calls):
+    """
+    Make the fake client overwrite an object after its `calls`-th get_object.
+    """
+    get_object = client.get_object
+
+    def overwriting_get_object(**kwargs):
+        response = get_object(**kwargs)
+        if len([call for call in client.calls if call[0] == 'get_object']) == calls:
+            client.objects[key] = data
+        return response
+
+    client.get_object = overwriting_get_object
+
+
+def test_download_restarts_when_object_changes_mid_download(fake_s3_client):
+    """
+    Tests the ranges after the first are pinned to its ETag, so an overwrite is never stitched in.
+
+    Expected Outcome:
+    - Passes if the later ranges carry If-Match, and the download restarts and returns only the new version.
+    """
+    old, new = b'a' * 1000, b'b' * 1000
+    fake_s3_client.objects['blob.bin'] = old
+    _overwrite_after(fake_s3_client, 'blob.bin', new, calls=1)
+    downloader = S3RangedDownloader(fake_s3_client, part_size=128, max_concurrency=1)
+
+    assert bytes(downloader.download('test-bucket', 'blob.bin')) == new
+    assert all('IfMatch' in call[3] for call in fake_s3_client.calls[1:] if call[3]['Range'] != 'bytes=0-127')
+
+
+def test_ranged_file_reads_fail_after_object_changes(fake_s3_client):
+    """
+    Tests a seekable file is pinned to the ETag seen when it was opened.
+
+    Expected Outcome:
+    - Passes if reads succeed before the overwrite and raise ObjectChangedError after it.
+    """
+    fake_s3_client.objects['table.parquet'] = b'x' * 500
+    downloader = S3RangedDownloader(fake_s3_client, part_size=128)
+
+    with S3RangedFile(downloader, 'test-bucket', 'table.parquet') as ranged_file:
+        assert ranged_file.read(10) == b'x' * 10
+        fake_s3_client.objects['table.parquet'] = b'y' * 500
+        with pytest.raises(ObjectChangedError):
+            ranged_file.read(10)
@@ -0,0 +1,173 @@
+"""
+Test module for the Spark writer of the S3DataUploader class. The DataFrame and writer are
+recording stand-ins, so no JVM is started.
+"""
+import pytest
+
+from luminex.data_standardization import s3_json_uploader
+from luminex.data_standardization.s3_json_uploader import columnar_write_options, plan_output_files
+
+MIB = 1024 * 1024
+
+
+class FakeWriter:
+    def __init__(self, df):
+        self.df = df
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.calls.append((name,) + args)
+            return self
+        return record
+
+
+class FakeDataFrame:
+    """
+    Records how it was derived; `derived` collects every DataFrame created from it.
+    """
+    def __init__(self, num_partitions=200, lineage=(), derived=None):
+        self.num_partitions = num_partitions
+        self.lineage = list(lineage)
+        self.derived = derived if derived is not None else []
+        self.write = FakeWriter(self)
+
+    def _derive(self, num_partitions, step):
+        df = FakeDataFrame(num_partitions, self.lineage + [step], self.derived)
+        self.derived.append(df)
+        return df
+
+    def repartition(self, num_partitions, *columns):
+        return self._derive(num_partitions, ('repartition', num_partitions) + columns)
+
+    def sortWithinPartitions(self, *columns):
+        return self._derive(self.num_partitions, ('sortWithinPartitions',) + columns)
+
+    def written(self):
+        """
+        Returns the DataFrame the write was issued on.
+        """
+        return self.derived[-1] if self.derived else self
+
+
+@pytest.fixture
+def uploader(monkeypatch, s3_uploader):
+    """
+    Uploader whose DataFrame size estimate is scripted per test.
+    """
+    def estimate(size_in_bytes, row_count, row_width=None):
+        monkeypatch.setattr(s3_json_uploader, 'estimate_size_in_bytes', lambda df: (size_in_bytes, row_count))
+        monkeypatch.setattr(s3_json_uploader, 'estimate_row_width', lambda df: row_width)
+    s3_uploader.estimate = estimate
+    return s3_uploader
+
+
+def test_plan_output_files_targets_file_size():
+    """
+    Tests the partition count follows the estimated size and partitioned writes cap rows per file.
+
+    Expected Outcome:
+    - Passes if 1 GiB gives 8 files of 128 MiB and the row cap matches 128 MiB of rows.
+    """
+    assert plan_output_files(1024 * MIB, None) == (8, None)
+    assert plan_output_files(1024 * MIB, 8_000_000, partition_by=['day']) == (8, 1_000_000)
+    assert plan_output_files(1024 * MIB, None, partition_by=['day'], row_width=64) == (8, 2 * MIB)
+    assert plan_output_files(10, None) == (1, None)
+    assert plan_output_files(None, None) == (None, None)
+    assert plan_output_files(2 ** 63 - 1, None) == (None, None)
+
+
+def test_write_df_repartitions_and_sets_compression(uploader):
+    """
+    Tests a small DataFrame is repartitioned to the planned file count and written with the codec.
+
+    Expected Outcome:
+    - Passes if 300 MiB over 200 partitions becomes 3 files written with zstd, shuffled rather than
+      coalesced so the upstream stages keep their parallelism.
+    """
+    uploader.estimate(300 * MIB, None)
+    df = FakeDataFrame(200)
+
+    uploader.write_df(df, 's3a://bucket/out/', output_format='json', compression='zstd')
+
+    written = df.written()
+    assert written.lineage == [('repartition', 3)]
+    assert written.write.calls == [('format', 'json'), ('mode', 'overwrite'), ('option', 'compression', 'zstd'),
+                                   ('save', 's3a://bucket/out/')]
+
+
+def test_pyspark_df_json_upload_writes_partitioned_output(uploader):
+    """
+    Tests the fixed JSON upload path writes, and partitioned writes shuffle by the partition columns.
+
+    Expected Outcome:
+    - Passes if the upload saves once and the partitioned write repartitions by its columns.
+    """
+    uploader.estimate(None, None)
+    df = FakeDataFrame(4)
+    uploader.pyspark_df_json_upload(df, 'json', 's3a://bucket/json/')
+    assert df.write.calls[-1] == ('save', 's3a://bucket/json/')
+
+    uploader.estimate(512 * MIB, 4_000_000)
+    df = FakeDataFrame(4)
+    uploader.write_df(df, 's3a://bucket/parquet/', partition_by=['day'])
+
+    written = df.written()
+    assert written.lineage == [('repartition', 4, 'day')]
+    assert ('partitionBy', 'day') in written.write.calls
+    assert ('option', 'maxRecordsPerFile', 1_000_000) in written.write.calls
+
+
+def test_columnar_write_options():
+    """
+    Tests row group size, dictionary encoding and bloom filters map to each format's options.
+
+    Expected Outcome:
+    - Passes if Parquet sets per-column bloom filters and ORC lists them, and other formats are rejected.
+    """
+    parquet = columnar_write_options('parquet', row_group_size=64 * MIB, bloom_filter_columns=['user_id'],
+                                     bloom_filter_fpp=0.01)
+    orc = columnar_write_options('orc', dictionary_encoding=False, bloom_filter_columns=['user_id', 'device'])
+
+    assert parquet == {'parquet.block.size': str(64 * MIB), 'parquet.enable.dictionary': 'true',
+                       'parquet.bloom.filter.enabled#user_id': 'true', 'parquet.bloom.filter.fpp#user_id': '0.01'}
+    assert orc['orc.bloom.filter.columns'] == 'user_id,device'
+    assert orc['orc.dictionary.key.threshold'] == '0'
+    with pytest.raises(ValueError):
+        columnar_write_options('json')
+
+
+def test_write_columnar_sorts_within_partitions(uploader):
+    """
+    Tests columnar writes sort each file by the partition columns, then the sort columns.
+
+    Expected Outcome:
+    - Passes if the sort follows the repartition and the Parquet options reach the writer.
+    """
+    uploader.estimate(256 * MIB, None)
+    df = FakeDataFrame(4)
+
+    uploader.write_columnar(df, 's3a://bucket/out/', partition_by=['day'], sort_by=['user_id', 'day'],
+                            bloom_filter_columns=['user_id'])
+
+    written = df.written()
+    assert written.lineage == [('repartition', 2, 'day'), ('sortWithinPartitions', 'day', 'user_id')]
+    assert ('format', 'parquet') in written.write.calls
+    assert ('option', 'compression', 'snappy') in written.write.calls
+    assert ('option', 'parquet.bloom.filter.enabled#user_id', 'true') in written.write.calls
+
+
+def test_partitioned_write_caps_rows_from_row_width_without_statistics(uploader):
+    """
+    Tests a partitioned write of a plain file scan, which has no row count estimate, still caps file size.
+
+    Expected Outcome:
+    - Passes if maxRecordsPerFile is derived from the schema's row width without counting the rows.
+    """
+    uploader.estimate(512 * MIB, None, row_width=256)
+    df = FakeDataFrame(4)
+
+    uploader.write_df(df, 's3a://bucket/parquet/', partition_by=['day'])
+
+    assert df.written().lineage == [('repartition', 4, 'day')]
+    assert ('option', 'maxRecordsPerFile', 524_288) in df.written().write.calls
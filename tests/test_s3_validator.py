@@ -0,0 +1,85 @@
+"""
+Test module for the deep source validation of ETLS3Validator.
+"""
+import pytest
+
+from validation import s3_validator
+from validation.s3_validator import ETLS3Validator
+from validation.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def validator_s3(monkeypatch, fake_s3_client):
+    """
+    Route the validator's S3 client to the in-memory fake and give it an empty bucket cache.
+    """
+    fake_s3_client.head_bucket = lambda Bucket: {}
+    monkeypatch.setattr(s3_validator, 'get_client', lambda *args, **kwargs: fake_s3_client)
+    monkeypatch.setattr(ETLS3Validator, 'bucket_cache', TTLCache(maxsize=8, ttl=60))
+    return fake_s3_client
+
+
+def test_deep_validation_rejects_empty_prefix(validator_s3):
+    """
+    Tests deep validation fails a prefix holding only metadata files.
+
+    Expected Outcome:
+    - Passes if validation fails without reading any object.
+    """
+    validator_s3.objects = {'data/_SUCCESS': b'', 'data/.hidden': b'x'}
+
+    assert not ETLS3Validator('s3://bucket/data/', 'destination', deep=True).validate_input()
+    assert [call[0] for call in validator_s3.calls] == ['list_objects_v2']
+
+
+def test_deep_validation_checks_parquet_magic_with_ranged_reads(validator_s3):
+    """
+    Tests a large Parquet sample is checked by its header and footer bytes only.
+
+    Expected Outcome:
+    - Passes if a valid file passes, a truncated one fails, and only a few KiB are read.
+    """
+    body = b'PAR1' + b'\x01' * 100_000 + b'PAR1'
+    validator_s3.objects = {'data/part-0.parquet': body}
+    validator = ETLS3Validator('s3://bucket/data/', 'destination', deep=True)
+
+    assert validator.validate_input()
+    assert validator_s3.bytes_served <= 4096 + 4
+
+    validator_s3.objects = {'data/part-0.parquet': body[:-1]}
+    assert not validator.validate_input()
+
+
+def test_deep_validation_rejects_wrong_format(validator_s3):
+    """
+    Tests the declared file type is enforced over the sample's content.
+
+    Expected Outcome:
+    - Passes if CSV data fails as JSON and passes as CSV.
+    """
+    validator_s3.objects = {'data/part-0': b'id,name\n1,a\n'}
+
+    assert not ETLS3Validator('s3://bucket/data/', 'destination', deep=True, file_type='json').validate_input()
+    assert ETLS3Validator('s3://bucket/data/', 'destination', deep=True, file_type='csv').validate_input()
+
+
+def test_deep_validation_accepts_csv_header_wider_than_sniff_window(validator_s3):
+    """
+    Tests a CSV whose header line is longer than the sniffed bytes passes deep validation.
+
+    Expected Outcome:
+    - Passes if a 300-column header cut off mid-character is accepted, while undelimited and
+      non-UTF-8 leading bytes are rejected.
+    """
+    header = ('identifier_x,' + ','.join(f'colonne_é{index:03d}' for index in range(300))).encode('utf-8')
+    assert len(header) > s3_validator.SNIFF_BYTES and header[s3_validator.SNIFF_BYTES - 1] >= 0x80
+    validator = ETLS3Validator('s3://bucket/data/', 'destination', deep=True)
+
+    validator_s3.objects = {'data/part-0.csv': header + b'\n' + b'1,' * 300 + b'\n'}
+    assert validator.validate_input()
+
+    validator_s3.objects = {'data/part-0.csv': b'x' * 5000 + b'\n'}
+    assert not validator.validate_input()
+
+    validator_s3.objects = {'data/part-0.csv': b'id,' + b'\xff' * 5000 + b'\n'}
+    assert not validator.validate_input()
@@ -0,0 +1,210 @@
+"""
+Test module for the SparkSessionProvider class and the Spark S3DataLoader.
+These tests use a recording stand-in for the SparkSession builder, so no JVM is started.
+"""
+from pyspark.sql.types import IntegerType, StringType, StructField, StructType
+
+from configs import load_cfg
+from luminex.data_standardization import spark_session
+from luminex.data_standardization.s3_data_loader_spark import S3DataLoader
+from luminex.data_standardization.schema_registry import SchemaRegistry
+from luminex.data_standardization.spark_session import (HADOOP_AWS_PACKAGE, HADOOP_VERSION, SparkSessionProvider,
+                                                        base_session_conf, bundled_hadoop_version,
+                                                        get_default_provider, s3a_profile_conf)
+
+
+class FakeSession:
+    def __init__(self):
+        self.stopped = False
+        self.read = FakeReader()
+
+    def stop(self):
+        self.stopped = True
+
+
+class FakeReader:
+    def parquet(self, path):
+        return ('parquet', path)
+
+
+class FakeBuilder:
+    """
+    Records the settings it is given and counts the sessions it creates.
+    """
+    def __init__(self):
+        self.conf = {}
+        self.app_name = None
+        self.sessions = []
+
+    def appName(self, name):
+        self.app_name = name
+        return self
+
+    def config(self, key, value):
+        self.conf[key] = value
+        return self
+
+    def getOrCreate(self):
+        self.sessions.append(FakeSession())
+        return self.sessions[-1]
+
+
+def test_provider_builds_one_session_until_stopped():
+    """
+    Tests the session is built once, reused, and rebuilt only after the context manager stops it.
+
+    Expected Outcome:
+    - Passes if two loaders share one session, reads do not stop it and the context exit does,
+      and a loader reads from a new session once the first one was stopped.
+    """
+    builder = FakeBuilder()
+    provider = SparkSessionProvider(conf={'spark.sql.shuffle.partitions': '64'}, builder_factory=lambda: builder)
+
+    with provider.session() as spark:
+        first = S3DataLoader(session_provider=provider)
+        second = S3DataLoader(session_provider=provider)
+        assert first.read_parquet_to_df('s3a://bucket/data/') == ('parquet', 's3a://bucket/data/')
+        assert first.spark is second.spark is spark
+        assert not spark.stopped
+
+    assert spark.stopped
+    assert len(builder.sessions) == 1
+    assert builder.conf['spark.sql.shuffle.partitions'] == '64'
+    assert first.read_parquet_to_df('s3a://bucket/data/') == ('parquet', 's3a://bucket/data/')
+    assert len(builder.sessions) == 2
+    assert first.spark is provider.get_session() is not spark
+
+
+def test_base_session_conf_uses_temporary_credentials_from_environment():
+    """
+    Tests session credentials come from the AWS environment variables.
+
+    Expected Outcome:
+    - Passes if the keys and token are set with the temporary credentials provider, and none without keys.
+    """
+    conf = base_session_conf({'AWS_ACCESS_KEY_ID': 'id', 'AWS_SECRET_ACCESS_KEY': 'secret',
+                              'AWS_SESSION_TOKEN': 'token'})
+
+    assert conf['spark.hadoop.fs.s3a.session.token'] == 'token'
+    assert conf['spark.hadoop.fs.s3a.aws.credentials.provider'].endswith('TemporaryAWSCredentialsProvider')
+    assert 'spark.hadoop.fs.s3a.access.key' not in base_session_conf({})
+
+
+class RecordingReader:
+    """
+    Spark reader stand-in that records each read and answers with a fixed inferred schema.
+    """
+    def __init__(self, inferred_schema):
+        self.inferred_schema = inferred_schema
+        self.reads = []
+
+    def csv(self, path, **options):
+        self.reads.append(options)
+        return type('FakeDataFrame', (), {'schema': options.get('schema', self.inferred_schema)})()
+
+
+def test_csv_schema_is_inferred_once_then_reused_from_registry(tmp_path, fake_s3_client):
+    """
+    Tests the first read infers and registers the schema, and later loaders read with it.
+
+    Expected Outcome:
+    - Passes if only the first read infers and the second passes the registered schema.
+    """
+    fake_s3_client.objects['data/part-0.csv'] = b'id,name\n1,a\n'
+    schema = StructType([StructField('id', IntegerType()), StructField('name', StringType())])
+    session = FakeSession()
+    session.read = RecordingReader(schema)
+    registry = SchemaRegistry(str(tmp_path))
+
+    S3DataLoader(spark=session, schema_registry=registry, s3_client=fake_s3_client).read_csv_to_df('s3a://bucket/data/')
+    S3DataLoader(spark=session, schema_registry=SchemaRegistry(str(tmp_path)),
+                 s3_client=fake_s3_client).read_csv_to_df('s3a://bucket/data')
+    S3DataLoader(spark=session).read_csv_to_df('s3a://bucket/other/', schema='id INT, name STRING')
+
+    assert session.read.reads[0] == {'header': True, 'inferSchema': True}
+    assert session.read.reads[1] == {'header': True, 'schema': schema}
+    assert session.read.reads[2] == {'header': True, 'schema': 'id INT, name STRING'}
+
+
+def test_registered_schema_is_inferred_again_when_the_source_changes(tmp_path, fake_s3_client):
+    """
+    Tests a registered schema is only reused while the source matches the fingerprint it was stored with.
+
+    Expected Outcome:
+    - Passes if new files with the same CSV header reuse the schema, while a changed header and a
+      rewritten JSON file are inferred again.
+    """
+    fake_s3_client.objects['data/_SUCCESS'] = b''
+    fake_s3_client.objects['data/part-0.csv'] = b'id,name\r\n1,a\r\n'
+    session = FakeSession()
+    session.read = RecordingReader(StructType([StructField('id', IntegerType())]))
+    loader = S3DataLoader(spark=session, schema_registry=SchemaRegistry(str(tmp_path)), s3_client=fake_s3_client)
+
+    loader.read_csv_to_df('s3a://bucket/data/')
+    fake_s3_client.objects['data/part-1.csv'] = b'id,name\n2,b\n'
+    loader.read_csv_to_df('s3a://bucket/data/')
+    fake_s3_client.objects['data/part-0.csv'] = b'id,name,email\n1,a,a@example.com\n'
+    loader.read_csv_to_df('s3a://bucket/data/')
+
+    assert ['inferSchema' in options for options in session.read.reads] == [True, False, True]
+
+    fake_s3_client.objects['events/day.json'] = b'[{"id": 1}]'
+    session.read.json = session.read.csv
+    loader.read_json_to_df('s3a://bucket/events/day.json')
+    loader.read_json_to_df('s3a://bucket/events/day.json')
+    fake_s3_client.objects['events/day.json'] = b'[{"id": 1, "tags": ["a"]}]'
+    loader.read_json_to_df('s3a://bucket/events/day.json')
+
+    assert ['schema' in options for options in session.read.reads[3:]] == [False, True, False]
+
+
+def test_s3a_profile_from_config_is_applied_to_the_session():
+    """
+    Tests the configured S3A profile reaches the session settings with its committer and packages.
+
+    Expected Outcome:
+    - Passes if both shipped profiles load, bulk-scan sets the magic committer and adds the cloud package.
+    """
+    cfg = load_cfg()
+    builder = FakeBuilder()
+    SparkSessionProvider.from_cfg(cfg, profile='bulk-scan', builder_factory=lambda: builder).get_session()
+
+    assert builder.conf['spark.hadoop.fs.s3a.fast.upload'] == 'true'
+    assert builder.conf['spark.hadoop.fs.s3a.committer.name'] == 'magic'
+    assert 'spark-hadoop-cloud' in builder.conf['spark.jars.packages']
+    assert 'hadoop-aws' in builder.conf['spark.jars.packages']
+    assert s3a_profile_conf(cfg, 'small-files')['spark.hadoop.fs.s3a.committer.name'] == 'directory'
+
+
+def test_hadoop_aws_matches_the_hadoop_bundled_with_pyspark(tmp_path):
+    """
+    Tests the hadoop-aws connector version is taken from pyspark's bundled Hadoop client jar.
+
+    Expected Outcome:
+    - Passes if the version is read from the jar name, falls back without one, and names the connector.
+    """
+    (tmp_path / 'hadoop-client-api-3.4.1.jar').touch()
+    (tmp_path / 'hadoop-client-runtime-3.4.1.jar').touch()
+
+    assert bundled_hadoop_version(str(tmp_path)) == '3.4.1'
+    assert bundled_hadoop_version(str(tmp_path / 'missing')) == spark_session.DEFAULT_HADOOP_VERSION
+    assert HADOOP_AWS_PACKAGE == f'org.apache.hadoop:hadoop-aws:{HADOOP_VERSION}'
+
+
+def test_default_provider_reads_the_config_on_first_use(monkeypatch):
+    """
+    Tests the process-wide provider is built on first use, once, rather than at import.
+
+    Expected Outcome:
+    - Passes if the configuration is loaded only by the first get_default_provider call.
+    """
+    loads = []
+    monkeypatch.setattr(spark_session, '_default_provider', None)
+    monkeypatch.setattr(spark_session, 'load_cfg', lambda: loads.append(1) or {})
+
+    assert not loads
+    provider = get_default_provider()
+
+    assert get_default_provider() is provider
+    assert loads == [1]
+    assert provider.conf == {}
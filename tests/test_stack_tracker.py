@@ -0,0 +1,114 @@
+"""
+Test module for the StackEventTracker class.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from botocore.exceptions import ClientError
+
+from stack_tracker import StackEventTracker, is_terminal_stack_status
+
+START = datetime(2024, 5, 1, 12, 0, 0)
+
+
+class FakeCloudFormationClient:
+    """
+    Publishes one scripted batch of stack events per describe_stack_events call, serving
+    them newest first in pages of two like the real API.
+    """
+    def __init__(self, batches, missing_polls=0):
+        self.batches = list(batches)
+        self.missing_polls = missing_polls
+        self.events = []
+        self.calls = []
+
+    def describe_stack_events(self, StackName, NextToken=None):
+        self.calls.append(NextToken)
+        if NextToken is None:
+            if self.missing_polls:
+                self.missing_polls -= 1
+                raise ClientError({'Error': {'Code': 'ValidationError',
+                                             'Message': f'Stack with id {StackName} does not exist'}},
+                                  'DescribeStackEvents')
+            if self.batches:
+                self.events.extend(self.batches.pop(0))
+        newest_first = list(reversed(self.events))
+        start = int(NextToken or 0)
+        page = {'StackEvents': newest_first[start:start + 2]}
+        if start + 2 < len(newest_first):
+            page['NextToken'] = str(start + 2)
+        return page
+
+
+def _event(number, logical_id, status, resource_type='AWS::EMR::Cluster'):
+    return {'EventId': f'event-{number}', 'LogicalResourceId': logical_id, 'ResourceType': resource_type,
+            'ResourceStatus': status, 'Timestamp': START + timedelta(seconds=number)}
+
+
+def _stack_event(number, status):
+    return _event(number, 'luminex', status, 'AWS::CloudFormation::Stack')
+
+
+def test_wait_emits_each_event_once_and_stops_at_terminal_status():
+    """
+    Tests events are emitted once, in order, and waiting ends on the poll that sees the terminal status.
+
+    Expected Outcome:
+    - Passes if all five events are emitted in order and no poll follows CREATE_COMPLETE.
+    """
+    cf_client = FakeCloudFormationClient([
+        [_stack_event(1, 'CREATE_IN_PROGRESS'), _event(2, 'Cluster', 'CREATE_IN_PROGRESS')],
+        [],
+        [_event(3, 'Cluster', 'CREATE_COMPLETE'), _event(4, 'Role', 'CREATE_COMPLETE'),
+         _stack_event(5, 'CREATE_COMPLETE')],
+    ], missing_polls=1)
+    sleeps = []
+    tracker = StackEventTracker(cf_client, 'luminex', jitter=0, sleep=sleeps.append)
+    emitted = []
+
+    status = tracker.wait(on_event=lambda event: emitted.append(event['EventId']))
+
+    assert status == 'CREATE_COMPLETE'
+    assert emitted == [f'event-{number}' for number in range(1, 6)]
+    assert sleeps == [7.5, 5, 7.5]
+
+
+def test_poll_ignores_events_before_since():
+    """
+    Tests events of earlier stack operations are not replayed on the first poll.
+
+    Expected Outcome:
+    - Passes if only the event after `since` is returned.
+    """
+    cf_client = FakeCloudFormationClient([[_stack_event(1, 'CREATE_COMPLETE'), _stack_event(10, 'UPDATE_IN_PROGRESS')]])
+    tracker = StackEventTracker(cf_client, 'luminex', since=START + timedelta(seconds=5))
+
+    assert [event['EventId'] for event in tracker.poll()] == ['event-10']
+    assert tracker.status == 'UPDATE_IN_PROGRESS'
+
+
+def test_wait_times_out(monkeypatch):
+    """
+    Tests wait raises TimeoutError when the stack never finishes.
+
+    Expected Outcome:
+    - Passes if TimeoutError is raised.
+    """
+    clock = iter(range(0, 1000, 10))
+    monkeypatch.setattr('stack_tracker.time.monotonic', lambda: next(clock))
+    tracker = StackEventTracker(FakeCloudFormationClient([[_stack_event(1, 'CREATE_IN_PROGRESS')]]), 'luminex',
+                                sleep=lambda seconds: None)
+
+    with pytest.raises(TimeoutError):
+        tracker.wait(timeout=30)
+
+
+@pytest.mark.parametrize('status, terminal', [
+    ('CREATE_COMPLETE', True), ('ROLLBACK_COMPLETE', True), ('CREATE_FAILED', True),
+    ('UPDATE_COMPLETE_CLEANUP_IN_PROGRESS', False), ('ROLLBACK_IN_PROGRESS', False), (None, False),
+])
+def test_is_terminal_stack_status(status, terminal):
+    """
+    Tests terminal stack statuses are told apart from in-progress ones.
+    """
+    assert is_terminal_stack_status(status) is terminal
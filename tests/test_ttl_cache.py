@@ -0,0 +1,138 @@
+"""
+Test module for the TTLCache class and the ETLS3Validator head_bucket cache.
+"""
+from botocore.exceptions import ClientError
+
+import etl
+import luminex
+from luminex.validation import s3_validator as package_s3_validator
+from validation import s3_validator
+from validation.s3_validator import ETLS3Validator
+from validation.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    """
+    Tests entries are served until their time to live runs out.
+
+    Expected Outcome:
+    - Passes if the value is a hit before expiry, a miss after it, and the counters agree.
+    """
+    clock = FakeClock()
+    cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+    cache.set('bucket', 'ok')
+
+    clock.now = 9.9
+    assert cache.get('bucket') == 'ok'
+    clock.now = 10
+    assert cache.get('bucket') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Tests a full cache evicts the entry read least recently.
+
+    Expected Outcome:
+    - Passes if the entry touched by get survives and the other old entry is evicted.
+    """
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_validator_reuses_head_bucket_result(monkeypatch):
+    """
+    Tests ETLS3Validator calls head_bucket once per bucket until it is invalidated.
+
+    Expected Outcome:
+    - Passes if repeated validations issue one head_bucket call, and one more after invalidation.
+    """
+    calls = []
+
+    class FakeS3:
+        def head_bucket(self, Bucket):
+            calls.append(Bucket)
+
+    monkeypatch.setattr(s3_validator, 'get_client', lambda *args, **kwargs: FakeS3())
+    monkeypatch.setattr(ETLS3Validator, 'bucket_cache', TTLCache(maxsize=8, ttl=60))
+    validator = ETLS3Validator('s3://source/data/', 'destination')
+
+    assert validator.validate_input()
+    assert validator.validate_input()
+    assert calls == ['source', 'destination']
+    assert ETLS3Validator.bucket_cache_stats()['hits'] == 2
+
+    ETLS3Validator.invalidate_bucket('source')
+    assert validator.validate_input()
+    assert calls == ['source', 'destination', 'source']
+
+
+def test_validator_retries_transient_head_bucket_errors(monkeypatch):
+    """
+    Tests only definitive head_bucket failures are cached, so a throttled check is retried.
+
+    Expected Outcome:
+    - Passes if a SlowDown error is retried on the next call and a 404 is answered from the cache.
+    """
+    responses = {'source': ['SlowDown', None], 'missing': ['404']}
+    calls = []
+
+    class FakeS3:
+        def head_bucket(self, Bucket):
+            calls.append(Bucket)
+            code = responses[Bucket].pop(0)
+            if code:
+                raise ClientError({'Error': {'Code': code, 'Message': code}}, 'HeadBucket')
+
+    monkeypatch.setattr(s3_validator, 'get_client', lambda *args, **kwargs: FakeS3())
+    monkeypatch.setattr(ETLS3Validator, 'bucket_cache', TTLCache(maxsize=8, ttl=60))
+    validator = ETLS3Validator('s3://source/', 'missing')
+
+    assert validator.check_bucket('source') is not None
+    assert validator.check_bucket('source') is None
+    assert validator.check_bucket('missing') is not None
+    assert validator.check_bucket('missing') is not None
+    assert calls == ['source', 'source', 'missing']
+
+
+def test_public_invalidation_reaches_the_run_etl_validator(monkeypatch):
+    """
+    Tests luminex.ETLS3Validator and the validator run_etl uses share one head_bucket cache.
+
+    Expected Outcome:
+    - Passes if invalidating through the public import makes run_etl's validator check the bucket again.
+    """
+    calls = []
+
+    class FakeS3:
+        def head_bucket(self, Bucket):
+            calls.append(Bucket)
+
+    monkeypatch.setattr(package_s3_validator, 'get_client', lambda *args, **kwargs: FakeS3())
+    monkeypatch.setattr(luminex.ETLS3Validator, 'bucket_cache', TTLCache(maxsize=8, ttl=60))
+    validator = etl.ETLS3Validator('s3://source/data/', 'destination')
+
+    assert validator.check_bucket('source') is None
+    assert validator.check_bucket('source') is None
+    assert calls == ['source']
+
+    luminex.ETLS3Validator.invalidate_bucket('source')
+
+    assert validator.check_bucket('source') is None
+    assert calls == ['source', 'source']
+    assert luminex.ETLS3Validator.bucket_cache_stats() == etl.ETLS3Validator.bucket_cache_stats()
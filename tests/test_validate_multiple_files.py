@@ -0,0 +1,104 @@
+"""
+Test module for the ETLFileValidator class.
+"""
+import pytest
+
+from validation import validate_multiple_files
+from validation.validate_multiple_files import ETLFileValidator, GitTreeCache
+
+CFG = {'ETL': {'TRANSFORMATION_FOLDER_PATH': 'org/transformations',
+               'TRANSFORMATION_SUBFOLDER': 'data-source/transformations'}}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, text='', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.text = text
+        self.headers = headers or {}
+
+    def json(self):
+        return self.body
+
+
+class FakeGitHub:
+    """
+    Answers the commits and trees endpoints, honouring If-None-Match.
+    """
+    def __init__(self):
+        self.requests = []
+        self.request_options = []
+        self.tree = [{'path': 'data-source/transformations/clean.py', 'type': 'blob', 'sha': 'aaa'},
+                     {'path': 'data-source/transformations/enrich.py', 'type': 'blob', 'sha': 'bbb'},
+                     {'path': 'README.md', 'type': 'blob', 'sha': 'ccc'}]
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append((url, dict(headers or {})))
+        self.request_options.append(kwargs)
+        if '/commits/' in url:
+            if (headers or {}).get('If-None-Match') == '"etag-1"':
+                return FakeResponse(304)
+            return FakeResponse(200, text='commit-1', headers={'ETag': '"etag-1"'})
+        if '/git/trees/commit-1' in url:
+            return FakeResponse(200, body={'sha': 'tree-1', 'tree': self.tree, 'truncated': False})
+        return FakeResponse(404)
+
+
+@pytest.fixture
+def fake_github(monkeypatch):
+    """
+    Route the validator's GitHub requests to an in-memory API with a fresh cache.
+    """
+    github = FakeGitHub()
+    monkeypatch.setattr(validate_multiple_files.requests, 'get', github.get)
+    monkeypatch.setattr(ETLFileValidator, 'tree_caches', {})
+    return github
+
+
+def test_find_missing_files_checks_all_names_with_one_tree_request(fake_github):
+    """
+    Tests every transformation is validated against a single tree listing.
+
+    Expected Outcome:
+    - Passes if the missing file is reported, blob SHAs are collected and only one
+      commit and one tree request are made.
+    """
+    validator = ETLFileValidator(CFG, 'token', ['clean', 'enrich', 'missing'])
+
+    assert validator.find_missing_files() == ['missing.py']
+    assert validator.blob_shas == {'clean.py': 'aaa', 'enrich.py': 'bbb'}
+    assert len(fake_github.requests) == 2
+    assert fake_github.request_options == [{}, {}]
+
+
+def test_repeat_validation_uses_conditional_request(fake_github):
+    """
+    Tests an unchanged branch is answered from the cache after a 304.
+
+    Expected Outcome:
+    - Passes if the second validation only sends a conditional commit request.
+    """
+    ETLFileValidator(CFG, 'token', ['clean']).find_missing_files()
+    fake_github.requests.clear()
+
+    assert ETLFileValidator(CFG, 'token', ['clean', 'enrich']).find_missing_files() == []
+    assert len(fake_github.requests) == 1
+    assert fake_github.requests[0][1]['If-None-Match'] == '"etag-1"'
+
+
+def test_tree_cache_keeps_only_the_latest_commits_per_repo(tmp_path):
+    """
+    Tests the persisted tree cache evicts the oldest commits of a repository beyond its cap.
+
+    Expected Outcome:
+    - Passes if only the two latest commits of the repository are kept, other repositories are
+      untouched, and a reloaded cache holds the same entries.
+    """
+    cache = GitTreeCache(str(tmp_path), max_trees_per_repo=2)
+    cache.set_tree('org/other@commit-0:src', {})
+    for commit in range(1, 5):
+        cache.set_tree(f'org/transformations@commit-{commit}:src', {'clean.py': str(commit)})
+
+    expected = ['org/other@commit-0:src', 'org/transformations@commit-3:src', 'org/transformations@commit-4:src']
+    assert list(cache.trees) == expected
+    assert list(GitTreeCache(str(tmp_path)).trees) == expected